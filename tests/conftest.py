@@ -0,0 +1,40 @@
+"""Shared fixtures for the xslt_tools tests."""
+
+from pathlib import Path
+
+import pytest
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "examples"
+
+CONFIRM_BOD = """<ConfirmBOD>
+  <DataArea>
+    <BOD>
+      <OriginalReferenceId><Id>{docnum}</Id></OriginalReferenceId>
+      <SuccessCode>{code}</SuccessCode>
+      <Description>Processed {docnum}</Description>
+    </BOD>
+  </DataArea>
+</ConfirmBOD>
+"""
+
+
+def confirm_bod(docnum: str, code: str = "Y") -> bytes:
+    """Build a ConfirmBOD input for Ex1_Mapping.xsl."""
+    return CONFIRM_BOD.format(docnum=docnum, code=code).encode("utf-8")
+
+
+@pytest.fixture
+def ex1_mapping() -> str:
+    return str(EXAMPLES_DIR / "Ex1_Mapping.xsl")
+
+
+@pytest.fixture
+def confirm_bod_files(tmp_path):
+    """Three ConfirmBOD documents on disk."""
+    paths = []
+    for index, code in enumerate(["Y", "N", "Y"]):
+        path = tmp_path / "in" / f"bod_{index}.xml"
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(confirm_bod(f"00000{index}", code))
+        paths.append(str(path))
+    return paths
@@ -0,0 +1,18 @@
+"""behave hooks: collect benchmark results and write them once at the end."""
+
+from xslt_tools.bench import load_results, write_results
+
+
+def before_all(context):
+    userdata = context.config.userdata
+    context.bench_results = []
+    context.bench_output = userdata.get("bench_output", "bench_results.json")
+    context.bench_tolerance = userdata.getfloat("bench_tolerance", 0.5)
+    baseline = userdata.get("bench_baseline", "")
+    context.bench_baseline = load_results(baseline) if baseline else {}
+
+
+def after_all(context):
+    if context.bench_results:
+        write_results(context.bench_results, context.bench_output)
+        print(f"Benchmark results written to {context.bench_output}")
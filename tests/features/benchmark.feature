@@ -0,0 +1,43 @@
+Feature: Mapping performance
+  Every example mapping is benchmarked on synthetic inputs of increasing
+  size, on both engines. Results are collected into bench_results.json.
+
+  Scenario Outline: <mapping> with <items> line items on <engine>
+    Given the mapping "<mapping>"
+    And a synthetic input with <items> line items
+    When it is benchmarked on the <engine> engine
+    Then every transform succeeds
+    And latency, throughput and peak memory are reported
+    And it has not regressed against the baseline
+
+    Examples: Small documents
+      | mapping                  | engine | items |
+      | Ex1_Mapping.xsl          | lxml   | 1     |
+      | Ex1_Mapping.xsl          | saxon  | 1     |
+      | Ex2_Mapping.xsl          | lxml   | 1     |
+      | Ex2_Mapping.xsl          | saxon  | 1     |
+      | Ex3_Mapping.xsl          | lxml   | 1     |
+      | Ex3_Mapping.xsl          | saxon  | 1     |
+      | Ex4_Mapping.xsl          | lxml   | 1     |
+      | Ex4_Mapping.xsl          | saxon  | 1     |
+      | Ex5_Mapping.xsl          | lxml   | 1     |
+      | Ex5_Mapping.xsl          | saxon  | 1     |
+
+    Examples: Medium documents
+      | mapping                  | engine | items |
+      | Ex2_Mapping.xsl          | lxml   | 100   |
+      | Ex2_Mapping.xsl          | saxon  | 100   |
+      | Ex4_Mapping.xsl          | lxml   | 100   |
+      | Ex4_Mapping.xsl          | saxon  | 100   |
+      | Ex5_Mapping.xsl          | lxml   | 100   |
+      | Ex5_Mapping.xsl          | saxon  | 100   |
+
+    @slow
+    Examples: Large documents
+      | mapping                  | engine | items |
+      | Ex2_Mapping.xsl          | lxml   | 10000 |
+      | Ex2_Mapping.xsl          | saxon  | 10000 |
+      | Ex4_Mapping.xsl          | lxml   | 10000 |
+      | Ex4_Mapping.xsl          | saxon  | 10000 |
+      | Ex5_Mapping.xsl          | lxml   | 10000 |
+      | Ex5_Mapping.xsl          | saxon  | 10000 |
@@ -0,0 +1,45 @@
+"""Step definitions for tests/features/benchmark.feature."""
+
+from dataclasses import asdict
+
+from behave import given, then, when
+
+from xslt_tools.bench import compare_results, run_case
+from xslt_tools.synthetic import MAPPING_INPUTS
+
+
+@given('the mapping "{mapping}"')
+def step_mapping(context, mapping):
+    assert mapping in MAPPING_INPUTS, f"No synthetic input for {mapping}"
+    context.mapping = mapping
+
+
+@given("a synthetic input with {items:d} line items")
+def step_items(context, items):
+    context.items = items
+
+
+@when("it is benchmarked on the {engine} engine")
+def step_benchmark(context, engine):
+    context.result = run_case(context.mapping, engine, context.items)
+    context.bench_results.append(context.result)
+
+
+@then("every transform succeeds")
+def step_no_errors(context):
+    assert not context.result.errors, context.result.errors[0]
+
+
+@then("latency, throughput and peak memory are reported")
+def step_reported(context):
+    result = context.result
+    assert result.p50_ms <= result.p95_ms <= result.max_ms
+    assert result.docs_per_second > 0
+    assert result.peak_rss_mb > 0
+
+
+@then("it has not regressed against the baseline")
+def step_baseline(context):
+    result = context.result
+    regressions = compare_results({result.key: asdict(result)}, context.bench_baseline, context.bench_tolerance)
+    assert not regressions, "; ".join(regressions)
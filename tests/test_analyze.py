@@ -0,0 +1,56 @@
+"""Tests for the static XPath cost analyzer."""
+
+import shutil
+
+from xslt_tools.analyze import StylesheetAnalyzer, location_paths, sample_shape
+
+from conftest import EXAMPLES_DIR
+
+
+def high_findings(stylesheet, shape):
+    reports = StylesheetAnalyzer(shape).analyze(str(stylesheet))
+    return {(f.lines[0], f.kind) for r in reports for f in r.findings if f.severity == "high"}
+
+
+def test_location_paths_split_steps_and_predicates():
+    paths = location_paths("format-number(round(../E1EDK02[QUALF = '022']/BELNR * 100) div 100, '0.00')")
+
+    assert len(paths) == 1
+    absolute, steps, text = paths[0]
+    assert not absolute
+    assert [(s.axis, s.name) for s in steps] == [("parent", "*"), ("child", "E1EDK02"), ("child", "BELNR")]
+    assert steps[1].predicates == ["QUALF = '022'"]
+    assert text == "../E1EDK02[QUALF = '022']/BELNR"
+
+
+def test_location_paths_ignore_literals_and_variables():
+    assert location_paths("concat('/A/B', $material/x, 'C')") == []
+    assert [p[2] for p in location_paths("(count(preceding::GROUP_25) + 1) * 10")] == ["preceding::GROUP_25"]
+
+
+def test_upward_lookups_in_item_templates_are_quadratic():
+    stylesheet = EXAMPLES_DIR / "Ex2_Mapping.xsl"
+    findings = high_findings(stylesheet, sample_shape(str(stylesheet)))
+
+    assert findings == {(51, "upward-lookup"), (84, "upward-lookup")}
+
+
+def test_preceding_axis_in_loop_is_quadratic():
+    stylesheet = EXAMPLES_DIR / "Ex5_Mapping.xsl"
+    findings = high_findings(stylesheet, sample_shape(str(stylesheet)))
+
+    assert (101, "document-order-axis") in findings
+    assert (81, "upward-lookup") in findings
+
+
+def test_simple_mapping_has_no_findings():
+    stylesheet = EXAMPLES_DIR / "Ex1_Mapping.xsl"
+    assert high_findings(stylesheet, sample_shape(str(stylesheet))) == set()
+
+
+def test_worst_case_without_sample(tmp_path):
+    stylesheet = tmp_path / "mapping.xsl"
+    shutil.copy(EXAMPLES_DIR / "Ex2_Mapping.xsl", stylesheet)
+
+    assert sample_shape(str(stylesheet)) is None
+    assert high_findings(stylesheet, None) == {(51, "upward-lookup"), (84, "upward-lookup")}
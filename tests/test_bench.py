@@ -0,0 +1,54 @@
+"""Tests for the benchmark helpers, synthetic inputs and SAP function stubs."""
+
+import pytest
+from lxml import etree
+
+from xslt_tools.bench import compare_results, run_case
+from xslt_tools.sap import stub_external_functions
+from xslt_tools.synthetic import GENERATORS, MAPPING_INPUTS, generate
+
+from conftest import EXAMPLES_DIR
+
+
+@pytest.mark.parametrize("kind", sorted(GENERATORS))
+def test_synthetic_documents_are_well_formed_and_seeded(kind):
+    document = generate(kind, items=5, seed=7)
+
+    assert etree.fromstring(document).tag == ("EDIFACT" if kind == "ORDERS" else kind)
+    assert generate(kind, items=5, seed=7) == document
+
+
+def test_synthetic_items_scale_the_document():
+    assert generate("DELVRY07", items=100).count(b"<E1EDL24") == 100
+    assert generate("ZTELINVOIC02", items=10).count(b"<E1EDP01") == 10
+
+
+def test_stub_replaces_external_function_calls():
+    content = (EXAMPLES_DIR / "Ex5_Mapping.xsl").read_bytes()
+    stubbed = stub_external_functions(content, "X")
+
+    assert b"check_exists(" in content
+    assert b"check_exists(" not in stubbed
+    etree.XSLT(etree.fromstring(stubbed))
+
+
+def test_stub_leaves_plain_stylesheets_alone():
+    content = (EXAMPLES_DIR / "Ex1_Mapping.xsl").read_bytes()
+    assert stub_external_functions(content) is content
+
+
+@pytest.mark.parametrize("mapping", sorted(MAPPING_INPUTS))
+def test_mappings_run_on_their_synthetic_input(mapping):
+    result = run_case(mapping, "lxml", items=2, iterations=1)
+
+    assert result.errors == []
+    assert result.p50_ms > 0 and result.peak_rss_mb > 0
+
+
+def test_compare_results_flags_regressions_beyond_tolerance():
+    baseline = {"case": {"p95_ms": 10.0, "peak_rss_mb": 100.0, "errors": []}}
+    current = {"case": {"p95_ms": 20.0, "peak_rss_mb": 105.0, "errors": []}}
+
+    assert compare_results(current, baseline, tolerance=0.5) == ["case: p95_ms 10.0 -> 20.0 (+100%)"]
+    assert compare_results(current, baseline, tolerance=1.5) == []
+    assert compare_results(current, {}, tolerance=0.5) == []
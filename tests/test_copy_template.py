@@ -0,0 +1,267 @@
+"""Tests for the use-case copy_template.py scripts."""
+
+import os
+import json
+import shutil
+import zipfile
+import subprocess
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+USE_CASES_DIR = Path(__file__).resolve().parent.parent / "use-cases"
+
+
+def load_script(use_case: str):
+    """Import use-cases/<use_case>/copy_template.py as a module."""
+    name = f"copy_template_{use_case.replace('-', '_')}"
+    spec = importlib.util.spec_from_file_location(name, USE_CASES_DIR / use_case / "copy_template.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(params=["pydantic-ai", "mcp-server"])
+def script(request):
+    return load_script(request.param)
+
+
+@pytest.fixture
+def template(tmp_path):
+    """A small template tree with (source_path, relative_path) pairs."""
+    root = tmp_path / "template"
+    contents = {
+        "README.md": b"# Template\n",
+        "src/agent.py": b"print('agent')\n" * 100,
+        "src/empty.py": b"",
+        "docs/big.bin": os.urandom(3 * 1024 * 1024 + 17),
+    }
+    files = []
+    for rel_path, data in contents.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        os.utime(path, ns=(1_600_000_000_000_000_000, 1_600_000_000_000_000_000))
+        files.append((str(path), rel_path))
+    return files
+
+
+def test_copy_keeps_content_and_metadata_and_skips_unchanged(script, template, tmp_path):
+    target = tmp_path / "target"
+    script.create_directory_structure(target, template)
+
+    stats = script.copy_template_files(target, template, workers=4)
+
+    assert (stats.copied, stats.skipped, stats.errors) == (4, 0, [])
+    assert stats.bytes_copied == sum(os.path.getsize(source) for source, _ in template)
+    for source, rel_path in template:
+        assert (target / rel_path).read_bytes() == Path(source).read_bytes()
+        assert os.stat(target / rel_path).st_mtime_ns == os.stat(source).st_mtime_ns
+
+    (target / "src/agent.py").write_bytes(b"changed")
+    again = script.copy_template_files(target, template, workers=4)
+
+    assert (again.copied, again.skipped) == (1, 3)
+    assert (target / "src/agent.py").read_bytes() == Path(template[1][0]).read_bytes()
+
+
+def test_copy_reports_failures_per_file(script, template, tmp_path):
+    target = tmp_path / "target"
+    script.create_directory_structure(target, template)
+    (target / "docs/big.bin").mkdir()
+
+    stats = script.copy_template_files(target, template)
+
+    assert [rel_path for rel_path, _ in stats.errors] == ["docs/big.bin"]
+    assert stats.copied == 3
+
+
+@pytest.fixture
+def mcp():
+    return load_script("mcp-server")
+
+
+def test_gitignore_negation_and_precedence(mcp):
+    matcher = mcp.GitignoreMatcher(["*.log", "!keep.log", "build/", "!build/"])
+
+    assert matcher.match("debug.log", is_dir=False) is True
+    assert matcher.match("sub/debug.log", is_dir=False) is True
+    assert matcher.match("keep.log", is_dir=False) is False
+    assert matcher.match("build", is_dir=True) is False
+    assert matcher.match("notes.txt", is_dir=False) is None
+
+
+def test_gitignore_anchoring_and_directory_rules(mcp):
+    matcher = mcp.GitignoreMatcher(["/dist", "docs/*.tmp", "cache/", "a/**/z", "\\#hash"])
+
+    assert matcher.match("dist", is_dir=True) is True
+    assert matcher.match("src/dist", is_dir=True) is None
+    assert matcher.match("docs/x.tmp", is_dir=False) is True
+    assert matcher.match("src/docs/x.tmp", is_dir=False) is None
+    assert matcher.match("cache", is_dir=True) is True
+    assert matcher.match("cache", is_dir=False) is None
+    assert matcher.match("a/z", is_dir=False) is True
+    assert matcher.match("a/b/c/z", is_dir=False) is True
+    assert matcher.match("#hash", is_dir=False) is True
+
+
+def test_gitignore_bracket_expressions(mcp):
+    matcher = mcp.GitignoreMatcher(["[]a]", "[!]]x", "[\\^[]y", "f[0-9].txt", "g[!.]"])
+
+    assert matcher.match("]", is_dir=False) is True
+    assert matcher.match("a", is_dir=False) is True
+    assert matcher.match("ax", is_dir=False) is True
+    assert matcher.match("]x", is_dir=False) is None
+    assert matcher.match("^y", is_dir=False) is True
+    assert matcher.match("[y", is_dir=False) is True
+    assert matcher.match("\\y", is_dir=False) is None
+    assert matcher.match("f7.txt", is_dir=False) is True
+    assert matcher.match("fa.txt", is_dir=False) is None
+    assert matcher.match("gz", is_dir=False) is True
+    assert matcher.match("g.", is_dir=False) is None
+
+
+def test_walk_matches_git_ls_files(mcp, tmp_path):
+    git = shutil.which("git")
+    if git is None:
+        pytest.skip("git is not installed")
+
+    root = tmp_path / "repo"
+    ignores = {
+        ".gitignore": "*.log\n!important.log\nnode_modules/\n/build\n**/tmp/**\n[]a]\n[!]]x\n",
+        "src/.gitignore": "generated/\n!keep.log\n*.bak\n",
+    }
+    files = [
+        "a.log", "important.log", "README.md", "build/out.js", "src/build/kept.js",
+        "node_modules/pkg/index.js", "src/node_modules/x.js", "src/tmp/a/b.txt",
+        "src/generated/x.ts", "src/keep.log", "src/other.log", "src/main.ts",
+        "src/main.bak", "src/deep/more.bak", "]", "ax", "]x",
+    ]
+    for rel_path, text in ignores.items():
+        (root / rel_path).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel_path).write_text(text)
+    for rel_path in files:
+        (root / rel_path).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel_path).write_text(rel_path)
+
+    # Only the tree's .gitignore files, not the user's global excludes
+    env = {**os.environ, "GIT_CONFIG_GLOBAL": os.devnull, "GIT_CONFIG_NOSYSTEM": "1"}
+    subprocess.run([git, "init", "-q", str(root)], check=True, env=env)
+    listed = subprocess.run(
+        [git, "-C", str(root), "ls-files", "--others", "--exclude-standard"],
+        check=True, capture_output=True, text=True, env=env
+    ).stdout.split()
+
+    assert sorted(mcp.walk_template(root)) == sorted(listed)
+
+
+def initial_copy(script, template, target):
+    script.create_directory_structure(target, template)
+    script.copy_template_files(target, template)
+    script.save_manifest(target, script.build_manifest(target, template))
+
+
+def test_sync_copies_template_changes_and_keeps_local_edits(script, template, tmp_path):
+    target = tmp_path / "target"
+    initial_copy(script, template, target)
+    sources = {rel_path: Path(source) for source, rel_path in template}
+
+    sources["README.md"].write_bytes(b"# Template v2\n")
+    sources["src/agent.py"].write_bytes(b"print('agent v2')\n")
+    (target / "src/agent.py").write_bytes(b"print('my agent')\n")
+    new = tmp_path / "template" / "src" / "new.py"
+    new.write_bytes(b"new\n")
+    template.append((str(new), "src/new.py"))
+
+    stats = script.sync_template(target, template)
+
+    assert stats.copied == 2 and stats.unchanged == 2 and not stats.errors
+    assert (target / "README.md").read_bytes() == b"# Template v2\n"
+    assert (target / "src/new.py").read_bytes() == b"new\n"
+    assert (target / "src/agent.py").read_bytes() == b"print('my agent')\n"
+    assert stats.kept == [("src/agent.py", "edited locally")]
+
+    again = script.sync_template(target, template)
+    assert again.copied == 0 and again.unchanged == 4
+
+
+def test_sync_delete_spares_locally_edited_files(script, template, tmp_path):
+    target = tmp_path / "target"
+    initial_copy(script, template, target)
+    (target / "src/agent.py").write_bytes(b"print('my agent')\n")
+    remaining = [item for item in template if item[1] not in ("src/agent.py", "src/empty.py")]
+
+    kept_without_delete = script.sync_template(target, remaining)
+    assert kept_without_delete.deleted == 0 and (target / "src/empty.py").exists()
+
+    stats = script.sync_template(target, remaining, delete=True)
+
+    assert stats.deleted == 1
+    assert not (target / "src/empty.py").exists()
+    assert (target / "src/agent.py").read_bytes() == b"print('my agent')\n"
+    assert stats.kept == [("src/agent.py", "removed from template but edited locally")]
+
+
+@pytest.fixture
+def pydantic_ai():
+    return load_script("pydantic-ai")
+
+
+def test_pack_extract_round_trip(pydantic_ai, template, tmp_path):
+    os.chmod(template[1][0], 0o755)
+    duplicate = tmp_path / "template" / "src" / "copy.py"
+    duplicate.write_bytes(Path(template[1][0]).read_bytes())
+    template.append((str(duplicate), "src/copy.py"))
+    cache = tmp_path / "cache"
+
+    archive, packed = pydantic_ai.cached_archive(template, cache)
+    assert packed and pydantic_ai.cached_archive(template, cache) == (archive, False)
+    target = tmp_path / "target"
+    stats = pydantic_ai.extract_archive(archive, target, workers=4)
+
+    assert stats.copied == len(template) and not stats.errors
+    for source, rel_path in template:
+        source_stat, target_stat = os.stat(source), os.stat(target / rel_path)
+        assert (target / rel_path).read_bytes() == Path(source).read_bytes()
+        assert target_stat.st_mtime_ns == source_stat.st_mtime_ns
+        assert target_stat.st_mode & 0o777 == source_stat.st_mode & 0o777
+    # Identical content is stored once
+    with zipfile.ZipFile(archive) as packed_archive:
+        assert len([name for name in packed_archive.namelist() if name.startswith("blobs/")]) == len(template) - 1
+    # The manifest lets --sync pick up from an extracted copy
+    assert pydantic_ai.sync_template(target, template).unchanged == len(template)
+
+
+@pytest.mark.parametrize("path", ["../escape.txt", "src/../../escape.txt", "/tmp/escape.txt", "C:\\escape.txt", "..\\escape.txt"])
+def test_extract_rejects_paths_outside_the_target(pydantic_ai, tmp_path, path):
+    archive = tmp_path / "evil.zip"
+    index = {"version": pydantic_ai.ARCHIVE_VERSION, "files": [
+        {"path": path, "blob": "b", "size": 4, "mtime_ns": 0, "mode": 0o644},
+    ]}
+    with zipfile.ZipFile(archive, "w") as evil:
+        evil.writestr(pydantic_ai.ARCHIVE_INDEX, json.dumps(index))
+        evil.writestr("blobs/b", b"evil")
+    target = tmp_path / "nested" / "target"
+
+    with pytest.raises(ValueError, match="Unsafe path"):
+        pydantic_ai.extract_archive(archive, target)
+    assert not (tmp_path / "nested" / "escape.txt").exists()
+    assert not (tmp_path / "escape.txt").exists()
+
+
+@pytest.mark.parametrize("stored", [["a"], ["a", "b", "c"]])
+def test_extract_rejects_blobs_that_do_not_match_the_index(pydantic_ai, tmp_path, stored):
+    archive = tmp_path / "broken.zip"
+    index = {"version": pydantic_ai.ARCHIVE_VERSION, "files": [
+        {"path": f"{blob}.txt", "blob": blob, "size": 1, "mtime_ns": 0, "mode": 0o644} for blob in ("a", "b")
+    ]}
+    with zipfile.ZipFile(archive, "w") as broken:
+        broken.writestr(pydantic_ai.ARCHIVE_INDEX, json.dumps(index))
+        for blob in stored:
+            broken.writestr(f"blobs/{blob}", blob)
+    target = tmp_path / "target"
+
+    with pytest.raises(ValueError, match="does not match its index"):
+        pydantic_ai.extract_archive(archive, target)
+    assert not target.exists()
@@ -0,0 +1,115 @@
+"""Tests for the transform daemon."""
+
+import json
+import shutil
+import socket
+import http.client
+
+import pytest
+
+from xslt_tools.daemon import Overloaded, TransformService, serve
+
+from conftest import EXAMPLES_DIR, confirm_bod
+
+
+@pytest.fixture(scope="module")
+def service():
+    return TransformService(str(EXAMPLES_DIR), slots=2, queue_timeout=0.05)
+
+
+@pytest.fixture
+def servers(service, tmp_path):
+    running = serve(service, port=0, socket_path=str(tmp_path / "xslt.sock"))
+    yield running
+    for server in running:
+        server.shutdown()
+        server.server_close()
+
+
+def request(server, method, path, body=None, headers=None):
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+    connection.request(method, path, body=body, headers=headers or {})
+    response = connection.getresponse()
+    return response.status, dict(response.getheaders()), response.read()
+
+
+def test_preloads_stylesheets_and_reports_failures(tmp_path):
+    shutil.copy(EXAMPLES_DIR / "Ex1_Mapping.xsl", tmp_path)
+    (tmp_path / "Broken.xsl").write_text("<xsl:stylesheet")
+
+    health = TransformService(str(tmp_path), slots=1).health()
+
+    assert health["mappings"] == ["Ex1_Mapping.xsl"]
+    assert list(health["failed"]) == ["Broken.xsl"]
+
+
+def test_http_transform_and_metrics(servers):
+    http_server = servers[0]
+    status, headers, body = request(http_server, "POST", "/transform/Ex1_Mapping.xsl", confirm_bod("4711"))
+
+    assert status == 200
+    assert b"4711" in body
+    assert float(headers["X-Transform-Ms"]) >= 0
+
+    status, _, body = request(http_server, "POST", "/transform/Missing.xsl", b"<a/>")
+    assert status == 404
+    status, _, body = request(http_server, "POST", "/transform/Ex1_Mapping.xsl", b"<not-closed>")
+    assert status == 422
+
+    metrics = json.loads(request(http_server, "GET", "/metrics")[2])
+    assert metrics["per_mapping"]["Ex1_Mapping.xsl"] >= 1
+    assert metrics["errors"] >= 1
+
+
+def test_unix_socket_speaks_http(servers, tmp_path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(tmp_path / "xslt.sock"))
+        client.sendall(b"GET /health HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+        response = b""
+        while chunk := client.recv(65536):
+            response += chunk
+
+    assert response.startswith(b"HTTP/1.1 200")
+    assert json.loads(response.split(b"\r\n\r\n", 1)[1])["status"] == "ok"
+
+
+def test_busy_slots_are_rejected_with_retry_after(service, servers):
+    held = [service._slots.get() for _ in range(service.slots)]
+    try:
+        with pytest.raises(Overloaded):
+            service.transform("Ex1_Mapping.xsl", confirm_bod("1"))
+        status, headers, _ = request(servers[0], "POST", "/transform/Ex1_Mapping.xsl", confirm_bod("1"))
+    finally:
+        for cache in held:
+            service._slots.put(cache)
+
+    assert status == 503
+    assert headers["Retry-After"] == "1"
+    assert service.metrics()["rejected"] >= 2
+
+
+def test_parameters_do_not_leak_between_requests_on_a_saxon_slot(tmp_path):
+    (tmp_path / "Param.xsl").write_text(
+        """<xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform">
+  <xsl:param name="p" select="'default'"/>
+  <xsl:template match="/"><out><xsl:value-of select="$p"/></out></xsl:template>
+</xsl:stylesheet>"""
+    )
+    saxon_service = TransformService(str(tmp_path), engine="saxon", slots=1)
+    (http_server,) = serve(saxon_service, port=0)
+    try:
+        first = request(http_server, "POST", "/transform/Param.xsl?p=SECRET", b"<a/>")
+        second = request(http_server, "POST", "/transform/Param.xsl", b"<a/>")
+    finally:
+        http_server.shutdown()
+        http_server.server_close()
+
+    assert b"<out>SECRET</out>" in first[2]
+    assert b"<out>default</out>" in second[2]
+
+
+def test_negative_content_length_is_rejected(servers):
+    status, _, body = request(servers[0], "POST", "/transform/Ex1_Mapping.xsl", b"", {"Content-Length": "-1"})
+
+    assert status == 400
+    assert b"Content-Length" in body
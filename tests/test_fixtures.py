@@ -0,0 +1,147 @@
+"""Tests for the INITIAL.md driven fixture generator."""
+
+from pathlib import Path
+
+from lxml import etree
+
+from xslt_tools.fixtures import build_schema, iter_source, parse_requirements, write_source
+from xslt_tools.streaming import stream_transform
+
+from conftest import EXAMPLES_DIR
+
+INITIAL_MD = Path(__file__).resolve().parent.parent / "INITIAL.md"
+
+SPEC = """## Requirements:
+
+## Requirement 1
+
+Source XPath: /ORDERS05/IDOC/E1EDK01/BELNR/text()
+Source Cardinality: {1..1}
+Target XPath: /Order/Id
+Target Cardinality: {1..1}
+Special Rules: Remove leading zeroes.
+
+## Requirement 2
+
+Source XPath: /ORDERS05/IDOC/E1EDP01
+Source Cardinality: {1..*}
+Target XPath: /Order/Line
+Target Cardinality: {1..*}
+Special Rules: Take the value in the context element MENGE, round it to 2 decimal places.
+
+## Requirement 3
+
+Source XPath: /ORDERS05/IDOC/E1EDP01/MENEE
+Source Cardinality: {1..*}
+Target XPath: /Order/Line/Unit
+Target Cardinality: {1..*}
+Special Rules: Convert the value of MENEE as follows:
+'KGM' -> 'KG'
+
+'LTR' -> 'L'
+
+## EXAMPLES:
+"""
+
+
+def test_parse_requirements_reads_every_block():
+    requirements = parse_requirements(str(INITIAL_MD))
+
+    assert len(requirements) == 26
+    assert requirements[2].source_xpath == "/DELVRY07/IDOC/EDI_DC40/DOCNUM"
+    assert "'PK' -> 'PAK'" in requirements[22].special_rules
+
+
+def test_schema_from_rules(tmp_path):
+    spec = tmp_path / "INITIAL.md"
+    spec.write_text(SPEC)
+    schema = build_schema(parse_requirements(str(spec)))
+
+    line = schema.children["IDOC"].children["E1EDP01"]
+    assert line.repeats
+    assert line.children["MENGE"].kind == "decimal"
+    assert line.children["MENEE"].values == ["KGM", "LTR"]
+    assert schema.children["IDOC"].children["E1EDK01"].children["BELNR"].kind == "padded"
+
+
+def test_rules_about_one_field_add_no_fields():
+    schema = build_schema(parse_requirements(str(INITIAL_MD)))
+    item = schema.find("E1EDL44")
+
+    assert "VEMNG" in item.children
+    assert "VEMNG22" not in item.children
+
+
+def test_qualifier_lookup_finds_a_partner(tmp_path):
+    schema = build_schema(parse_requirements(str(INITIAL_MD)))
+    partner = schema.find("E1ADRM1")
+    assert partner.repeats
+    assert partner.children["PARTNER_Q"].values == ["LF"]
+
+    document = "".join(iter_source(schema, documents=4, fanout={"E1ADRM1": 3}, seed=5))
+    root = etree.fromstring(document.encode("utf-8"))
+
+    deliveries = root.findall("IDOC/E1EDL20")
+    assert len(deliveries) == 4
+    assert all(delivery.xpath("E1ADRM1[PARTNER_Q = 'LF']/PARTNER_ID/text()") for delivery in deliveries)
+
+
+def test_qualifier_predicate_adds_the_field(tmp_path):
+    spec = tmp_path / "INITIAL.md"
+    spec.write_text(SPEC.replace("## EXAMPLES:", """## Requirement 4
+
+Source XPath: /ORDERS05/IDOC
+Source Cardinality: {1..1}
+Target XPath: /Order/Buyer
+Target Cardinality: {1..1}
+Special Rules: Use E1EDKA1[PARVW = 'AG']/PARTNER_ID.
+
+## EXAMPLES:"""))
+    partner = build_schema(parse_requirements(str(spec))).find("E1EDKA1")
+
+    assert partner.repeats
+    assert list(partner.children) == ["PARVW", "PARTNER_ID"]
+    assert partner.children["PARVW"].values == ["AG"]
+
+
+def test_fanout_and_seed(tmp_path):
+    spec = tmp_path / "INITIAL.md"
+    spec.write_text(SPEC)
+    schema = build_schema(parse_requirements(str(spec)))
+
+    document = "".join(iter_source(schema, documents=2, fanout={"E1EDP01": 5}, seed=3))
+    root = etree.fromstring(document.encode("utf-8"))
+
+    assert len(root.findall("IDOC")) == 2
+    assert len(root.findall("IDOC/E1EDP01")) == 10
+    assert "".join(iter_source(schema, documents=2, fanout={"E1EDP01": 5}, seed=3)) == document
+
+
+def test_values_are_escaped(tmp_path):
+    spec = tmp_path / "INITIAL.md"
+    spec.write_text(SPEC)
+    schema = build_schema(parse_requirements(str(spec)))
+    unit = schema.children["IDOC"].children["E1EDP01"].children["MENEE"]
+    unit.values[:] = ["A&B", "<x>"]
+    unit.may_be_empty = False
+
+    document = "".join(iter_source(schema, documents=3, fanout={"E1EDP01": 5}, seed=1))
+    root = etree.fromstring(document.encode("utf-8"))
+
+    assert {"A&B", "<x>"} <= set(root.xpath("//MENEE/text()"))
+
+
+def test_generated_batch_runs_through_delivery_mapping(tmp_path):
+    schema = build_schema(parse_requirements(str(INITIAL_MD)))
+    batch = tmp_path / "batch.xml"
+    write_source(str(batch), schema, documents=4, fanout={"E1EDL37": 3, "E1EDL44": (1, 4)}, seed=11)
+
+    outputs = []
+    report = stream_transform(
+        str(EXAMPLES_DIR / "Ex2_Mapping.xsl"),
+        str(batch),
+        lambda index, output: outputs.append(etree.fromstring(output))
+    )
+
+    assert report.failed == 0 and len(outputs) == 4
+    assert all(output.findtext(".//{*}ReferenceId/{*}Id") for output in outputs)
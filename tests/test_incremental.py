@@ -0,0 +1,58 @@
+"""Tests for incremental re-transforms."""
+
+import pytest
+
+from xslt_tools.incremental import IncrementalRunner
+
+STYLESHEET = """<xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform">
+  <xsl:template match="/"><out><xsl:apply-templates select="doc/*"/></out></xsl:template>
+  <xsl:template match="a"><A>{a}</A></xsl:template>
+  <xsl:template match="b"><B>{b}</B></xsl:template>
+</xsl:stylesheet>"""
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    inputs = []
+    for name, body in (("only_a.xml", "<a/>"), ("only_b.xml", "<b/>"), ("both.xml", "<a/><b/>")):
+        path = tmp_path / name
+        path.write_text(f"<doc>{body}</doc>")
+        inputs.append(str(path))
+    stylesheet = tmp_path / "mapping.xsl"
+    stylesheet.write_text(STYLESHEET.format(a="1", b="1"))
+    return stylesheet, inputs
+
+
+def test_only_fixtures_using_an_edited_template_rerun(corpus, tmp_path):
+    stylesheet, inputs = corpus
+    runner = IncrementalRunner(str(stylesheet), str(tmp_path / "state"))
+
+    first = runner.run(inputs)
+    assert first.full_reason == "no previous run"
+    assert len(first.reran) == 3
+
+    stylesheet.write_text(STYLESHEET.format(a="2", b="1"))
+    second = runner.run(inputs, str(tmp_path / "out"))
+
+    assert second.changed_templates == ["match=a"]
+    assert [p.rsplit("/", 1)[1] for p in second.reran] == ["only_a.xml", "both.xml"]
+    assert [p.rsplit("/", 1)[1] for p in second.reused] == ["only_b.xml"]
+    assert (tmp_path / "out" / "only_b.xml").read_bytes().endswith(b"<out><B>1</B></out>\n")
+    assert (tmp_path / "out" / "both.xml").read_bytes().endswith(b"<out><A>2</A><B>1</B></out>\n")
+
+
+def test_edited_input_and_new_templates_rerun(corpus, tmp_path):
+    stylesheet, inputs = corpus
+    runner = IncrementalRunner(str(stylesheet), str(tmp_path / "state"))
+    runner.run(inputs)
+
+    with open(inputs[1], "w") as f:
+        f.write("<doc><b/><b/></doc>")
+    assert [p.rsplit("/", 1)[1] for p in runner.run(inputs).reran] == ["only_b.xml"]
+
+    stylesheet.write_text(STYLESHEET.format(a="1", b="1").replace('match="b"', 'match="b" priority="2"'))
+    report = runner.run(inputs)
+    assert report.full_reason == "templates were added, removed or re-targeted"
+    assert len(report.reran) == 3
+
+    assert len(IncrementalRunner(str(stylesheet), str(tmp_path / "state"), {"x": "1"}).run(inputs).reran) == 3
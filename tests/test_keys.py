@@ -0,0 +1,75 @@
+"""Tests for the xsl:key lookup rewrite."""
+
+from xslt_tools.keys import default_corpus, find_lookups, rewrite, rewrite_verified, verify
+
+from conftest import EXAMPLES_DIR
+
+STYLESHEET = b"""<?xml version="1.0" encoding="UTF-8"?>
+<xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform">
+\t<xsl:template match="/">
+\t\t<out>
+\t\t\t<xsl:for-each select="IDOC/ITEM">
+\t\t\t\t<name><xsl:value-of select="../PARTNER[ROLE = 'RE']/NAME"/></name>
+\t\t\t\t<any><xsl:value-of select="//PARTNER[ROLE = 'RE']/NAME"/></any>
+\t\t\t\t<text><xsl:value-of select="TEXT['A' = QUAL][2]"/></text>
+\t\t\t</xsl:for-each>
+\t\t</out>
+\t</xsl:template>
+</xsl:stylesheet>
+"""
+
+DOCUMENT = b"""<IDOC>
+<PARTNER><ROLE>AG</ROLE><NAME>Buyer</NAME></PARTNER>
+<PARTNER><ROLE>RE</ROLE><NAME>Payer</NAME></PARTNER>
+<ITEM><TEXT><QUAL>A</QUAL>one</TEXT><TEXT><QUAL>B</QUAL>two</TEXT><TEXT><QUAL>A</QUAL>three</TEXT></ITEM>
+<ITEM/>
+</IDOC>
+"""
+
+
+def test_single_parent_lookups_are_rewritten():
+    content, applied = rewrite(STYLESHEET)
+
+    assert [lookup.original for lookup in applied] == ["../PARTNER[ROLE = 'RE']/NAME", "TEXT['A' = QUAL][2]"]
+    assert applied[0].replacement == "key('PARTNER-by-ROLE', concat(generate-id(..), '|', 'RE'))/NAME"
+    assert applied[1].replacement == "key('TEXT-by-QUAL', concat(generate-id(), '|', 'A'))[2]"
+    assert b'<xsl:key name="PARTNER-by-ROLE" match="PARTNER"' in content
+    assert b"//PARTNER[ROLE = 'RE']/NAME" in content
+    assert verify(STYLESHEET, content, [DOCUMENT]) == []
+
+
+def test_changed_output_is_detected():
+    broken = STYLESHEET.replace(b"'RE'", b"'AG'")
+
+    assert verify(STYLESHEET, broken, [DOCUMENT]) == [0]
+
+
+def test_partner_lookups_in_example_mapping():
+    stylesheet = str(EXAMPLES_DIR / "Ex4_Mapping.xsl")
+    result = rewrite_verified(stylesheet, default_corpus(stylesheet))
+
+    assert result.rejected == []
+    assert any(lookup.original == "E1EDKA1[PARVW='RE']/NAME1" for lookup in result.applied)
+    assert len(result.applied) == len(find_lookups((EXAMPLES_DIR / "Ex4_Mapping.xsl").read_bytes()))
+
+
+def test_delivery_lookups_are_scoped_to_their_parent():
+    stylesheet = str(EXAMPLES_DIR / "Ex2_Mapping.xsl")
+    result = rewrite_verified(stylesheet, default_corpus(stylesheet))
+
+    assert result.rejected == []
+    assert {lookup.key_name for lookup in result.applied} == {"E1EDL43-by-QUALF", "E1ADRM1-by-PARTNER_Q"}
+    assert b"use=\"concat(generate-id(..), '|', PARTNER_Q)\"" in result.content
+
+
+def test_rewrite_that_changes_output_is_rejected(tmp_path):
+    stylesheet = tmp_path / "mapping.xsl"
+    stylesheet.write_bytes(STYLESHEET)
+    # Two QUAL children: the predicate matches either, the key only the first
+    document = DOCUMENT.replace(b"<QUAL>B</QUAL>two", b"<QUAL>B</QUAL><QUAL>A</QUAL>two")
+
+    result = rewrite_verified(str(stylesheet), [DOCUMENT, document])
+
+    assert [lookup.key_name for lookup in result.applied] == ["PARTNER-by-ROLE"]
+    assert [lookup.key_name for lookup in result.rejected] == ["TEXT-by-QUAL"]
+    assert b"TEXT['A' = QUAL][2]" in result.content
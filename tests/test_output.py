@@ -0,0 +1,76 @@
+"""Tests for the output writer and serialization overrides."""
+
+import os
+
+import pytest
+
+from xslt_tools.cache import StylesheetCache
+from xslt_tools.engines import get_backend
+from xslt_tools.output import OutputWriter, set_indent
+from xslt_tools.runner import BatchRunner
+from xslt_tools.parallel import run_parallel
+
+from conftest import EXAMPLES_DIR
+
+
+def test_small_results_are_queued_until_a_flush(tmp_path):
+    writer = OutputWriter(str(tmp_path / "out"), buffer_bytes=100, batch_size=3)
+
+    path = writer.write("a.xml", b"<a/>")
+    writer.write("b.xml", memoryview(b"<b/>"))
+    assert not os.path.exists(path)
+    writer.write("c.xml", bytearray(b"<c/>"))
+
+    assert sorted(os.listdir(tmp_path / "out")) == ["a.xml", "b.xml", "c.xml"]
+    writer.write("large.xml", b"x" * 100)
+    writer.write("d.xml", b"<d/>")
+    writer.close()
+    assert writer.stats() == {"files": 5, "bytes": 116, "flushes": 3, "fsyncs": 0, "pending": 0}
+    assert (tmp_path / "out" / "d.xml").read_bytes() == b"<d/>"
+
+
+@pytest.mark.parametrize("policy, fsyncs", [("batch", 3), ("always", 4)])
+def test_fsync_policies(tmp_path, policy, fsyncs):
+    with OutputWriter(str(tmp_path), fsync=policy) as writer:
+        writer.write("a.xml", b"<a/>")
+        writer.write("b.xml", b"<b/>")
+    # batch: both files and the directory once; always: each file and the directory each time
+    assert writer.fsyncs == fsyncs
+
+
+def test_unknown_fsync_policy(tmp_path):
+    with pytest.raises(ValueError):
+        OutputWriter(str(tmp_path), fsync="sometimes")
+
+
+def test_set_indent_adds_missing_output():
+    content = set_indent(b'<xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform"/>', True)
+    assert b'<xsl:output indent="yes"/>' in content
+
+
+@pytest.mark.parametrize("engine", ["lxml", "saxon"])
+def test_indent_override(engine, tmp_path):
+    mapping = str(EXAMPLES_DIR / "Ex1_Mapping.xsl")
+    document = get_backend(engine).parse(b"<ConfirmBOD><DataArea><BOD><Status>Y</Status></BOD></DataArea></ConfirmBOD>")
+
+    indented = StylesheetCache(engine=engine).get(mapping).apply(document)
+    compact = StylesheetCache(engine=engine, indent=False).get(mapping).apply(document)
+
+    assert b"\n  " in indented
+    assert b"\n  " not in compact
+    assert b"".join(line.strip() for line in indented.splitlines()[1:]) in compact
+
+
+def test_runner_writes_lxml_buffers(ex1_mapping, confirm_bod_files, tmp_path):
+    runner = BatchRunner(fsync="batch", write_buffer_bytes=0)
+    report = runner.run(ex1_mapping, confirm_bod_files, str(tmp_path / "out"))
+
+    expected = [StylesheetCache().get(ex1_mapping).transform(path) for path in confirm_bod_files]
+    assert [open(r.output_path, "rb").read() for r in report.results] == expected
+
+
+def test_parallel_workers_write_through(ex1_mapping, confirm_bod_files, tmp_path):
+    report = run_parallel(ex1_mapping, confirm_bod_files, workers=2, output_dir=str(tmp_path), indent=False, fsync="batch")
+
+    assert report.succeeded == 3
+    assert all(b"\n  " not in open(r.output_path, "rb").read() for r in report.results)
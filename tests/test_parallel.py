@@ -0,0 +1,39 @@
+"""Tests for the process-pool parallel runner."""
+
+import pytest
+from lxml import etree
+
+from xslt_tools.parallel import run_parallel
+
+from conftest import confirm_bod
+
+
+def docnums(report):
+    return [etree.fromstring(r.output).findtext("IDOC/E1STATS/DOCNUM") for r in report.results]
+
+
+@pytest.mark.parametrize("engine", ["lxml", "saxon"])
+def test_keeps_input_order(ex1_mapping, engine):
+    inputs = [confirm_bod(str(n)) for n in range(40)]
+    report = run_parallel(ex1_mapping, inputs, engine=engine, workers=2, chunksize=3)
+
+    assert report.succeeded == 40
+    assert docnums(report) == [str(n) for n in range(40)]
+
+
+def test_unordered_returns_every_document(ex1_mapping):
+    inputs = [confirm_bod(str(n)) for n in range(25)]
+    report = run_parallel(ex1_mapping, inputs, workers=3, chunksize=1, ordered=False)
+    assert sorted(docnums(report), key=int) == [str(n) for n in range(25)]
+
+
+def test_writes_output_dir(ex1_mapping, confirm_bod_files, tmp_path):
+    report = run_parallel(ex1_mapping, confirm_bod_files, workers=2, output_dir=str(tmp_path / "out"))
+    assert [r.output_path.rsplit("/", 1)[1] for r in report.results] == ["bod_0.xml", "bod_1.xml", "bod_2.xml"]
+
+
+def test_broken_stylesheet_fails_fast(tmp_path):
+    broken = tmp_path / "broken.xsl"
+    broken.write_text("<xsl:stylesheet version='1.0' xmlns:xsl='http://www.w3.org/1999/XSL/Transform'>")
+    with pytest.raises(etree.XMLSyntaxError):
+        run_parallel(str(broken), [b"<x/>"], workers=2)
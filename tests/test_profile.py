@@ -0,0 +1,54 @@
+"""Tests for the per-template profiler."""
+
+import json
+from dataclasses import asdict
+
+from lxml import etree
+
+from xslt_tools.profile import PROFILE_NS, instrument, profile, write_collapsed
+
+STYLESHEET = """<xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform" xmlns:x="urn:unused">
+  <xsl:template match="/"><out><xsl:apply-templates select="doc/item"/></out></xsl:template>
+  <xsl:template match="item">
+    <xsl:param name="unused"/>
+    <row id="{@id}"><xsl:for-each select="part"><xsl:sort select="."/><p><xsl:value-of select="."/></p></xsl:for-each></row>
+  </xsl:template>
+</xsl:stylesheet>"""
+
+DOCUMENT = b"<doc>" + b"".join(b'<item id="%d"><part>b</part><part>a</part></item>' % i for i in range(5)) + b"</doc>"
+
+
+def test_instrument_keeps_params_and_sorts_first():
+    instrumented, frames = instrument(STYLESHEET.encode("utf-8"))
+    root = etree.fromstring(instrumented)
+
+    assert len(frames) == 3
+    assert root.nsmap["x"] == "urn:unused"
+    item, for_each = root[1], root.find(".//{http://www.w3.org/1999/XSL/Transform}for-each")
+    assert [child.tag.split("}")[1] for child in item] == ["param", "frame"]
+    assert [child.tag.split("}")[1] for child in for_each] == ["sort", "frame"]
+    assert item[1].tag == f"{{{PROFILE_NS}}}frame"
+
+
+def test_profile_counts_calls_and_nests_stacks(tmp_path):
+    stylesheet = tmp_path / "mapping.xsl"
+    stylesheet.write_text(STYLESHEET)
+
+    report = profile(str(stylesheet), [DOCUMENT], repeat=2)
+
+    # A for-each frame wraps its body, so it counts iterations
+    calls = {frame.label.rsplit(" @", 1)[0]: frame.calls for frame in report.frames}
+    assert calls == {'template match="/"': 2, 'template match="item"': 10, 'for-each select="part"': 20}
+    for frame in report.frames:
+        assert frame.cumulative_ms >= frame.self_ms >= 0
+    assert report.libxslt and {"match", "calls", "time"} <= report.libxslt[0].keys()
+    json.dumps(asdict(report))
+
+    collapsed = tmp_path / "mapping.folded"
+    write_collapsed(report, str(collapsed))
+    lines = collapsed.read_text().splitlines()
+    assert lines
+    for line in lines:
+        stack, micros = line.rsplit(" ", 1)
+        assert stack.startswith("mapping.xsl;template match=\"/\"")
+        assert int(micros) > 0
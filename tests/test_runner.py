@@ -0,0 +1,175 @@
+"""Tests for the stylesheet cache and batch runner."""
+
+import os
+
+import pytest
+from lxml import etree
+
+from xslt_tools import BatchRunner, StylesheetCache
+from xslt_tools.documents import DocumentCache
+from xslt_tools.runner import iter_inputs, percentile
+
+from conftest import confirm_bod
+
+SIMPLE_XSL = """<xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform">
+  <xsl:template match="/"><out>{value}</out></xsl:template>
+</xsl:stylesheet>"""
+
+COPY_XSL = """<xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform">
+  <xsl:output encoding="UTF-8"/>
+  <xsl:template match="/"><out><xsl:value-of select="x"/></out></xsl:template>
+</xsl:stylesheet>"""
+
+
+class TestStylesheetCache:
+
+    def test_compiles_once(self, ex1_mapping):
+        cache = StylesheetCache()
+        first = cache.get(ex1_mapping)
+        second = cache.get(ex1_mapping)
+        assert first is second
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hits"] == 1
+
+    def test_recompiles_after_edit(self, tmp_path):
+        path = tmp_path / "simple.xsl"
+        path.write_text(SIMPLE_XSL.format(value="a"))
+        cache = StylesheetCache()
+        assert b"<out>a</out>" in cache.get(str(path)).transform(b"<x/>")
+
+        path.write_text(SIMPLE_XSL.format(value="bb"))
+        assert b"<out>bb</out>" in cache.get(str(path)).transform(b"<x/>")
+        assert cache.stats()["misses"] == 2
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        paths = []
+        for value in "abc":
+            path = tmp_path / f"{value}.xsl"
+            path.write_text(SIMPLE_XSL.format(value=value))
+            paths.append(str(path))
+
+        cache = StylesheetCache(maxsize=2)
+        cache.get(paths[0])
+        cache.get(paths[1])
+        cache.get(paths[0])
+        cache.get(paths[2])
+
+        assert len(cache) == 2
+        assert cache.evictions == 1
+        cache.get(paths[0])
+        assert cache.stats()["hits"] == 2
+
+    @pytest.mark.parametrize("engine", ["lxml", "saxon"])
+    def test_honours_declared_input_encoding(self, tmp_path, engine):
+        path = tmp_path / "copy.xsl"
+        path.write_text(COPY_XSL)
+        source = '<?xml version="1.0" encoding="ISO-8859-1"?><x>Müller &amp; Søn</x>'.encode("iso-8859-1")
+
+        output = StylesheetCache(engine=engine).get(str(path)).transform(source)
+
+        assert "<out>Müller &amp; Søn</out>" in output.decode("utf-8")
+
+    def test_unknown_engine(self):
+        with pytest.raises(ValueError):
+            StylesheetCache(engine="xalan")
+
+
+class TestBatchRunner:
+
+    @pytest.mark.parametrize("engine", ["lxml", "saxon"])
+    def test_runs_batch(self, ex1_mapping, engine):
+        runner = BatchRunner(engine=engine)
+        report = runner.run(ex1_mapping, [confirm_bod("42", "Y"), confirm_bod("43", "N")])
+
+        assert report.succeeded == 2
+        statuses = [etree.fromstring(r.output).findtext("IDOC/E1STATS/STATUS") for r in report.results]
+        assert statuses == ["41", "40"]
+        assert report.docs_per_second > 0
+
+    def test_writes_output_dir(self, ex1_mapping, confirm_bod_files, tmp_path):
+        out_dir = tmp_path / "out"
+        report = BatchRunner().run(ex1_mapping, confirm_bod_files, str(out_dir))
+
+        assert sorted(os.listdir(out_dir)) == ["bod_0.xml", "bod_1.xml", "bod_2.xml"]
+        assert all(r.output is None and r.output_path for r in report.results)
+
+    def test_records_failures(self, ex1_mapping):
+        report = BatchRunner().run(ex1_mapping, [confirm_bod("1"), b"<not-closed>"])
+        assert report.succeeded == 1
+        assert report.failed == 1
+        assert report.results[1].error
+
+    def test_reuses_compiled_stylesheet(self, ex1_mapping):
+        runner = BatchRunner()
+        runner.run(ex1_mapping, [confirm_bod("1")])
+        runner.run(ex1_mapping, [confirm_bod("2")])
+        assert runner.cache.stats()["misses"] == 1
+
+    @pytest.mark.parametrize("engine", ["lxml", "saxon"])
+    def test_runs_several_mappings_on_one_parse(self, ex1_mapping, confirm_bod_files, tmp_path, engine):
+        other = tmp_path / "status.xsl"
+        other.write_text(SIMPLE_XSL.replace("{value}", '<xsl:value-of select="//SuccessCode"/>'))
+        documents = DocumentCache(engine=engine)
+        runner = BatchRunner(engine=engine, documents=documents)
+
+        reports = runner.run_mappings([ex1_mapping, str(other)], confirm_bod_files, str(tmp_path / "out"))
+
+        assert [r.succeeded for r in reports] == [3, 3]
+        assert documents.stats()["misses"] == 3 and documents.stats()["hits"] == 0
+        assert (tmp_path / "out" / "status" / "bod_1.xml").read_text().strip().endswith("<out>N</out>")
+        assert sorted(os.listdir(tmp_path / "out" / "Ex1_Mapping")) == ["bod_0.xml", "bod_1.xml", "bod_2.xml"]
+
+        runner.run(str(other), confirm_bod_files)
+        assert documents.stats()["hits"] == 3
+
+
+class TestDocumentCache:
+
+    def test_evicts_by_estimated_size(self):
+        first, second = confirm_bod("1"), confirm_bod("2")
+        documents = DocumentCache(max_bytes=documents_size(first) + 1)
+
+        assert documents.get(first) is documents.get(first)
+        documents.get(second)
+
+        assert documents.stats()["evictions"] == 1
+        assert documents.size_bytes <= documents.max_bytes
+        assert len(documents) == 1
+
+    def test_skips_documents_over_budget(self):
+        documents = DocumentCache(max_bytes=10)
+        documents.get(confirm_bod("1"))
+        assert len(documents) == 0
+
+    def test_tree_size_ratio_is_configurable(self):
+        document = confirm_bod("1")
+        documents = DocumentCache(max_bytes=len(document) * 2, tree_bytes_per_input_byte=1.5)
+
+        assert documents.estimate(len(document)) == int(len(document) * 1.5)
+        documents.get(document)
+        assert len(documents) == 1
+        with pytest.raises(ValueError):
+            DocumentCache(tree_bytes_per_input_byte=0)
+
+    def test_reparses_edited_files(self, confirm_bod_files):
+        documents = DocumentCache()
+        before = documents.get(confirm_bod_files[0])
+        with open(confirm_bod_files[0], "wb") as f:
+            f.write(confirm_bod("999999"))
+        assert documents.get(confirm_bod_files[0]) is not before
+
+
+def documents_size(document):
+    return DocumentCache().estimate(len(document))
+
+
+def test_percentile():
+    values = [0.5, 0.1, 0.4, 0.2, 0.3]
+    assert percentile(values, 50) == 0.3
+    assert percentile(values, 100) == 0.5
+    assert percentile([], 95) == 0.0
+
+
+def test_iter_inputs_expands_directories(confirm_bod_files):
+    directory = os.path.dirname(confirm_bod_files[0])
+    assert list(iter_inputs([directory])) == confirm_bod_files
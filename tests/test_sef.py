@@ -0,0 +1,46 @@
+"""Tests for the SEF artifact store."""
+
+import os
+
+from xslt_tools import StylesheetCache
+from xslt_tools.cache import content_digest
+from xslt_tools.sef import SefStore, saxon_version
+
+from conftest import confirm_bod
+
+
+def test_artifacts_are_keyed_by_content_and_version(tmp_path, ex1_mapping):
+    store = SefStore(str(tmp_path))
+    first = store.artifact_path(ex1_mapping, content_digest(b"a"))
+
+    assert first != store.artifact_path(ex1_mapping, content_digest(b"b"))
+    assert first.endswith(f"-{saxon_version()}.sef")
+    # Artifacts exported by another edition of the same version are shared
+    assert not any(f"-{edition}-" in first for edition in ("HE", "PE", "EE"))
+    assert os.path.basename(first).startswith("Ex1_Mapping-")
+
+
+def test_stale_and_unreadable_artifacts_are_removed(tmp_path, ex1_mapping):
+    store = SefStore(str(tmp_path))
+    digest = content_digest(open(ex1_mapping, "rb").read())
+    stale = store.artifact_path(ex1_mapping, content_digest(b"old"))
+    current = store.artifact_path(ex1_mapping, digest)
+    for path in (stale, current):
+        with open(path, "w") as f:
+            f.write("not a SEF file")
+
+    assert store.prune(ex1_mapping, keep=current) == [stale]
+    assert store.load(ex1_mapping, digest) is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_cache_falls_back_to_compiling_without_export(tmp_path, ex1_mapping):
+    cache = StylesheetCache(engine="saxon", sef_dir=str(tmp_path / "sef"))
+    compiled = cache.get(ex1_mapping)
+
+    assert b"<IDOC" in compiled.transform(confirm_bod("123"))
+    assert cache.sef_store.compiles == 1
+    if not cache.sef_store.exportable:
+        # Saxon-HE does not try to export, so nothing is written
+        assert not (tmp_path / "sef").exists()
+
@@ -0,0 +1,61 @@
+"""Tests for streaming batch transforms."""
+
+import os
+
+import pytest
+from lxml import etree
+
+from xslt_tools.streaming import directory_sink, iter_batch, stream_transform
+
+from conftest import EXAMPLES_DIR
+
+NS = {"ns0": "http://www.nwn.com/turf/project"}
+
+
+def delvry_batch(count: int) -> bytes:
+    """A DELVRY07 batch file with count IDOCs."""
+    idocs = "".join(
+        f"<IDOC BEGIN='1'><EDI_DC40><DOCNUM>00000{n}</DOCNUM></EDI_DC40>"
+        f"<E1EDL20><VBELN>{n}</VBELN><E1EDL24><POSNR>10</POSNR><LFIMG>2</LFIMG></E1EDL24></E1EDL20></IDOC>"
+        for n in range(count)
+    )
+    return f"<DELVRY07><HEADER/>{idocs}</DELVRY07>".encode("utf-8")
+
+
+def test_iter_batch_yields_standalone_documents():
+    documents = [etree.tostring(doc) for doc in iter_batch(delvry_batch(3))]
+
+    assert len(documents) == 3
+    assert all(doc.startswith(b"<DELVRY07><IDOC") for doc in documents)
+    assert b"<VBELN>2</VBELN>" in documents[2]
+
+
+def test_iter_batch_ignores_nested_tags():
+    batch = b"<ROOT><IDOC><IDOC>inner</IDOC></IDOC><IDOC/></ROOT>"
+    assert len(list(iter_batch(batch))) == 2
+
+
+@pytest.mark.parametrize("engine", ["lxml", "saxon"])
+def test_stream_transform_with_absolute_paths(engine):
+    outputs = {}
+    report = stream_transform(
+        str(EXAMPLES_DIR / "Ex2_Mapping.xsl"),
+        delvry_batch(4),
+        lambda index, output: outputs.__setitem__(index, output),
+        engine=engine
+    )
+
+    assert report.succeeded == 4
+    vbelns = [
+        etree.fromstring(outputs[n]).findtext(".//ns0:PurchaseOrderHeadId/ns0:Id", namespaces=NS)
+        for n in range(4)
+    ]
+    assert vbelns == ["0", "1", "2", "3"]
+
+
+def test_directory_sink(tmp_path):
+    batch = tmp_path / "batch.xml"
+    batch.write_bytes(delvry_batch(2))
+
+    stream_transform(str(EXAMPLES_DIR / "Ex2_Mapping.xsl"), str(batch), directory_sink(str(tmp_path / "out"), "batch"))
+    assert sorted(os.listdir(tmp_path / "out")) == ["batch_000000.xml", "batch_000001.xml"]
@@ -0,0 +1,57 @@
+"""Tests for the lxml / Saxon differential check."""
+
+from xslt_tools.engines import get_backend
+from xslt_tools.verify import canonicalize, load_corpus, verify_engines
+
+from conftest import EXAMPLES_DIR, confirm_bod
+
+VENDOR_XSL = """<xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform">
+  <xsl:param name="suffix" select="'-'"/>
+  <xsl:template match="/">
+    <out id="{ConfirmBOD/DataArea/BOD/OriginalReferenceId/Id}{$suffix}">
+      <vendor><xsl:value-of select="system-property('xsl:vendor')"/></vendor>
+    </out>
+  </xsl:template>
+</xsl:stylesheet>"""
+
+
+def test_canonical_form_ignores_serialization_details():
+    lxml_style = b'<?xml version="1.0"?>\n<a y="2" x="1">\n  <b>text</b>\n</a>\n'
+    saxon_style = b'<?xml version="1.0" encoding="UTF-8"?><a x="1" y="2">\n   <b>text</b>\n</a>'
+
+    assert canonicalize(lxml_style) == canonicalize(saxon_style)
+    assert canonicalize(lxml_style, strip_whitespace=False) != canonicalize(saxon_style, strip_whitespace=False)
+    assert canonicalize(b"<a><b>text</b></a>") != canonicalize(b"<a><b>text </b></a>")
+
+
+def test_example_mapping_matches_on_both_engines():
+    stylesheet = str(EXAMPLES_DIR / "Ex3_Mapping.xsl")
+    report = verify_engines(stylesheet, load_corpus([], stylesheet))
+
+    assert report.documents and report.mismatches == []
+    assert {timing.documents for timing in report.timings.values()} == {len(report.documents)}
+    assert report.faster_engine in ("lxml", "saxon")
+
+
+def test_differences_are_reported_per_document(tmp_path):
+    stylesheet = tmp_path / "vendor.xsl"
+    stylesheet.write_text(VENDOR_XSL)
+    corpus = [("a.xml", confirm_bod("1")), ("b.xml", b"<not-closed>")]
+
+    report = verify_engines(str(stylesheet), corpus, {"suffix": "-x"})
+
+    first, second = report.documents
+    assert not first.equal and not first.errors
+    assert any(line.startswith(" ") and 'id="1-x"' in line for line in first.diff)
+    assert any(line.startswith("-") and "vendor" in line for line in first.diff)
+    assert set(second.errors) == {"lxml", "saxon"}
+    assert report.faster_engine is None
+
+
+def test_saxon_parameters_do_not_carry_over_between_calls(tmp_path):
+    stylesheet = tmp_path / "vendor.xsl"
+    stylesheet.write_text(VENDOR_XSL)
+    compiled = get_backend("saxon").compile(str(stylesheet), stylesheet.read_bytes(), "digest")
+
+    assert b'id="1-x"' in compiled.transform(confirm_bod("1"), {"suffix": "-x"})
+    assert b'id="1-"' in compiled.transform(confirm_bod("1"))
@@ -8,6 +8,7 @@ to avoid copying build artifacts and dependencies.
 
 Usage:
     python copy_template.py <target_directory>
+    python copy_template.py <target_directory> --sync [--delete]
 
 Example:
     python copy_template.py my-mcp-server
@@ -15,25 +16,44 @@ Example:
 """
 
 import os
+import re
 import sys
+import time
 import shutil
+import json
+import hashlib
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Tuple, Set
-import fnmatch
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 
-def parse_gitignore(gitignore_path: Path) -> Set[str]:
+# Files copied at the same time; copying is I/O bound, so more threads than
+# CPUs pays off on network filesystems
+DEFAULT_COPY_WORKERS = 16
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Written to the target; records what each file was copied from (see --sync)
+MANIFEST_NAME = ".template-manifest.json"
+MANIFEST_VERSION = 1
+
+
+def parse_gitignore(gitignore_path: Path) -> List[str]:
     """
-    Parse .gitignore file and return set of patterns to ignore.
+    Parse .gitignore file and return its patterns in file order.
+    
+    Order matters: a later pattern overrides an earlier one, which is how
+    negated patterns (!pattern) re-include paths.
     
     Args:
         gitignore_path: Path to .gitignore file
         
     Returns:
-        Set of gitignore patterns
+        List of gitignore patterns
     """
-    ignore_patterns = set()
+    ignore_patterns = []
     
     if not gitignore_path.exists():
         return ignore_patterns
@@ -41,54 +61,221 @@ def parse_gitignore(gitignore_path: Path) -> Set[str]:
     try:
         with open(gitignore_path, 'r', encoding='utf-8') as f:
             for line in f:
-                line = line.strip()
+                # Trailing spaces are ignored unless escaped with a backslash
+                line = re.sub(r'(?<!\\)\s+$', '', line.rstrip('\n'))
                 # Skip empty lines and comments
                 if line and not line.startswith('#'):
-                    # Remove leading slash for consistency
-                    pattern = line.lstrip('/')
-                    ignore_patterns.add(pattern)
+                    ignore_patterns.append(line)
     except Exception as e:
-        print(f"Warning: Could not read .gitignore: {e}")
+        print(f"Warning: Could not read {gitignore_path}: {e}")
     
     return ignore_patterns
 
 
-def should_ignore_path(path: Path, template_root: Path, ignore_patterns: Set[str]) -> bool:
+def translate_bracket(pattern: str, start: int) -> Tuple[int, str]:
     """
-    Check if a path should be ignored based on gitignore patterns.
+    Translate the bracket expression opening at pattern[start].
+    
+    A ] right after [ or [! is a member, not the end; \\ escapes the next
+    character. A negated class never matches /.
     
     Args:
-        path: Path to check
-        template_root: Root directory of template
-        ignore_patterns: Set of gitignore patterns
+        pattern: gitignore pattern
+        start: Index of the opening [
+    
+    Returns:
+        (index of the closing ], regex character class), or (-1, '') if the
+        bracket is never closed
+    """
+    i = start + 1
+    negate = pattern.startswith(('!', '^'), i)
+    if negate:
+        i += 1
+    members = []
+    first = True
+    while i < len(pattern) and (pattern[i] != ']' or first):
+        char = pattern[i]
+        if char == '\\' and i + 1 < len(pattern):
+            i += 1
+            char = pattern[i]
+            members.append(f"\\{char}" if char in '\\^[]-' else char)
+        else:
+            members.append(f"\\{char}" if char in '\\^[]' else char)
+        first = False
+        i += 1
+    if i >= len(pattern):
+        return -1, ''
+    return i, f"[{'^/' if negate else ''}{''.join(members)}]"
+
+
+def translate_gitignore_pattern(pattern: str) -> Tuple[str, bool, bool]:
+    """
+    Translate one gitignore pattern into a regular expression.
+    
+    Follows gitignore(5): a pattern with a slash at the start or in the
+    middle is anchored to the .gitignore's directory, otherwise it matches
+    at any depth; a trailing slash matches directories only; ** matches
+    across directories; \\ escapes the next character.
+    
+    Args:
+        pattern: Pattern as written in .gitignore
+    
+    Returns:
+        (regex for the path relative to the .gitignore's directory,
+        negated, directories only)
+    """
+    negate = pattern.startswith('!')
+    if negate:
+        pattern = pattern[1:]
+    elif pattern.startswith(('\\!', '\\#')):
+        pattern = pattern[1:]
+    
+    dir_only = pattern.endswith('/')
+    pattern = pattern.rstrip('/')
+    anchored = '/' in pattern
+    pattern = pattern.lstrip('/')
+    
+    regex = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        at_segment_start = i == 0 or pattern[i - 1] == '/'
+        if pattern.startswith('**/', i) and at_segment_start:
+            regex.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('**', i) and at_segment_start and i + 2 == len(pattern):
+            regex.append('.*')
+            i += 2
+            continue
+        if char == '*':
+            regex.append('[^/]*')
+        elif char == '?':
+            regex.append('[^/]')
+        elif char == '[':
+            end, body = translate_bracket(pattern, i)
+            if end == -1:
+                regex.append(re.escape(char))
+            else:
+                regex.append(body)
+                i = end
+        elif char == '\\' and i + 1 < len(pattern):
+            i += 1
+            regex.append(re.escape(pattern[i]))
+        else:
+            regex.append(re.escape(char))
+        i += 1
+    
+    prefix = '' if anchored else '(?:.*/)?'
+    return prefix + ''.join(regex), negate, dir_only
+
+
+class GitignoreMatcher:
+    """
+    All patterns of one .gitignore compiled into a single regex per path kind.
+    
+    The patterns are combined as one alternation in reverse file order, so
+    the first alternative that matches is the last matching pattern, which
+    is the one gitignore gives precedence to.
+    """
+    
+    def __init__(self, patterns: List[str]):
+        """
+        Args:
+            patterns: Patterns in .gitignore order
+        """
+        rules = [translate_gitignore_pattern(pattern) for pattern in patterns]
+        self.negated = [negate for _, negate, _ in rules]
+        self._file_regex = self._combine(rules, include_dir_only=False)
+        self._dir_regex = self._combine(rules, include_dir_only=True)
+    
+    @staticmethod
+    def _combine(rules: List[Tuple[str, bool, bool]], include_dir_only: bool) -> Optional["re.Pattern[str]"]:
+        alternatives = [
+            f"(?P<r{index}>{regex})"
+            for index, (regex, _, dir_only) in reversed(list(enumerate(rules)))
+            if include_dir_only or not dir_only
+        ]
+        return re.compile('|'.join(alternatives)) if alternatives else None
+    
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Decide a path against this .gitignore.
         
+        Args:
+            rel_path: Path relative to the .gitignore's directory, with forward slashes
+            is_dir: Whether the path is a directory
+        
+        Returns:
+            True if ignored, False if re-included by a negated pattern,
+            None if no pattern matches
+        """
+        regex = self._dir_regex if is_dir else self._file_regex
+        found = regex.fullmatch(rel_path) if regex else None
+        if found is None:
+            return None
+        return not self.negated[int(found.lastgroup[1:])]
+
+
+def is_ignored(rel_path: str, is_dir: bool, matchers: List[Tuple[str, GitignoreMatcher]]) -> bool:
+    """
+    Check a path against every .gitignore that applies to it.
+    
+    The deepest .gitignore that has a matching pattern decides. Ignored
+    directories are pruned by the walk, so their contents never get here.
+    
+    Args:
+        rel_path: Path relative to the template root, with forward slashes
+        is_dir: Whether the path is a directory
+        matchers: (directory relative to the template root, matcher) pairs,
+            from the template root down to the path's directory
+    
     Returns:
         True if path should be ignored, False otherwise
     """
-    # Get relative path from template root
-    try:
-        rel_path = path.relative_to(template_root)
-    except ValueError:
-        return False
+    for base, matcher in reversed(matchers):
+        decision = matcher.match(rel_path[len(base) + 1:] if base else rel_path, is_dir)
+        if decision is not None:
+            return decision
+    return False
+
+
+def walk_template(
+    directory: Path,
+    rel_dir: str = '',
+    matchers: Optional[List[Tuple[str, GitignoreMatcher]]] = None
+) -> Iterator[str]:
+    """
+    Walk a template, pruning ignored directories and honouring nested .gitignore files.
     
-    # Convert to string with forward slashes
-    rel_path_str = str(rel_path).replace('\\', '/')
-    
-    # Check against each ignore pattern
-    for pattern in ignore_patterns:
-        # Handle directory patterns (ending with /)
-        if pattern.endswith('/'):
-            pattern = pattern.rstrip('/')
-            if rel_path_str.startswith(pattern + '/') or rel_path_str == pattern:
-                return True
-        # Handle glob patterns
-        elif fnmatch.fnmatch(rel_path_str, pattern):
-            return True
-        # Handle exact matches and prefix matches
-        elif rel_path_str == pattern or rel_path_str.startswith(pattern + '/'):
-            return True
+    Args:
+        directory: Directory to walk
+        rel_dir: Its path relative to the template root
+        matchers: .gitignore matchers of the enclosing directories
     
-    return False
+    Yields:
+        Relative paths (forward slashes) of the files that are not ignored
+    """
+    matchers = list(matchers or [])
+    gitignore_path = directory / '.gitignore'
+    if gitignore_path.is_file():
+        matchers.append((rel_dir, GitignoreMatcher(parse_gitignore(gitignore_path))))
+    
+    with os.scandir(directory) as entries:
+        entries = sorted(entries, key=lambda entry: entry.name)
+    
+    for entry in entries:
+        rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+        is_dir = entry.is_dir(follow_symlinks=False)
+        # Git never tracks its own directory
+        if is_dir and entry.name == '.git':
+            continue
+        if is_ignored(rel_path, is_dir, matchers):
+            continue
+        if is_dir:
+            yield from walk_template(Path(entry.path), rel_path, matchers)
+        elif entry.is_file():
+            yield rel_path
 
 
 def get_template_files() -> List[Tuple[str, str]]:
@@ -102,37 +289,20 @@ def get_template_files() -> List[Tuple[str, str]]:
     template_root = Path(__file__).parent
     files_to_copy = []
     
-    # Parse .gitignore patterns
-    gitignore_path = template_root / '.gitignore'
-    ignore_patterns = parse_gitignore(gitignore_path)
+    # Never copy the copy_template.py script itself
+    script_matcher = GitignoreMatcher(['/copy_template.py', '__pycache__/'])
     
-    # Add the copy_template.py script itself to ignore patterns
-    ignore_patterns.add('copy_template.py')
-    
-    # Walk through all files in template directory
-    for root, dirs, files in os.walk(template_root):
-        root_path = Path(root)
+    for rel_path in walk_template(template_root, matchers=[('', script_matcher)]):
+        file_path = template_root / rel_path
+        rel_path = Path(rel_path)
         
-        # Filter out ignored directories
-        dirs[:] = [d for d in dirs if not should_ignore_path(root_path / d, template_root, ignore_patterns)]
+        # Rename README.md to README_TEMPLATE.md
+        if rel_path.name == 'README.md':
+            target_rel_path = rel_path.parent / 'README_TEMPLATE.md'
+        else:
+            target_rel_path = rel_path
         
-        for file in files:
-            file_path = root_path / file
-            
-            # Skip if file should be ignored
-            if should_ignore_path(file_path, template_root, ignore_patterns):
-                continue
-            
-            # Get relative path for target
-            rel_path = file_path.relative_to(template_root)
-            
-            # Rename README.md to README_TEMPLATE.md
-            if rel_path.name == 'README.md':
-                target_rel_path = rel_path.parent / 'README_TEMPLATE.md'
-            else:
-                target_rel_path = rel_path
-            
-            files_to_copy.append((str(file_path), str(target_rel_path)))
+        files_to_copy.append((str(file_path), str(target_rel_path)))
     
     return files_to_copy
 
@@ -156,30 +326,355 @@ def create_directory_structure(target_dir: Path, files: List[Tuple[str, str]]) -
         directory.mkdir(parents=True, exist_ok=True)
 
 
-def copy_template_files(target_dir: Path, files: List[Tuple[str, str]]) -> int:
+@dataclass
+class CopyStats:
+    """Totals of a template copy."""
+    copied: int = 0
+    skipped: int = 0
+    bytes_copied: int = 0
+    elapsed: float = 0.0
+    errors: List[Tuple[str, str]] = field(default_factory=list)
+
+
+def file_digest(path: Path) -> str:
+    """
+    Hash a file's content.
+    
+    Args:
+        path: File to hash
+    
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(COPY_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_identical(source_path: Path, target_path: Path) -> bool:
+    """
+    Check whether the target already holds the source's content.
+    
+    Sizes are compared first so only same-sized files are hashed.
+    
+    Args:
+        source_path: Template file
+        target_path: File at the target
+    
+    Returns:
+        True if the target exists with the same content
+    """
+    try:
+        if os.path.getsize(source_path) != os.path.getsize(target_path):
+            return False
+    except OSError:
+        return False
+    return file_digest(source_path) == file_digest(target_path)
+
+
+def copy_file_fast(source_path: Path, target_path: Path) -> int:
     """
-    Copy all template files to target directory.
+    Copy one file in the kernel where possible, keeping its metadata like shutil.copy2.
+    
+    Uses os.copy_file_range (no data through user space, server-side copy on
+    NFS 4.2 and SMB), then os.sendfile, and falls back to a buffered copy
+    when neither works for the file pair.
+    
+    Args:
+        source_path: File to copy
+        target_path: Destination file
+    
+    Returns:
+        Number of bytes copied
+    """
+    with open(source_path, 'rb') as src, open(target_path, 'wb') as dst:
+        size = os.fstat(src.fileno()).st_size
+        copied = 0
+        for method in ('copy_file_range', 'sendfile'):
+            if copied >= size or not hasattr(os, method):
+                continue
+            try:
+                while copied < size:
+                    if method == 'copy_file_range':
+                        sent = os.copy_file_range(src.fileno(), dst.fileno(), size - copied)
+                    else:
+                        sent = os.sendfile(dst.fileno(), src.fileno(), copied, size - copied)
+                    if sent == 0:
+                        break
+                    copied += sent
+            except OSError:
+                # Not supported for this file pair (e.g. across filesystems on
+                # older kernels); continue with the next method
+                pass
+        if copied < size:
+            src.seek(copied)
+            dst.seek(copied)
+            dst.truncate()
+            shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+            copied = size
+    shutil.copystat(source_path, target_path)
+    return copied
+
+
+def copy_template_files(target_dir: Path, files: List[Tuple[str, str]], workers: int = DEFAULT_COPY_WORKERS) -> CopyStats:
+    """
+    Copy all template files to target directory concurrently.
+    
+    Files whose content already matches at the target are skipped.
     
     Args:
         target_dir: Target directory path
         files: List of (source_path, relative_path) tuples
+        workers: Files copied at the same time
     
     Returns:
-        Number of files copied successfully
+        CopyStats with copied and skipped counts, bytes and elapsed time
     """
-    copied_count = 0
+    stats = CopyStats()
+    lock = threading.Lock()
+    start = time.perf_counter()
     
-    for source_path, rel_path in files:
+    def copy_one(item: Tuple[str, str]) -> None:
+        source_path, rel_path = item
         target_path = target_dir / rel_path
-        
         try:
-            shutil.copy2(source_path, target_path)
-            copied_count += 1
-            print(f"  ✓ {rel_path}")
+            if is_identical(Path(source_path), target_path):
+                with lock:
+                    stats.skipped += 1
+                return
+            copied = copy_file_fast(Path(source_path), target_path)
+            with lock:
+                stats.copied += 1
+                stats.bytes_copied += copied
         except Exception as e:
-            print(f"  ✗ {rel_path} - Error: {e}")
+            with lock:
+                stats.errors.append((rel_path, str(e)))
+    
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        # Consume the iterator so worker exceptions are not silently dropped
+        list(pool.map(copy_one, files))
+    
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+@dataclass
+class SyncStats:
+    """Totals of a template sync."""
+    copied: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    bytes_copied: int = 0
+    elapsed: float = 0.0
+    kept: List[Tuple[str, str]] = field(default_factory=list)
+    errors: List[Tuple[str, str]] = field(default_factory=list)
+
+
+def load_manifest(target_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Read the manifest of a previously copied template.
+    
+    Args:
+        target_dir: Target directory path
+    
+    Returns:
+        Manifest entries by relative path; empty if there is no usable manifest
+    """
+    try:
+        with open(target_dir / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != MANIFEST_VERSION:
+        return {}
+    return data.get('files', {})
+
+
+def save_manifest(target_dir: Path, entries: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Write the manifest atomically.
+    
+    Args:
+        target_dir: Target directory path
+        entries: Manifest entries by relative path
+    """
+    partial = target_dir / f"{MANIFEST_NAME}.tmp"
+    with open(partial, 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'files': dict(sorted(entries.items()))}, f, indent=1)
+    os.replace(partial, target_dir / MANIFEST_NAME)
+
+
+def manifest_entry(source_path: Path, target_path: Path, source_hash: str) -> Dict[str, Any]:
+    """
+    Record what a target file was written from.
+    
+    Args:
+        source_path: Template file
+        target_path: File written at the target
+        source_hash: Content hash of both
     
-    return copied_count
+    Returns:
+        Manifest entry with the hash and both files' size and mtime
+    """
+    source_stat = os.stat(source_path)
+    target_stat = os.stat(target_path)
+    return {
+        'hash': source_hash,
+        'source_size': source_stat.st_size,
+        'source_mtime_ns': source_stat.st_mtime_ns,
+        'target_size': target_stat.st_size,
+        'target_mtime_ns': target_stat.st_mtime_ns,
+    }
+
+
+def target_state(target_path: Path, entry: Optional[Dict[str, Any]]) -> str:
+    """
+    Find out whether a target file still holds what the last copy wrote.
+    
+    Size and mtime are compared first, so unchanged files are not hashed.
+    
+    Args:
+        target_path: File at the target
+        entry: Its manifest entry, if any
+    
+    Returns:
+        "missing", "pristine" (as last written) or "edited"
+    """
+    try:
+        stat = os.stat(target_path)
+    except FileNotFoundError:
+        return 'missing'
+    if entry is None:
+        return 'edited'
+    if stat.st_size == entry['target_size'] and stat.st_mtime_ns == entry['target_mtime_ns']:
+        return 'pristine'
+    return 'pristine' if file_digest(target_path) == entry['hash'] else 'edited'
+
+
+def build_manifest(target_dir: Path, files: List[Tuple[str, str]], workers: int = DEFAULT_COPY_WORKERS) -> Dict[str, Dict[str, Any]]:
+    """
+    Manifest entries for a freshly copied template.
+    
+    Args:
+        target_dir: Target directory path
+        files: List of (source_path, relative_path) tuples
+        workers: Files hashed at the same time
+    
+    Returns:
+        Entries of the files present at the target with the template's content
+    """
+    def entry_for(item: Tuple[str, str]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        source_path, rel_path = item
+        target_path = target_dir / rel_path
+        source_hash = file_digest(Path(source_path))
+        try:
+            if file_digest(target_path) != source_hash:
+                return None
+        except OSError:
+            return None
+        return rel_path, manifest_entry(Path(source_path), target_path, source_hash)
+    
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        return dict(entry for entry in pool.map(entry_for, files) if entry)
+
+
+def sync_template(
+    target_dir: Path,
+    files: List[Tuple[str, str]],
+    delete: bool = False,
+    workers: int = DEFAULT_COPY_WORKERS
+) -> SyncStats:
+    """
+    Bring a previously copied template up to date.
+    
+    Only new files and files changed in the template are copied. A template
+    file's hash is reused from the manifest while its size and mtime are
+    unchanged. Target files edited or deleted locally since the last copy
+    are left alone and reported as kept.
+    
+    Args:
+        target_dir: Target directory path
+        files: List of (source_path, relative_path) tuples
+        delete: Delete files removed from the template, unless edited locally
+        workers: Files processed at the same time
+    
+    Returns:
+        SyncStats with copied, unchanged, deleted and kept files
+    """
+    stats = SyncStats()
+    lock = threading.Lock()
+    start = time.perf_counter()
+    manifest = load_manifest(target_dir)
+    updated: Dict[str, Dict[str, Any]] = {}
+    
+    def sync_one(item: Tuple[str, str]) -> None:
+        source_path, rel_path = Path(item[0]), item[1]
+        target_path = target_dir / rel_path
+        entry = manifest.get(rel_path)
+        try:
+            source_stat = os.stat(source_path)
+            if entry and (source_stat.st_size, source_stat.st_mtime_ns) == (entry['source_size'], entry['source_mtime_ns']):
+                source_hash = entry['hash']
+            else:
+                source_hash = file_digest(source_path)
+            
+            state = target_state(target_path, entry)
+            if state == 'pristine' and source_hash == entry['hash']:
+                with lock:
+                    updated[rel_path] = entry
+                    stats.unchanged += 1
+                return
+            if state == 'edited' and entry is None and file_digest(target_path) == source_hash:
+                # Already there with the template's content; start tracking it
+                with lock:
+                    updated[rel_path] = manifest_entry(source_path, target_path, source_hash)
+                    stats.unchanged += 1
+                return
+            if state == 'edited' or (state == 'missing' and entry is not None):
+                reason = 'edited locally' if state == 'edited' else 'deleted locally'
+                with lock:
+                    if entry is not None:
+                        updated[rel_path] = entry
+                    stats.kept.append((rel_path, reason))
+                return
+            
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            copied = copy_file_fast(source_path, target_path)
+            new_entry = manifest_entry(source_path, target_path, source_hash)
+            with lock:
+                updated[rel_path] = new_entry
+                stats.copied += 1
+                stats.bytes_copied += copied
+        except Exception as e:
+            with lock:
+                if entry is not None:
+                    updated[rel_path] = entry
+                stats.errors.append((rel_path, str(e)))
+    
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        list(pool.map(sync_one, files))
+    
+    template_paths = {rel_path for _, rel_path in files}
+    for rel_path, entry in manifest.items():
+        if rel_path in template_paths:
+            continue
+        if not delete:
+            # Still tracked, so a later run with delete can remove it
+            updated[rel_path] = entry
+            continue
+        target_path = target_dir / rel_path
+        state = target_state(target_path, entry)
+        if state == 'pristine':
+            target_path.unlink()
+            stats.deleted += 1
+        elif state == 'edited':
+            stats.kept.append((rel_path, 'removed from template but edited locally'))
+    
+    save_manifest(target_dir, updated)
+    stats.elapsed = time.perf_counter() - start
+    return stats
 
 
 def validate_template_integrity(target_dir: Path) -> bool:
@@ -278,6 +773,7 @@ def main():
         epilog="""
 Examples:
   python copy_template.py my-mcp-server
+  python copy_template.py my-mcp-server --sync --delete
   python copy_template.py /path/to/my-new-server
   python copy_template.py ../customer-support-mcp
         """
@@ -300,12 +796,34 @@ Examples:
         help="Show what would be copied without actually copying"
     )
     
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Update an existing copy: only new or changed template files, keeping local edits"
+    )
+    
+    parser.add_argument(
+        "--delete",
+        action="store_true",
+        help="With --sync, delete files removed from the template (unless edited locally)"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_COPY_WORKERS,
+        help=f"Files copied concurrently (default: {DEFAULT_COPY_WORKERS})"
+    )
+    
     if len(sys.argv) == 1:
         parser.print_help()
         return
     
     args = parser.parse_args()
     
+    if args.delete and not args.sync:
+        parser.error("--delete requires --sync")
+    
     # Convert target directory to Path object
     target_dir = Path(args.target_directory).resolve()
     
@@ -315,9 +833,9 @@ Examples:
             print(f"❌ Error: {target_dir} is a file, not a directory")
             return
         
-        if list(target_dir.iterdir()) and not args.force:
+        if list(target_dir.iterdir()) and not args.force and not args.sync:
             print(f"❌ Error: {target_dir} is not empty")
-            print("Use --force to overwrite existing directory")
+            print("Use --sync to update a previous copy or --force to overwrite existing directory")
             return
         
         if args.force and not args.dry_run:
@@ -339,17 +857,37 @@ Examples:
             print(f"  → {rel_path}")
         return
     
+    if args.sync:
+        print(f"\n🔄 Syncing template files into: {target_dir}")
+        target_dir.mkdir(parents=True, exist_ok=True)
+        stats = sync_template(target_dir, files_to_copy, args.delete, args.workers)
+        for rel_path, reason in stats.kept:
+            print(f"  ✋ {rel_path} - kept ({reason})")
+        for rel_path, error in stats.errors:
+            print(f"  ✗ {rel_path} - Error: {error}")
+        print(f"\n✅ Synced in {stats.elapsed * 1000:.0f}ms: {stats.copied} copied "
+              f"({stats.bytes_copied / 1024:.1f} KB), {stats.unchanged} unchanged, "
+              f"{stats.deleted} deleted, {len(stats.kept)} kept")
+        if not validate_template_integrity(target_dir):
+            print("⚠️  Template may be incomplete. Check for missing files.")
+        return
+    
     # Create target directory and structure
     print(f"\n📁 Creating directory structure in: {target_dir}")
     target_dir.mkdir(parents=True, exist_ok=True)
     create_directory_structure(target_dir, files_to_copy)
     
     # Copy files
-    print(f"\n📋 Copying template files:")
-    copied_count = copy_template_files(target_dir, files_to_copy)
+    print(f"\n📋 Copying template files with {args.workers} workers...")
+    stats = copy_template_files(target_dir, files_to_copy, args.workers)
+    for rel_path, error in stats.errors:
+        print(f"  ✗ {rel_path} - Error: {error}")
     
     # Validate template integrity
-    print(f"\n✅ Copied {copied_count}/{len(files_to_copy)} files successfully")
+    print(f"\n✅ Copied {stats.copied}/{len(files_to_copy)} files "
+          f"({stats.bytes_copied / 1024:.1f} KB in {stats.elapsed:.2f}s), "
+          f"{stats.skipped} already up to date")
+    save_manifest(target_dir, build_manifest(target_dir, files_to_copy, args.workers))
     
     if validate_template_integrity(target_dir):
         print("✅ Template integrity check passed")
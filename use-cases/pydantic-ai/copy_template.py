@@ -7,6 +7,10 @@ for starting new PydanticAI agent development projects.
 
 Usage:
     python copy_template.py <target_directory>
+    python copy_template.py <target_directory> --sync [--delete]
+    python copy_template.py <target_directory> --archive
+    python copy_template.py <target_directory> --from-archive template-<hash>.zip
+    python copy_template.py --pack
 
 Example:
     python copy_template.py my-agent-project
@@ -15,10 +19,31 @@ Example:
 
 import os
 import sys
+import time
 import shutil
+import json
+import hashlib
 import argparse
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Files copied at the same time; copying is I/O bound, so more threads than
+# CPUs pays off on network filesystems
+DEFAULT_COPY_WORKERS = 16
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Written to the target; records what each file was copied from (see --sync)
+MANIFEST_NAME = ".template-manifest.json"
+MANIFEST_VERSION = 1
+
+# Packed template archives (see --archive)
+ARCHIVE_INDEX = "index.json"
+ARCHIVE_VERSION = 1
 
 
 def get_template_files() -> List[Tuple[str, str]]:
@@ -98,30 +123,574 @@ def create_directory_structure(target_dir: Path, files: List[Tuple[str, str]]) -
         directory.mkdir(parents=True, exist_ok=True)
 
 
-def copy_template_files(target_dir: Path, files: List[Tuple[str, str]]) -> int:
+@dataclass
+class CopyStats:
+    """Totals of a template copy."""
+    copied: int = 0
+    skipped: int = 0
+    bytes_copied: int = 0
+    elapsed: float = 0.0
+    errors: List[Tuple[str, str]] = field(default_factory=list)
+
+
+def file_digest(path: Path) -> str:
+    """
+    Hash a file's content.
+    
+    Args:
+        path: File to hash
+    
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(COPY_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_identical(source_path: Path, target_path: Path) -> bool:
+    """
+    Check whether the target already holds the source's content.
+    
+    Sizes are compared first so only same-sized files are hashed.
+    
+    Args:
+        source_path: Template file
+        target_path: File at the target
+    
+    Returns:
+        True if the target exists with the same content
+    """
+    try:
+        if os.path.getsize(source_path) != os.path.getsize(target_path):
+            return False
+    except OSError:
+        return False
+    return file_digest(source_path) == file_digest(target_path)
+
+
+def copy_file_fast(source_path: Path, target_path: Path) -> int:
+    """
+    Copy one file in the kernel where possible, keeping its metadata like shutil.copy2.
+    
+    Uses os.copy_file_range (no data through user space, server-side copy on
+    NFS 4.2 and SMB), then os.sendfile, and falls back to a buffered copy
+    when neither works for the file pair.
+    
+    Args:
+        source_path: File to copy
+        target_path: Destination file
+    
+    Returns:
+        Number of bytes copied
+    """
+    with open(source_path, 'rb') as src, open(target_path, 'wb') as dst:
+        size = os.fstat(src.fileno()).st_size
+        copied = 0
+        for method in ('copy_file_range', 'sendfile'):
+            if copied >= size or not hasattr(os, method):
+                continue
+            try:
+                while copied < size:
+                    if method == 'copy_file_range':
+                        sent = os.copy_file_range(src.fileno(), dst.fileno(), size - copied)
+                    else:
+                        sent = os.sendfile(dst.fileno(), src.fileno(), copied, size - copied)
+                    if sent == 0:
+                        break
+                    copied += sent
+            except OSError:
+                # Not supported for this file pair (e.g. across filesystems on
+                # older kernels); continue with the next method
+                pass
+        if copied < size:
+            src.seek(copied)
+            dst.seek(copied)
+            dst.truncate()
+            shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+            copied = size
+    shutil.copystat(source_path, target_path)
+    return copied
+
+
+def copy_template_files(target_dir: Path, files: List[Tuple[str, str]], workers: int = DEFAULT_COPY_WORKERS) -> CopyStats:
     """
-    Copy all template files to target directory.
+    Copy all template files to target directory concurrently.
+    
+    Files whose content already matches at the target are skipped.
     
     Args:
         target_dir: Target directory path
         files: List of (source_path, relative_path) tuples
+        workers: Files copied at the same time
     
     Returns:
-        Number of files copied successfully
+        CopyStats with copied and skipped counts, bytes and elapsed time
     """
-    copied_count = 0
+    stats = CopyStats()
+    lock = threading.Lock()
+    start = time.perf_counter()
     
-    for source_path, rel_path in files:
+    def copy_one(item: Tuple[str, str]) -> None:
+        source_path, rel_path = item
         target_path = target_dir / rel_path
-        
         try:
-            shutil.copy2(source_path, target_path)
-            copied_count += 1
-            print(f"  ✓ {rel_path}")
+            if is_identical(Path(source_path), target_path):
+                with lock:
+                    stats.skipped += 1
+                return
+            copied = copy_file_fast(Path(source_path), target_path)
+            with lock:
+                stats.copied += 1
+                stats.bytes_copied += copied
+        except Exception as e:
+            with lock:
+                stats.errors.append((rel_path, str(e)))
+    
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        # Consume the iterator so worker exceptions are not silently dropped
+        list(pool.map(copy_one, files))
+    
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+@dataclass
+class SyncStats:
+    """Totals of a template sync."""
+    copied: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    bytes_copied: int = 0
+    elapsed: float = 0.0
+    kept: List[Tuple[str, str]] = field(default_factory=list)
+    errors: List[Tuple[str, str]] = field(default_factory=list)
+
+
+def load_manifest(target_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Read the manifest of a previously copied template.
+    
+    Args:
+        target_dir: Target directory path
+    
+    Returns:
+        Manifest entries by relative path; empty if there is no usable manifest
+    """
+    try:
+        with open(target_dir / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != MANIFEST_VERSION:
+        return {}
+    return data.get('files', {})
+
+
+def save_manifest(target_dir: Path, entries: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Write the manifest atomically.
+    
+    Args:
+        target_dir: Target directory path
+        entries: Manifest entries by relative path
+    """
+    partial = target_dir / f"{MANIFEST_NAME}.tmp"
+    with open(partial, 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'files': dict(sorted(entries.items()))}, f, indent=1)
+    os.replace(partial, target_dir / MANIFEST_NAME)
+
+
+def manifest_entry(source_path: Path, target_path: Path, source_hash: str) -> Dict[str, Any]:
+    """
+    Record what a target file was written from.
+    
+    Args:
+        source_path: Template file
+        target_path: File written at the target
+        source_hash: Content hash of both
+    
+    Returns:
+        Manifest entry with the hash and both files' size and mtime
+    """
+    source_stat = os.stat(source_path)
+    target_stat = os.stat(target_path)
+    return {
+        'hash': source_hash,
+        'source_size': source_stat.st_size,
+        'source_mtime_ns': source_stat.st_mtime_ns,
+        'target_size': target_stat.st_size,
+        'target_mtime_ns': target_stat.st_mtime_ns,
+    }
+
+
+def target_state(target_path: Path, entry: Optional[Dict[str, Any]]) -> str:
+    """
+    Find out whether a target file still holds what the last copy wrote.
+    
+    Size and mtime are compared first, so unchanged files are not hashed.
+    
+    Args:
+        target_path: File at the target
+        entry: Its manifest entry, if any
+    
+    Returns:
+        "missing", "pristine" (as last written) or "edited"
+    """
+    try:
+        stat = os.stat(target_path)
+    except FileNotFoundError:
+        return 'missing'
+    if entry is None:
+        return 'edited'
+    if stat.st_size == entry['target_size'] and stat.st_mtime_ns == entry['target_mtime_ns']:
+        return 'pristine'
+    return 'pristine' if file_digest(target_path) == entry['hash'] else 'edited'
+
+
+def build_manifest(target_dir: Path, files: List[Tuple[str, str]], workers: int = DEFAULT_COPY_WORKERS) -> Dict[str, Dict[str, Any]]:
+    """
+    Manifest entries for a freshly copied template.
+    
+    Args:
+        target_dir: Target directory path
+        files: List of (source_path, relative_path) tuples
+        workers: Files hashed at the same time
+    
+    Returns:
+        Entries of the files present at the target with the template's content
+    """
+    def entry_for(item: Tuple[str, str]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        source_path, rel_path = item
+        target_path = target_dir / rel_path
+        source_hash = file_digest(Path(source_path))
+        try:
+            if file_digest(target_path) != source_hash:
+                return None
+        except OSError:
+            return None
+        return rel_path, manifest_entry(Path(source_path), target_path, source_hash)
+    
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        return dict(entry for entry in pool.map(entry_for, files) if entry)
+
+
+def sync_template(
+    target_dir: Path,
+    files: List[Tuple[str, str]],
+    delete: bool = False,
+    workers: int = DEFAULT_COPY_WORKERS
+) -> SyncStats:
+    """
+    Bring a previously copied template up to date.
+    
+    Only new files and files changed in the template are copied. A template
+    file's hash is reused from the manifest while its size and mtime are
+    unchanged. Target files edited or deleted locally since the last copy
+    are left alone and reported as kept.
+    
+    Args:
+        target_dir: Target directory path
+        files: List of (source_path, relative_path) tuples
+        delete: Delete files removed from the template, unless edited locally
+        workers: Files processed at the same time
+    
+    Returns:
+        SyncStats with copied, unchanged, deleted and kept files
+    """
+    stats = SyncStats()
+    lock = threading.Lock()
+    start = time.perf_counter()
+    manifest = load_manifest(target_dir)
+    updated: Dict[str, Dict[str, Any]] = {}
+    
+    def sync_one(item: Tuple[str, str]) -> None:
+        source_path, rel_path = Path(item[0]), item[1]
+        target_path = target_dir / rel_path
+        entry = manifest.get(rel_path)
+        try:
+            source_stat = os.stat(source_path)
+            if entry and (source_stat.st_size, source_stat.st_mtime_ns) == (entry['source_size'], entry['source_mtime_ns']):
+                source_hash = entry['hash']
+            else:
+                source_hash = file_digest(source_path)
+            
+            state = target_state(target_path, entry)
+            if state == 'pristine' and source_hash == entry['hash']:
+                with lock:
+                    updated[rel_path] = entry
+                    stats.unchanged += 1
+                return
+            if state == 'edited' and entry is None and file_digest(target_path) == source_hash:
+                # Already there with the template's content; start tracking it
+                with lock:
+                    updated[rel_path] = manifest_entry(source_path, target_path, source_hash)
+                    stats.unchanged += 1
+                return
+            if state == 'edited' or (state == 'missing' and entry is not None):
+                reason = 'edited locally' if state == 'edited' else 'deleted locally'
+                with lock:
+                    if entry is not None:
+                        updated[rel_path] = entry
+                    stats.kept.append((rel_path, reason))
+                return
+            
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            copied = copy_file_fast(source_path, target_path)
+            new_entry = manifest_entry(source_path, target_path, source_hash)
+            with lock:
+                updated[rel_path] = new_entry
+                stats.copied += 1
+                stats.bytes_copied += copied
         except Exception as e:
-            print(f"  ✗ {rel_path} - Error: {e}")
+            with lock:
+                if entry is not None:
+                    updated[rel_path] = entry
+                stats.errors.append((rel_path, str(e)))
+    
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        list(pool.map(sync_one, files))
+    
+    template_paths = {rel_path for _, rel_path in files}
+    for rel_path, entry in manifest.items():
+        if rel_path in template_paths:
+            continue
+        if not delete:
+            # Still tracked, so a later run with delete can remove it
+            updated[rel_path] = entry
+            continue
+        target_path = target_dir / rel_path
+        state = target_state(target_path, entry)
+        if state == 'pristine':
+            target_path.unlink()
+            stats.deleted += 1
+        elif state == 'edited':
+            stats.kept.append((rel_path, 'removed from template but edited locally'))
+    
+    save_manifest(target_dir, updated)
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def default_archive_cache() -> Path:
+    """
+    Directory where packed template archives are cached.
     
-    return copied_count
+    Returns:
+        $XDG_CACHE_HOME/pydantic-ai-template, or ~/.cache/pydantic-ai-template
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "pydantic-ai-template"
+
+
+def template_fingerprint(files: List[Tuple[str, str]]) -> str:
+    """
+    Cheap identity of the template's current state, from file stats only.
+    
+    Args:
+        files: List of (source_path, relative_path) tuples
+    
+    Returns:
+        Hex SHA-256 over every file's relative path, size and mtime
+    """
+    digest = hashlib.sha256()
+    for source_path, rel_path in sorted(files, key=lambda item: item[1]):
+        stat = os.stat(source_path)
+        digest.update(f"{rel_path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def pack_template(files: List[Tuple[str, str]], cache_dir: Path, workers: int = DEFAULT_COPY_WORKERS) -> Path:
+    """
+    Pack template files into a content-addressed archive.
+    
+    The archive is a zip file holding each distinct file content once, as a
+    separately deflated blob named by its hash, plus an index mapping every
+    relative path to its blob, size, mtime and mode. The archive itself is
+    named by the hash of the index, so equal templates share one archive.
+    
+    Args:
+        files: List of (source_path, relative_path) tuples
+        cache_dir: Directory to write the archive to
+        workers: Files hashed at the same time
+    
+    Returns:
+        Path of the archive
+    """
+    def describe(item: Tuple[str, str]) -> Dict[str, Any]:
+        source_path, rel_path = item
+        stat = os.stat(source_path)
+        return {
+            "path": rel_path,
+            "blob": file_digest(Path(source_path)),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "mode": stat.st_mode & 0o777,
+            "source": source_path,
+        }
+    
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        entries = sorted(pool.map(describe, files), key=lambda entry: entry["path"])
+    
+    index = [{key: value for key, value in entry.items() if key != "source"} for entry in entries]
+    index_bytes = json.dumps({"version": ARCHIVE_VERSION, "files": index}, indent=1).encode("utf-8")
+    template_hash = hashlib.sha256(
+        "".join(f"{entry['path']}\0{entry['blob']}\0{entry['mode']}\n" for entry in index).encode("utf-8")
+    ).hexdigest()
+    
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    archive_path = cache_dir / f"template-{template_hash[:32]}.zip"
+    if archive_path.exists():
+        return archive_path
+    
+    partial = cache_dir / f"{archive_path.name}.{os.getpid()}.tmp"
+    with zipfile.ZipFile(partial, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(ARCHIVE_INDEX, index_bytes)
+        written = set()
+        for entry in entries:
+            if entry["blob"] not in written:
+                archive.write(entry["source"], f"blobs/{entry['blob']}")
+                written.add(entry["blob"])
+    os.replace(partial, archive_path)
+    return archive_path
+
+
+def cached_archive(files: List[Tuple[str, str]], cache_dir: Path, workers: int = DEFAULT_COPY_WORKERS) -> Tuple[Path, bool]:
+    """
+    Get the archive of the template's current state, packing it on first use.
+    
+    A fingerprint of the template's file stats points at the archive, so an
+    unchanged template is not read again to find it.
+    
+    Args:
+        files: List of (source_path, relative_path) tuples
+        cache_dir: Archive cache directory
+        workers: Files hashed at the same time
+    
+    Returns:
+        (archive path, whether it was packed by this call)
+    """
+    pointer = cache_dir / "fingerprints" / template_fingerprint(files)
+    try:
+        archive_path = cache_dir / pointer.read_text(encoding="utf-8").strip()
+        if archive_path.exists():
+            return archive_path, False
+    except OSError:
+        pass
+    
+    archive_path = pack_template(files, cache_dir, workers)
+    pointer.parent.mkdir(parents=True, exist_ok=True)
+    pointer.write_text(archive_path.name, encoding="utf-8")
+    return archive_path, True
+
+
+def archive_member_path(target_dir: Path, rel_path: str) -> Path:
+    """
+    Resolve an archive index path inside the target directory.
+    
+    Args:
+        target_dir: Target directory path
+        rel_path: Relative path from the archive index
+    
+    Returns:
+        Path of the file under target_dir
+    
+    Raises:
+        ValueError: If the path is absolute or leaves the target directory
+    """
+    # Archives may be packed on Windows, so backslashes count as separators
+    parts = rel_path.replace("\\", "/").split("/")
+    absolute = rel_path.startswith(("/", "\\")) or ":" in parts[0]
+    if absolute or ".." in parts or not rel_path:
+        raise ValueError(f"Unsafe path in template archive: {rel_path!r}")
+    return target_dir.joinpath(*parts)
+
+
+def extract_archive(archive_path: Path, target_dir: Path, workers: int = DEFAULT_COPY_WORKERS) -> CopyStats:
+    """
+    Extract a template archive into the target directory.
+    
+    The archive is read front to back once; blobs are inflated on a thread
+    pool (zlib releases the GIL) and written to every path that uses them,
+    with the packed mtime and mode. A manifest is written so the copy can be
+    updated later with --sync.
+    
+    Args:
+        archive_path: Archive made by pack_template
+        target_dir: Target directory path
+        workers: Blobs inflated at the same time
+    
+    Returns:
+        CopyStats with the files written, bytes and elapsed time
+    
+    Raises:
+        ValueError: If the archive version is unknown, an index path is
+            absolute or contains "..", or the index and the blobs in the
+            archive disagree; all checked before anything is written
+    """
+    stats = CopyStats()
+    lock = threading.Lock()
+    start = time.perf_counter()
+    manifest: Dict[str, Dict[str, Any]] = {}
+    
+    with zipfile.ZipFile(archive_path) as archive:
+        index = json.loads(archive.read(ARCHIVE_INDEX))
+        if index.get("version") != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported template archive version in {archive_path}")
+        
+        # The archive may come from elsewhere: check every path and blob before writing
+        targets = {entry["path"]: archive_member_path(target_dir, entry["path"]) for entry in index["files"]}
+        by_blob: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in index["files"]:
+            by_blob.setdefault(entry["blob"], []).append(entry)
+        # Archive order, so the file is read sequentially
+        blobs = sorted(
+            (info for info in archive.infolist() if info.filename.startswith("blobs/")),
+            key=lambda info: info.header_offset
+        )
+        stored = {info.filename.split("/", 1)[1] for info in blobs}
+        if stored != set(by_blob):
+            missing, unused = sorted(set(by_blob) - stored), sorted(stored - set(by_blob))
+            raise ValueError(
+                f"Template archive {archive_path} does not match its index: "
+                f"{len(missing)} blob(s) missing {missing[:3]}, {len(unused)} not indexed {unused[:3]}"
+            )
+        for target_path in targets.values():
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        def extract_blob(info: zipfile.ZipInfo) -> None:
+            blob = info.filename.split("/", 1)[1]
+            try:
+                data = archive.read(info)
+                for entry in by_blob.get(blob, []):
+                    target_path = targets[entry["path"]]
+                    with open(target_path, "wb") as f:
+                        f.write(data)
+                    os.chmod(target_path, entry["mode"] & 0o777)
+                    os.utime(target_path, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+                    target_stat = os.stat(target_path)
+                    with lock:
+                        stats.copied += 1
+                        stats.bytes_copied += len(data)
+                        manifest[entry["path"]] = {
+                            "hash": blob,
+                            "source_size": entry["size"],
+                            "source_mtime_ns": entry["mtime_ns"],
+                            "target_size": target_stat.st_size,
+                            "target_mtime_ns": target_stat.st_mtime_ns,
+                        }
+            except Exception as e:
+                with lock:
+                    stats.errors.extend((entry["path"], str(e)) for entry in by_blob.get(blob, []))
+        
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+            list(pool.map(extract_blob, blobs))
+    
+    save_manifest(target_dir, manifest)
+    stats.elapsed = time.perf_counter() - start
+    return stats
 
 
 def validate_template_integrity(target_dir: Path) -> bool:
@@ -199,6 +768,29 @@ Happy agent building! 🤖
 """)
 
 
+def extract_template(archive_path: Path, target_dir: Path, workers: int) -> None:
+    """
+    Extract a template archive and report the result.
+    
+    Args:
+        archive_path: Archive made by pack_template
+        target_dir: Target directory path
+        workers: Blobs inflated at the same time
+    """
+    print(f"\n📦 Extracting {archive_path.name} into: {target_dir}")
+    target_dir.mkdir(parents=True, exist_ok=True)
+    stats = extract_archive(archive_path, target_dir, workers)
+    for rel_path, error in stats.errors:
+        print(f"  ✗ {rel_path} - Error: {error}")
+    print(f"\n✅ Extracted {stats.copied} files ({stats.bytes_copied / 1024:.1f} KB in {stats.elapsed:.2f}s)")
+    
+    if validate_template_integrity(target_dir):
+        print("✅ Template integrity check passed")
+        print_next_steps(target_dir)
+    else:
+        print("⚠️  Template may be incomplete. Check for missing files.")
+
+
 def main():
     """Main function for the copy template script."""
     parser = argparse.ArgumentParser(
@@ -207,6 +799,10 @@ def main():
         epilog="""
 Examples:
   python copy_template.py my-agent-project
+  python copy_template.py my-agent-project --sync --delete
+  python copy_template.py my-agent-project --archive
+  python copy_template.py --pack
+  python copy_template.py my-agent-project --from-archive template-<hash>.zip
   python copy_template.py /path/to/my-new-agent
   python copy_template.py ../customer-support-agent
         """
@@ -214,6 +810,7 @@ Examples:
     
     parser.add_argument(
         "target_directory",
+        nargs="?",
         help="Target directory for the new PydanticAI project"
     )
     
@@ -229,12 +826,67 @@ Examples:
         help="Show what would be copied without actually copying"
     )
     
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Update an existing copy: only new or changed template files, keeping local edits"
+    )
+    
+    parser.add_argument(
+        "--delete",
+        action="store_true",
+        help="With --sync, delete files removed from the template (unless edited locally)"
+    )
+    
+    parser.add_argument(
+        "--archive",
+        action="store_true",
+        help="Extract the template from its cached archive, packing it on first use"
+    )
+    
+    parser.add_argument(
+        "--from-archive",
+        metavar="ARCHIVE",
+        help="Extract the template from an archive made with --pack"
+    )
+    
+    parser.add_argument(
+        "--pack",
+        action="store_true",
+        help="Only pack the template into the archive cache and print the archive path"
+    )
+    
+    parser.add_argument(
+        "--archive-cache",
+        default=str(default_archive_cache()),
+        help="Archive cache directory (default: %(default)s)"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_COPY_WORKERS,
+        help=f"Files copied concurrently (default: {DEFAULT_COPY_WORKERS})"
+    )
+    
     if len(sys.argv) == 1:
         parser.print_help()
         return
     
     args = parser.parse_args()
     
+    if args.delete and not args.sync:
+        parser.error("--delete requires --sync")
+    if args.sync and (args.archive or args.from_archive):
+        parser.error("--sync copies files; it cannot be combined with --archive or --from-archive")
+    if not args.target_directory and not args.pack:
+        parser.error("the target directory is required")
+    
+    if args.pack:
+        archive_path, packed = cached_archive(get_template_files(), Path(args.archive_cache), args.workers)
+        print(f"{'📦 Packed' if packed else '📦 Cached'}: {archive_path} ({archive_path.stat().st_size / 1024:.1f} KB)")
+        return
+    
     # Convert target directory to Path object
     target_dir = Path(args.target_directory).resolve()
     
@@ -244,14 +896,25 @@ Examples:
             print(f"❌ Error: {target_dir} is a file, not a directory")
             return
         
-        if list(target_dir.iterdir()) and not args.force:
+        if list(target_dir.iterdir()) and not args.force and not args.sync:
             print(f"❌ Error: {target_dir} is not empty")
-            print("Use --force to overwrite existing directory")
+            print("Use --sync to update a previous copy or --force to overwrite existing directory")
             return
         
         if args.force and not args.dry_run:
             print(f"⚠️  Overwriting existing directory: {target_dir}")
     
+    if args.from_archive:
+        if args.dry_run:
+            with zipfile.ZipFile(args.from_archive) as archive:
+                index = json.loads(archive.read(ARCHIVE_INDEX))
+            print(f"🔍 Dry run - would extract to: {target_dir}")
+            for entry in index["files"]:
+                print(f"  → {entry['path']}")
+            return
+        extract_template(Path(args.from_archive), target_dir, args.workers)
+        return
+    
     # Get list of files to copy
     print("📂 Scanning PydanticAI template files...")
     files_to_copy = get_template_files()
@@ -268,17 +931,43 @@ Examples:
             print(f"  → {rel_path}")
         return
     
+    if args.archive:
+        archive_path, packed = cached_archive(files_to_copy, Path(args.archive_cache), args.workers)
+        print(f"{'📦 Packed' if packed else '📦 Using cached'} archive {archive_path}")
+        extract_template(archive_path, target_dir, args.workers)
+        return
+    
+    if args.sync:
+        print(f"\n🔄 Syncing template files into: {target_dir}")
+        target_dir.mkdir(parents=True, exist_ok=True)
+        stats = sync_template(target_dir, files_to_copy, args.delete, args.workers)
+        for rel_path, reason in stats.kept:
+            print(f"  ✋ {rel_path} - kept ({reason})")
+        for rel_path, error in stats.errors:
+            print(f"  ✗ {rel_path} - Error: {error}")
+        print(f"\n✅ Synced in {stats.elapsed * 1000:.0f}ms: {stats.copied} copied "
+              f"({stats.bytes_copied / 1024:.1f} KB), {stats.unchanged} unchanged, "
+              f"{stats.deleted} deleted, {len(stats.kept)} kept")
+        if not validate_template_integrity(target_dir):
+            print("⚠️  Template may be incomplete. Check for missing files.")
+        return
+    
     # Create target directory and structure
     print(f"\n📁 Creating directory structure in: {target_dir}")
     target_dir.mkdir(parents=True, exist_ok=True)
     create_directory_structure(target_dir, files_to_copy)
     
     # Copy files
-    print(f"\n📋 Copying template files:")
-    copied_count = copy_template_files(target_dir, files_to_copy)
+    print(f"\n📋 Copying template files with {args.workers} workers...")
+    stats = copy_template_files(target_dir, files_to_copy, args.workers)
+    for rel_path, error in stats.errors:
+        print(f"  ✗ {rel_path} - Error: {error}")
     
     # Validate template integrity
-    print(f"\n✅ Copied {copied_count}/{len(files_to_copy)} files successfully")
+    print(f"\n✅ Copied {stats.copied}/{len(files_to_copy)} files "
+          f"({stats.bytes_copied / 1024:.1f} KB in {stats.elapsed:.2f}s), "
+          f"{stats.skipped} already up to date")
+    save_manifest(target_dir, build_manifest(target_dir, files_to_copy, args.workers))
     
     if validate_template_integrity(target_dir):
         print("✅ Template integrity check passed")
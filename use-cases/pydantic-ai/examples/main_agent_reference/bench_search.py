@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark search_web_tool with the pooled HTTP client against a client per call.
+
+Runs the same queries against a local Brave stub (see stub_brave.py), once
+opening a new httpx.AsyncClient for every query, as search_web_tool used
+to, and once through the shared HTTPClientPool. The stub adds a delay to
+every new connection to stand in for the TCP and TLS handshake.
+
+Usage:
+    python bench_search.py [--queries 200] [--concurrency 10] [--connect-delay-ms 30]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+from typing import Optional
+
+import httpx
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.tools import HTTPClientPool, search_web_tool
+from agents.stub_brave import StubBraveServer
+
+
+async def run_queries(
+    server: StubBraveServer,
+    queries: int,
+    concurrency: int,
+    pool: Optional[HTTPClientPool] = None
+) -> float:
+    """
+    Send queries to the stub and return the elapsed seconds.
+
+    Args:
+        server: Running stub server
+        queries: Number of queries to send
+        concurrency: Queries in flight at once
+        pool: Shared client pool; None opens a client per query
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            if pool is not None:
+                await search_web_tool("bench", f"query {index}", client=pool.client(), search_url=server.url)
+            else:
+                async with httpx.AsyncClient(timeout=30.0) as client:
+                    await search_web_tool("bench", f"query {index}", client=client, search_url=server.url)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(queries)))
+    return time.perf_counter() - start
+
+
+async def main() -> int:
+    """Main function for the search benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark pooled vs unpooled Brave search throughput")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per run (default: 200)")
+    parser.add_argument("--concurrency", type=int, default=10, help="Queries in flight (default: 10)")
+    parser.add_argument("--connect-delay-ms", type=float, default=30.0,
+                        help="Delay per new connection, standing in for TCP+TLS setup (default: 30)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay per request (default: 0)")
+    args = parser.parse_args()
+
+    with StubBraveServer(connect_delay=args.connect_delay_ms / 1000, latency=args.latency_ms / 1000) as server:
+        print(f"🔍 {args.queries} queries, {args.concurrency} concurrent, "
+              f"{args.connect_delay_ms:.0f} ms per new connection\n")
+
+        unpooled = await run_queries(server, args.queries, args.concurrency)
+        unpooled_connections = server.connections
+        server.reset_counters()
+
+        # The stub speaks HTTP/1.1 only
+        async with HTTPClientPool(max_connections=args.concurrency, http2=False) as pool:
+            pooled = await run_queries(server, args.queries, args.concurrency, pool)
+        pooled_connections = server.connections
+
+    print(f"{'mode':<10} {'seconds':>8} {'queries/s':>10} {'connections':>12}")
+    print(f"{'unpooled':<10} {unpooled:>8.2f} {args.queries / unpooled:>10.1f} {unpooled_connections:>12}")
+    print(f"{'pooled':<10} {pooled:>8.2f} {args.queries / pooled:>10.1f} {pooled_connections:>12}")
+    print(f"\n✅ Pooled client is {unpooled / pooled:.1f}x faster")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,258 @@
+"""
+Search result cache for the research agent.
+
+Results are kept in memory in an LRU bounded by entry count, each with a
+time-to-live. An optional SQLite file sits behind it, so results survive
+restarts and are shared by every process using the same file. Memory hits
+are a dictionary lookup; disk hits are copied into memory.
+"""
+
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 3600.0
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_DISK_ENTRIES = 100_000
+
+# SQLite writes between two prunes of expired and surplus rows
+PRUNE_INTERVAL = 100
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query so trivially different spellings share a cache entry.
+
+    Args:
+        query: Search query
+
+    Returns:
+        Query lower-cased with whitespace collapsed
+    """
+    return " ".join(query.lower().split())
+
+
+def search_key(
+    query: str,
+    count: int,
+    offset: int = 0,
+    country: Optional[str] = None,
+    lang: Optional[str] = None
+) -> str:
+    """
+    Build the cache key of a search.
+
+    Args:
+        query: Search query
+        count: Number of results
+        offset: Offset for pagination
+        country: Country code
+        lang: Language code
+
+    Returns:
+        Key string
+    """
+    return json.dumps([normalize_query(query), count, offset, (country or "").lower(), (lang or "").lower()])
+
+
+@dataclass
+class CacheStats:
+    """Cache counters."""
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    expirations: int = 0
+    evictions: int = 0
+    entries: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class SearchCache:
+    """
+    TTL and LRU cache of search results, optionally backed by SQLite.
+
+    Thread-safe; failures of the SQLite backend are logged and treated as
+    misses, so a broken cache file never fails a search.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        sqlite_path: Optional[str] = None,
+        max_disk_entries: int = DEFAULT_MAX_DISK_ENTRIES
+    ):
+        """
+        Args:
+            ttl: Seconds a result stays valid
+            max_entries: Results kept in memory; the least recently used is
+                evicted beyond that
+            sqlite_path: SQLite file to persist results in (None keeps them
+                in memory only)
+            max_disk_entries: Results kept in the SQLite file
+
+        Raises:
+            ValueError: If ttl is not positive or max_entries is below 1
+        """
+        if ttl <= 0 or max_entries < 1:
+            raise ValueError("ttl must be positive and max_entries at least 1")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._entries: "OrderedDict[str, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_writes = 0
+        if sqlite_path:
+            self._db = self._open(sqlite_path)
+
+    @staticmethod
+    def _open(sqlite_path: str) -> Optional[sqlite3.Connection]:
+        """Open the SQLite backend; None, logged, if the file is unusable."""
+        db = None
+        try:
+            db = sqlite3.connect(sqlite_path, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS search_cache ("
+                "key TEXT PRIMARY KEY, results TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Search cache file {sqlite_path} unusable, caching in memory only: {e}")
+            if db is not None:
+                db.close()
+            return None
+        return db
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up cached results.
+
+        Args:
+            key: Key from search_key()
+
+        Returns:
+            Copy of the cached results, or None on a miss or expired entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, results = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._stats.hits += 1
+                    return [dict(result) for result in results]
+                del self._entries[key]
+                self._stats.expirations += 1
+
+            found = self._disk_get(key)
+            if found is None:
+                self._stats.misses += 1
+                return None
+            results, remaining = found
+            self._stats.hits += 1
+            self._stats.disk_hits += 1
+            self._remember(key, results, time.monotonic() + remaining)
+            return [dict(result) for result in results]
+
+    def set(self, key: str, results: List[Dict[str, Any]]) -> None:
+        """
+        Store results.
+
+        Args:
+            key: Key from search_key()
+            results: Search results; copied, so later changes by the caller
+                do not leak into the cache
+        """
+        results = [dict(result) for result in results]
+        with self._lock:
+            self._remember(key, results, time.monotonic() + self.ttl)
+            self._disk_set(key, results)
+
+    def clear(self) -> None:
+        """Drop every cached result, in memory and on disk."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM search_cache")
+                except sqlite3.Error as e:
+                    logger.warning(f"Search cache clear failed: {e}")
+
+    def close(self) -> None:
+        """Close the SQLite backend, if any."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics.
+
+        Returns:
+            Dictionary with hits, disk_hits, misses, expirations, evictions,
+            entries and hit_rate
+        """
+        with self._lock:
+            self._stats.entries = len(self._entries)
+            stats = asdict(self._stats)
+            stats["hit_rate"] = round(self._stats.hit_rate, 4)
+            return stats
+
+    def _remember(self, key: str, results: List[Dict[str, Any]], expires_at: float) -> None:
+        self._entries[key] = (expires_at, results)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    def _disk_get(self, key: str) -> Optional[Tuple[List[Dict[str, Any]], float]]:
+        """Look up a result on disk; returns it with its remaining seconds."""
+        if self._db is None:
+            return None
+        now = time.time()
+        try:
+            row = self._db.execute(
+                "SELECT results, expires_at FROM search_cache WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE search_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            return json.loads(row[0]), row[1] - now
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Search cache read failed: {e}")
+            return None
+
+    def _disk_set(self, key: str, results: List[Dict[str, Any]]) -> None:
+        if self._db is None:
+            return
+        now = time.time()
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO search_cache (key, results, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(results), now + self.ttl, now)
+            )
+            self._disk_writes += 1
+            if self._disk_writes % PRUNE_INTERVAL:
+                return
+            self._db.execute("DELETE FROM search_cache WHERE expires_at <= ?", (now,))
+            self._db.execute(
+                "DELETE FROM search_cache WHERE key IN ("
+                "SELECT key FROM search_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,)
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Search cache write failed: {e}")
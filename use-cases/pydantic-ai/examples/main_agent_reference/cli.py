@@ -4,7 +4,9 @@
 import asyncio
 import sys
 import os
-from typing import List
+import time
+import threading
+from typing import List, Optional
 
 # Add parent directory to Python path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -14,131 +16,202 @@ from rich.panel import Panel
 from rich.prompt import Prompt
 from rich.live import Live
 from rich.text import Text
+from rich.markup import escape
 
 from pydantic_ai import Agent
+from pydantic_ai.messages import (
+    FunctionToolCallEvent,
+    FunctionToolResultEvent,
+    PartDeltaEvent,
+    PartStartEvent,
+    TextPart,
+    TextPartDelta,
+    ToolCallPart
+)
 from agents.research_agent import research_agent
+from agents.tools import close_http_pool
+from agents.memory import ConversationMemory
 from agents.dependencies import ResearchAgentDependencies
 from agents.settings import settings
 
 console = Console()
 
+# Terminal updates per second while a response streams in
+REFRESH_PER_SECOND = 12
 
-async def stream_agent_interaction(user_input: str, conversation_history: List[str]) -> tuple[str, str]:
+
+class StreamRenderer:
+    """
+    Render streamed text at a bounded frame rate.
+    
+    Deltas are only appended to lists; once per frame the pending text is
+    joined and split at its last newline. Complete lines are printed once,
+    above the live display, and only the unfinished line is redrawn by
+    rich.Live, so terminal output stays linear in the response length.
+    """
+    
+    def __init__(self, prefix: Text, refresh_per_second: float = REFRESH_PER_SECOND):
+        self.prefix = prefix
+        self.interval = 1.0 / refresh_per_second
+        self._chunks: List[str] = []
+        self._pending: List[str] = []
+        self._line = ""
+        self._prefix_shown = False
+        self._last_frame = 0.0
+        self._live: Optional[Live] = None
+    
+    @property
+    def text(self) -> str:
+        """Everything received so far."""
+        return "".join(self._chunks)
+    
+    def append(self, delta: str) -> None:
+        """Queue a text delta, drawing a frame if one is due."""
+        if not delta:
+            return
+        self._chunks.append(delta)
+        self._pending.append(delta)
+        if self._live is None:
+            self._live = Live(console=console, auto_refresh=False, transient=True, vertical_overflow="visible")
+            self._live.start()
+        if time.monotonic() - self._last_frame >= self.interval:
+            self._frame()
+    
+    def _decorate(self, text: str) -> Text:
+        if self._prefix_shown:
+            return Text(text)
+        return Text.assemble(self.prefix, text)
+    
+    def _frame(self) -> None:
+        self._last_frame = time.monotonic()
+        line = self._line + "".join(self._pending)
+        self._pending.clear()
+        done, newline, self._line = line.rpartition("\n")
+        if newline:
+            self._live.console.print(self._decorate(done), highlight=False)
+            self._prefix_shown = True
+        self._live.update(self._decorate(self._line), refresh=True)
+    
+    def close(self) -> str:
+        """
+        Draw the remaining text and stop the live display.
+        
+        Returns:
+            The complete streamed text
+        """
+        if self._live is not None:
+            self._frame()
+            self._live.stop()
+            # The live region is transient; print the last line for good
+            console.print(self._decorate(self._line), highlight=False)
+            self._live = None
+        return self.text
+
+
+def format_tool_args(part: ToolCallPart) -> Optional[str]:
+    """Preview of a tool call's arguments: the first three, each shortened."""
+    try:
+        args = part.args_as_dict()
+    except Exception:
+        args = part.args
+    if not args:
+        return None
+    if isinstance(args, dict):
+        preview = []
+        for key, value in list(args.items())[:3]:
+            val_str = str(value)
+            if len(val_str) > 50:
+                val_str = val_str[:47] + "..."
+            preview.append(f"{key}={val_str}")
+        return ", ".join(preview)
+    args_str = str(args)
+    return args_str[:97] + "..." if len(args_str) > 100 else args_str
+
+
+async def ask(prompt: str) -> str:
+    """
+    Read user input without blocking the event loop.
+    
+    The prompt runs in a daemon thread, so background work such as
+    conversation summarization keeps running while the user types. A
+    daemon thread rather than asyncio.to_thread: on Ctrl+C the loop shuts
+    down without waiting for the pending read. EOF (Ctrl+D) is raised here
+    as EOFError.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def settle(setter, value) -> None:
+        if not future.done():
+            setter(value)
+    
+    def read() -> None:
+        try:
+            answer = Prompt.ask(prompt)
+        except BaseException as e:
+            loop.call_soon_threadsafe(settle, future.set_exception, e)
+        else:
+            loop.call_soon_threadsafe(settle, future.set_result, answer)
+    
+    threading.Thread(target=read, daemon=True).start()
+    return await future
+
+
+async def stream_agent_interaction(user_input: str, memory: ConversationMemory) -> tuple[str, str]:
     """Stream agent interaction with real-time tool call display."""
     
     try:
         # Set up dependencies
         research_deps = ResearchAgentDependencies(brave_api_key=settings.brave_api_key)
         
-        # Build context with conversation history
-        context = "\n".join(conversation_history[-6:]) if conversation_history else ""
+        # Earlier turns, within the token budget, as pydantic-ai messages
+        history = await memory.history()
+        
+        response_text = ""
         
-        prompt = f"""Previous conversation:
-{context}
-
-User: {user_input}
-
-Respond naturally and helpfully."""
-
         # Stream the agent execution
-        async with research_agent.iter(prompt, deps=research_deps) as run:
+        async with research_agent.iter(user_input, deps=research_deps, message_history=history or None) as run:
             
             async for node in run:
                 
-                # Handle user prompt node
-                if Agent.is_user_prompt_node(node):
-                    pass  # Clean start - no processing messages
-                
                 # Handle model request node - stream the thinking process
-                elif Agent.is_model_request_node(node):
-                    # Show assistant prefix at the start
-                    console.print("[bold blue]Assistant:[/bold blue] ", end="")
-                    
-                    # Stream model request events for real-time text
-                    response_text = ""
-                    async with node.stream(run.ctx) as request_stream:
-                        async for event in request_stream:
-                            # Handle different event types based on their type
-                            event_type = type(event).__name__
-                            
-                            if event_type == "PartDeltaEvent":
-                                # Extract content from delta
-                                if hasattr(event, 'delta') and hasattr(event.delta, 'content_delta'):
-                                    delta_text = event.delta.content_delta
-                                    if delta_text:
-                                        console.print(delta_text, end="")
-                                        response_text += delta_text
-                            elif event_type == "FinalResultEvent":
-                                console.print()  # New line after streaming
+                if Agent.is_model_request_node(node):
+                    # The assistant prefix is shown with the first text
+                    renderer = StreamRenderer(Text("Assistant: ", style="bold blue"))
+                    try:
+                        async with node.stream(run.ctx) as request_stream:
+                            async for event in request_stream:
+                                if isinstance(event, PartStartEvent) and isinstance(event.part, TextPart):
+                                    renderer.append(event.part.content)
+                                elif isinstance(event, PartDeltaEvent) and isinstance(event.delta, TextPartDelta):
+                                    renderer.append(event.delta.content_delta)
+                    finally:
+                        streamed = renderer.close()
+                    if streamed:
+                        response_text = streamed
                 
                 # Handle tool calls - this is the key part
                 elif Agent.is_call_tools_node(node):
                     # Stream tool execution events
                     async with node.stream(run.ctx) as tool_stream:
                         async for event in tool_stream:
-                            event_type = type(event).__name__
-                            
-                            if event_type == "FunctionToolCallEvent":
-                                # Extract tool name from the part attribute  
-                                tool_name = "Unknown Tool"
-                                args = None
-                                
-                                # Check if the part attribute contains the tool call
-                                if hasattr(event, 'part'):
-                                    part = event.part
-                                    
-                                    # Check if part has tool_name directly
-                                    if hasattr(part, 'tool_name'):
-                                        tool_name = part.tool_name
-                                    elif hasattr(part, 'function_name'):
-                                        tool_name = part.function_name
-                                    elif hasattr(part, 'name'):
-                                        tool_name = part.name
-                                    
-                                    # Check for arguments in part
-                                    if hasattr(part, 'args'):
-                                        args = part.args
-                                    elif hasattr(part, 'arguments'):
-                                        args = part.arguments
-                                
-                                # Debug: print part attributes to understand structure
-                                if tool_name == "Unknown Tool" and hasattr(event, 'part'):
-                                    part_attrs = [attr for attr in dir(event.part) if not attr.startswith('_')]
-                                    console.print(f"    [dim red]Debug - Part attributes: {part_attrs}[/dim red]")
-                                    
-                                    # Try to get more details about the part
-                                    if hasattr(event.part, '__dict__'):
-                                        console.print(f"    [dim red]Part dict: {event.part.__dict__}[/dim red]")
-                                
-                                console.print(f"  🔹 [cyan]Calling tool:[/cyan] [bold]{tool_name}[/bold]")
+                            if isinstance(event, FunctionToolCallEvent):
+                                console.print(f"  🔹 [cyan]Calling tool:[/cyan] [bold]{event.part.tool_name}[/bold]")
                                 
                                 # Show tool args if available
-                                if args and isinstance(args, dict):
-                                    # Show first few characters of each arg
-                                    arg_preview = []
-                                    for key, value in list(args.items())[:3]:
-                                        val_str = str(value)
-                                        if len(val_str) > 50:
-                                            val_str = val_str[:47] + "..."
-                                        arg_preview.append(f"{key}={val_str}")
-                                    console.print(f"    [dim]Args: {', '.join(arg_preview)}[/dim]")
-                                elif args:
-                                    args_str = str(args)
-                                    if len(args_str) > 100:
-                                        args_str = args_str[:97] + "..."
-                                    console.print(f"    [dim]Args: {args_str}[/dim]")
+                                args_preview = format_tool_args(event.part)
+                                if args_preview:
+                                    console.print(f"    [dim]Args: {escape(args_preview)}[/dim]")
                             
-                            elif event_type == "FunctionToolResultEvent":
+                            elif isinstance(event, FunctionToolResultEvent):
                                 # Display tool result
-                                result = str(event.tool_return) if hasattr(event, 'tool_return') else "No result"
+                                result = str(event.result.content)
                                 if len(result) > 100:
                                     result = result[:97] + "..."
-                                console.print(f"  ✅ [green]Tool result:[/green] [dim]{result}[/dim]")
-                
-                # Handle end node  
-                elif Agent.is_end_node(node):
-                    # Don't show "Processing complete" - keep it clean
-                    pass
+                                console.print(f"  ✅ [green]Tool result:[/green] [dim]{escape(result)}[/dim]")
+        
+        # Remember the whole turn, tool calls included
+        memory.add_turn(run.result.new_messages())
         
         # Get final result
         final_result = run.result
@@ -166,12 +239,29 @@ async def main():
     console.print(welcome)
     console.print()
     
-    conversation_history = []
+    memory = ConversationMemory(
+        token_budget=settings.memory_token_budget,
+        summary_tokens=settings.memory_summary_tokens
+    )
+    
+    try:
+        await conversation_loop(memory)
+    finally:
+        await memory.aclose()
+
+
+async def conversation_loop(memory: ConversationMemory):
+    """
+    Read prompts and stream answers until the user exits.
+    
+    Ctrl+C cancels this task; asyncio.run then raises KeyboardInterrupt,
+    which the entry point reports as a goodbye.
+    """
     
     while True:
         try:
             # Get user input
-            user_input = Prompt.ask("[bold green]You").strip()
+            user_input = (await ask("[bold green]You")).strip()
             
             # Handle exit
             if user_input.lower() in ['exit', 'quit']:
@@ -181,34 +271,40 @@ async def main():
             if not user_input:
                 continue
             
-            # Add to history
-            conversation_history.append(f"User: {user_input}")
-            
             # Stream the interaction and get response
-            streamed_text, final_response = await stream_agent_interaction(user_input, conversation_history)
+            streamed_text, final_response = await stream_agent_interaction(user_input, memory)
             
             # Handle the response display
             if streamed_text:
                 # Response was streamed, just add spacing
                 console.print()
-                conversation_history.append(f"Assistant: {streamed_text}")
             elif final_response and final_response.strip():
                 # Response wasn't streamed, display with proper formatting
                 console.print(f"[bold blue]Assistant:[/bold blue] {final_response}")
                 console.print()
-                conversation_history.append(f"Assistant: {final_response}")
             else:
                 # No response
                 console.print()
             
-        except KeyboardInterrupt:
-            console.print("\n[yellow]Use 'exit' to quit[/yellow]")
-            continue
+        except EOFError:
+            console.print("\n[yellow]👋 Goodbye![/yellow]")
+            break
             
         except Exception as e:
             console.print(f"[red]Error: {e}[/red]")
             continue
 
 
+async def run_cli():
+    """Run the conversation loop, closing pooled connections on exit."""
+    try:
+        await main()
+    finally:
+        await close_http_pool()
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    try:
+        asyncio.run(run_cli())
+    except KeyboardInterrupt:
+        console.print("\n[yellow]👋 Goodbye![/yellow]")
\ No newline at end of file
@@ -0,0 +1,297 @@
+"""
+Token-budgeted conversation memory for the CLI.
+
+Each turn (the messages of one agent run: prompt, tool calls and answer)
+is stored with its estimated token count and passed back to the agent as
+pydantic-ai message_history. When the kept turns and the running summary
+exceed the token budget, the oldest turns are evicted whole, so tool calls
+stay paired with their returns, and folded into the summary by a small
+summarizer agent. Summarization starts in the background as soon as a turn
+is added, while the user types the next message; history() waits for it
+only up to a timeout and otherwise uses the previous summary.
+
+pydantic-ai only adds the agent's system prompt when there is no message
+history, so the system prompt parts of the first turn are pinned and sent
+ahead of the summary on every turn.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from pydantic_ai import Agent
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelRequest,
+    RetryPromptPart,
+    SystemPromptPart,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart
+)
+
+from .providers import get_llm_model
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOKEN_BUDGET = 4000
+DEFAULT_SUMMARY_TOKENS = 500
+DEFAULT_SUMMARY_WAIT = 5.0
+
+# Characters of a tool return shown to the summarizer
+TOOL_RETURN_PREVIEW = 500
+
+Summarizer = Callable[[str, List[ModelMessage], int], Awaitable[str]]
+
+try:
+    import tiktoken
+
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens of a text.
+
+    Uses tiktoken's cl100k_base encoding when tiktoken is installed,
+    otherwise estimates four characters per token.
+
+    Args:
+        text: Text to count
+
+    Returns:
+        Token count
+    """
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def message_text(message: ModelMessage, tool_preview: Optional[int] = None) -> str:
+    """
+    Render a message as plain text.
+
+    Args:
+        message: Request or response message
+        tool_preview: Truncate tool returns to this many characters
+
+    Returns:
+        One line per part, such as "User: ..." or "Assistant: ..."
+    """
+    lines = []
+    for part in message.parts:
+        if isinstance(part, UserPromptPart):
+            content = part.content if isinstance(part.content, str) else " ".join(str(c) for c in part.content)
+            lines.append(f"User: {content}")
+        elif isinstance(part, TextPart):
+            lines.append(f"Assistant: {part.content}")
+        elif isinstance(part, ToolCallPart):
+            lines.append(f"Tool call {part.tool_name}: {part.args_as_json_str()}")
+        elif isinstance(part, ToolReturnPart):
+            content = part.model_response_str()
+            if tool_preview is not None and len(content) > tool_preview:
+                content = content[:tool_preview] + "..."
+            lines.append(f"Tool {part.tool_name} returned: {content}")
+        elif isinstance(part, RetryPromptPart):
+            lines.append(f"Tool retry: {part.model_response()}")
+        elif isinstance(part, SystemPromptPart):
+            lines.append(f"System: {part.content}")
+    return "\n".join(lines)
+
+
+SUMMARY_PROMPT = """
+You maintain a running summary of a conversation between a user and a research assistant.
+Merge the new conversation turns into the existing summary. Keep facts, decisions, names,
+URLs and open questions the user may come back to; drop pleasantries and repetition.
+Answer with the updated summary only.
+"""
+
+_summary_agent: Optional[Agent] = None
+
+
+async def summarize_with_agent(summary: str, messages: List[ModelMessage], max_tokens: int) -> str:
+    """
+    Fold conversation messages into a running summary with an LLM.
+
+    Args:
+        summary: Current summary, empty at first
+        messages: Messages of the evicted turns
+        max_tokens: Length to keep the summary under
+
+    Returns:
+        Updated summary
+    """
+    global _summary_agent
+    if _summary_agent is None:
+        _summary_agent = Agent(get_llm_model(), system_prompt=SUMMARY_PROMPT)
+
+    transcript = "\n".join(message_text(message, TOOL_RETURN_PREVIEW) for message in messages)
+    result = await _summary_agent.run(
+        f"Existing summary:\n{summary or '(none)'}\n\n"
+        f"New turns:\n{transcript}\n\n"
+        f"Keep the updated summary under {max_tokens} tokens."
+    )
+    return result.output.strip()
+
+
+@dataclass
+class Turn:
+    """Messages of one agent run, with their estimated token count."""
+    messages: List[ModelMessage]
+    tokens: int
+
+
+class ConversationMemory:
+    """
+    Conversation history kept within a token budget.
+
+    Use from a single event loop; call aclose() when done so a pending
+    summarization is cancelled.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = DEFAULT_TOKEN_BUDGET,
+        summary_tokens: int = DEFAULT_SUMMARY_TOKENS,
+        summary_wait: float = DEFAULT_SUMMARY_WAIT,
+        summarizer: Optional[Summarizer] = None
+    ):
+        """
+        Args:
+            token_budget: Tokens the kept turns and the summary may use
+                together (the pinned system prompt is not counted)
+            summary_tokens: Length the summarizer is asked to stay under
+            summary_wait: Seconds history() waits for a running
+                summarization before using the previous summary
+            summarizer: Coroutine function (summary, messages, max_tokens)
+                returning the new summary (default: summarize_with_agent)
+
+        Raises:
+            ValueError: If the summary does not fit in the budget
+        """
+        if summary_tokens >= token_budget:
+            raise ValueError("summary_tokens must be smaller than token_budget")
+        self.token_budget = token_budget
+        self.summary_tokens = summary_tokens
+        self.summary_wait = summary_wait
+        self.summarizer = summarizer or summarize_with_agent
+        self.summary = ""
+        self.summaries = 0
+        self._summary_tokens_used = 0
+        self._system_parts: List[SystemPromptPart] = []
+        self._turns: List[Turn] = []
+        self._evicted: List[Turn] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def tokens(self) -> int:
+        """Tokens of the kept turns plus the summary."""
+        return sum(turn.tokens for turn in self._turns) + self._summary_tokens_used
+
+    def add_turn(self, messages: List[ModelMessage]) -> None:
+        """
+        Store the messages of a finished run and enforce the budget.
+
+        Evicted turns are summarized in the background.
+
+        Args:
+            messages: The run's new messages (result.new_messages())
+        """
+        kept: List[ModelMessage] = []
+        for message in messages:
+            if isinstance(message, ModelRequest):
+                system = [part for part in message.parts if isinstance(part, SystemPromptPart)]
+                if system:
+                    if not self._system_parts:
+                        self._system_parts = system
+                    rest = [part for part in message.parts if not isinstance(part, SystemPromptPart)]
+                    if not rest:
+                        continue
+                    message = ModelRequest(parts=rest, instructions=message.instructions)
+            kept.append(message)
+        if not kept:
+            return
+
+        tokens = sum(count_tokens(message_text(message)) for message in kept)
+        self._turns.append(Turn(kept, tokens))
+        while self._turns and self.tokens > self.token_budget:
+            self._evicted.append(self._turns.pop(0))
+        if self._evicted:
+            self._start_summary()
+
+    def _start_summary(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._summarize())
+
+    async def _summarize(self) -> None:
+        # Turns evicted while this runs are picked up by the next round
+        while self._evicted:
+            batch, self._evicted = self._evicted, []
+            messages = [message for turn in batch for message in turn.messages]
+            try:
+                summary = await self.summarizer(self.summary, messages, self.summary_tokens)
+            except asyncio.CancelledError:
+                self._evicted = batch + self._evicted
+                raise
+            except Exception as e:
+                logger.warning(f"Conversation summarization failed, keeping the previous summary: {e}")
+                self._evicted = batch + self._evicted
+                return
+            self.summary = summary
+            self._summary_tokens_used = count_tokens(summary)
+            self.summaries += 1
+            logger.info(f"Summarized {len(batch)} turns into {self._summary_tokens_used} tokens")
+            # A summary longer than asked for pushes more turns out
+            while self._turns and self.tokens > self.token_budget:
+                self._evicted.append(self._turns.pop(0))
+
+    async def history(self) -> List[ModelMessage]:
+        """
+        Build the message_history for the next run.
+
+        Returns:
+            Pinned system prompt and summary, then the kept turns
+        """
+        if self._task is not None and not self._task.done():
+            try:
+                await asyncio.wait_for(asyncio.shield(self._task), self.summary_wait)
+            except asyncio.TimeoutError:
+                logger.info("Summary not ready; using the previous one")
+
+        parts = list(self._system_parts)
+        if self.summary:
+            parts.append(SystemPromptPart(content=f"Summary of the earlier conversation:\n{self.summary}"))
+        history: List[ModelMessage] = [ModelRequest(parts=parts)] if parts else []
+        for turn in self._turns:
+            history.extend(turn.messages)
+        return history
+
+    async def aclose(self) -> None:
+        """Cancel a pending summarization."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get memory metrics.
+
+        Returns:
+            Dictionary with kept turns, their tokens with the summary,
+            summary tokens, turns awaiting summarization and summaries made
+        """
+        return {
+            "turns": len(self._turns),
+            "tokens": self.tokens,
+            "summary_tokens": self._summary_tokens_used,
+            "pending_turns": len(self._evicted),
+            "summaries": self.summaries,
+        }
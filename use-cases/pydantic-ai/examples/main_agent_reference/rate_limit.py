@@ -0,0 +1,199 @@
+"""
+Client-side rate limiting and retry for Brave search.
+
+TokenBucket spaces requests out to the plan's queries per second, so
+concurrent searches queue in the process instead of being rejected with
+HTTP 429. Calls are served in arrival order: each acquire reserves a
+token up front, and the bucket may go negative, which tells later callers
+how long to wait. When the API still answers 429, pause() holds every
+caller back for the Retry-After period.
+
+RetryPolicy decides how long to wait before retrying a 429, a 5xx or a
+connection failure: Retry-After when the server sends one, otherwise
+exponential backoff with full jitter.
+"""
+
+import time
+import random
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """
+    Async token bucket shared by every search in the process.
+
+    Not thread-safe: use it from one event loop.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Args:
+            rate: Tokens added per second (the plan's queries per second)
+            burst: Bucket capacity, the requests allowed back to back
+
+        Raises:
+            ValueError: If rate is not positive or burst is below 1
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self.acquired = 0
+        self.throttled = 0
+        self.pauses = 0
+        self.queued_seconds = 0.0
+        self.max_queued_seconds = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """
+        Wait for a token.
+
+        Returns:
+            Seconds spent waiting
+        """
+        start = time.monotonic()
+        self._refill(start)
+        self._tokens -= 1
+        delay = max(-self._tokens / self.rate, self._paused_until - start)
+        throttled = delay > 0
+        while delay > 0:
+            await asyncio.sleep(delay)
+            # A pause may have started while this call slept
+            delay = self._paused_until - time.monotonic()
+
+        waited = time.monotonic() - start
+        self.acquired += 1
+        if throttled:
+            self.throttled += 1
+            self.queued_seconds += waited
+            self.max_queued_seconds = max(self.max_queued_seconds, waited)
+        return waited
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold every caller back, after the API reported the quota exceeded.
+
+        Args:
+            seconds: Time to wait, usually the Retry-After value
+        """
+        now = time.monotonic()
+        self._refill(now)
+        self._paused_until = max(self._paused_until, now + seconds)
+        # Drain the bucket so callers resume at the steady rate, not in a burst
+        self._tokens = min(self._tokens, 0.0)
+        self.pauses += 1
+        logger.warning(f"Brave rate limit hit; pausing searches for {seconds:.2f}s")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get limiter metrics.
+
+        Returns:
+            Dictionary with acquired and throttled calls, pauses, and total
+            and maximum queued seconds
+        """
+        return {
+            "acquired": self.acquired,
+            "throttled": self.throttled,
+            "pauses": self.pauses,
+            "queued_seconds": round(self.queued_seconds, 3),
+            "max_queued_seconds": round(self.max_queued_seconds, 3),
+        }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header.
+
+    Args:
+        value: Header value, delay seconds or an HTTP date
+
+    Returns:
+        Seconds to wait, or None if absent or unparseable
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+@dataclass
+class RetryPolicy:
+    """Retry settings for search requests, with counters of what they did."""
+    max_retries: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    retries: int = 0
+    exhausted: int = 0
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Exponential backoff with full jitter.
+
+        Args:
+            attempt: Retries already made
+
+        Returns:
+            Seconds to wait, uniform between 0 and base_delay * 2**attempt
+            (capped at max_delay)
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> Optional[float]:
+        """
+        Decide whether and when to retry.
+
+        Args:
+            attempt: Retries already made
+            retry_after: Retry-After header of the failed response
+
+        Returns:
+            Seconds to wait before the next attempt, or None to give up
+            (retries used up, or the server asks to wait beyond max_delay)
+        """
+        if attempt >= self.max_retries:
+            self.exhausted += 1
+            return None
+        wait = parse_retry_after(retry_after)
+        if wait is None:
+            wait = self.backoff(attempt)
+        elif wait > self.max_delay:
+            self.exhausted += 1
+            return None
+        self.retries += 1
+        return wait
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get retry metrics.
+
+        Returns:
+            Dictionary with retries made and requests that ran out of retries
+        """
+        return {"retries": self.retries, "exhausted": self.exhausted}
@@ -4,13 +4,22 @@ Research Agent that uses Brave Search and can invoke Email Agent.
 
 import logging
 from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from pydantic_ai import Agent, RunContext
 
 from .providers import get_llm_model
+from .settings import settings
 from .email_agent import email_agent, EmailAgentDependencies
-from .tools import search_web_tool
+from .cache import SearchCache
+from .rate_limit import RetryPolicy, TokenBucket
+from .tools import (
+    HTTPClientPool,
+    get_http_pool,
+    cached_search_web_tool,
+    multi_search_web_tool,
+    search_flight_stats
+)
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +33,7 @@ Your capabilities:
 
 When conducting research:
 - Use specific, targeted search queries
+- When a topic needs several sub-queries, send them together with search_web_multi rather than one search_web call each
 - Analyze search results for relevance and credibility
 - Synthesize information from multiple sources
 - Provide clear, well-organized summaries
@@ -39,13 +49,83 @@ Always strive to provide accurate, helpful, and actionable information.
 """
 
 
+def shared_http_pool() -> HTTPClientPool:
+    """Get the process-wide HTTP client pool, configured from settings."""
+    return get_http_pool(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry,
+        http2=settings.http_http2,
+        timeout=settings.http_timeout
+    )
+
+
+_search_cache: Optional[SearchCache] = None
+
+
+def shared_search_cache() -> Optional[SearchCache]:
+    """Get the process-wide search result cache, or None if disabled in settings."""
+    global _search_cache
+    if _search_cache is None and settings.search_cache_enabled:
+        _search_cache = SearchCache(
+            ttl=settings.search_cache_ttl,
+            max_entries=settings.search_cache_max_entries,
+            sqlite_path=settings.search_cache_path
+        )
+    return _search_cache
+
+
+_rate_limiter: Optional[TokenBucket] = None
+_retry_policy: Optional[RetryPolicy] = None
+
+
+def shared_rate_limiter() -> Optional[TokenBucket]:
+    """Get the process-wide Brave rate limiter, or None if disabled in settings."""
+    global _rate_limiter
+    if _rate_limiter is None and settings.brave_rate_limit_qps > 0:
+        _rate_limiter = TokenBucket(settings.brave_rate_limit_qps, settings.brave_rate_limit_burst)
+    return _rate_limiter
+
+
+def shared_retry_policy() -> RetryPolicy:
+    """Get the process-wide Brave retry policy, configured from settings."""
+    global _retry_policy
+    if _retry_policy is None:
+        _retry_policy = RetryPolicy(
+            max_retries=settings.brave_max_retries,
+            base_delay=settings.brave_retry_base_delay,
+            max_delay=settings.brave_retry_max_delay
+        )
+    return _retry_policy
+
+
+def search_metrics() -> Dict[str, Any]:
+    """
+    Get the metrics of the process-wide search plumbing.
+    
+    Returns:
+        Dictionary with cache, coalescing, rate limiter and retry statistics
+        (None for parts that are disabled or not used yet)
+    """
+    return {
+        "cache": _search_cache.stats() if _search_cache else None,
+        "coalescing": search_flight_stats(),
+        "rate_limiter": _rate_limiter.stats() if _rate_limiter else None,
+        "retry": _retry_policy.stats() if _retry_policy else None,
+    }
+
+
 @dataclass
 class ResearchAgentDependencies:
-    """Dependencies for the research agent - only configuration, no tool instances."""
+    """Dependencies for the research agent - configuration plus the process-wide search plumbing."""
     brave_api_key: str
     gmail_credentials_path: str
     gmail_token_path: str
     session_id: Optional[str] = None
+    http_pool: HTTPClientPool = field(default_factory=shared_http_pool)
+    search_cache: Optional[SearchCache] = field(default_factory=shared_search_cache)
+    rate_limiter: Optional[TokenBucket] = field(default_factory=shared_rate_limiter)
+    retry_policy: RetryPolicy = field(default_factory=shared_retry_policy)
 
 
 # Initialize the research agent
@@ -76,10 +156,15 @@ async def search_web(
         # Ensure max_results is within valid range
         max_results = min(max(max_results, 1), 20)
         
-        results = await search_web_tool(
+        results = await cached_search_web_tool(
+            ctx.deps.search_cache,
             api_key=ctx.deps.brave_api_key,
             query=query,
-            count=max_results
+            count=max_results,
+            client=ctx.deps.http_pool.client(),
+            search_url=settings.brave_search_url,
+            limiter=ctx.deps.rate_limiter,
+            retry=ctx.deps.retry_policy
         )
         
         logger.info(f"Found {len(results)} results for query: {query}")
@@ -90,6 +175,47 @@ async def search_web(
         return [{"error": f"Search failed: {str(e)}"}]
 
 
+@research_agent.tool
+async def search_web_multi(
+    ctx: RunContext[ResearchAgentDependencies],
+    queries: List[str],
+    results_per_query: int = 5,
+    max_results: int = 20
+) -> Dict[str, Any]:
+    """
+    Run several web searches at once and merge their results.
+    
+    Args:
+        queries: Search queries, one per sub-topic
+        results_per_query: Results to fetch per query (1-20)
+        max_results: Maximum number of merged results to return
+    
+    Returns:
+        Dictionary with results deduplicated by URL and ranked by score,
+        each listing the queries that found it, plus any per-query errors
+    """
+    try:
+        results_per_query = min(max(results_per_query, 1), 20)
+        max_results = max(max_results, 1)
+        
+        return await multi_search_web_tool(
+            api_key=ctx.deps.brave_api_key,
+            queries=queries,
+            count=results_per_query,
+            max_results=max_results,
+            max_concurrency=settings.search_fanout_concurrency,
+            cache=ctx.deps.search_cache,
+            client=ctx.deps.http_pool.client(),
+            search_url=settings.brave_search_url,
+            limiter=ctx.deps.rate_limiter,
+            retry=ctx.deps.retry_policy
+        )
+        
+    except Exception as e:
+        logger.error(f"Fan-out web search failed: {e}")
+        return {"results": [], "queries": queries, "errors": {"*": f"Search failed: {str(e)}"}}
+
+
 @research_agent.tool
 async def create_email_draft(
     ctx: RunContext[ResearchAgentDependencies],
@@ -32,6 +32,30 @@ class Settings(BaseSettings):
     brave_search_url: str = Field(
         default="https://api.search.brave.com/res/v1/web/search"
     )
+    # Requests per second of the Brave plan (0 disables client-side limiting)
+    brave_rate_limit_qps: float = Field(default=1.0)
+    brave_rate_limit_burst: int = Field(default=1)
+    brave_max_retries: int = Field(default=3)
+    brave_retry_base_delay: float = Field(default=0.5)
+    brave_retry_max_delay: float = Field(default=30.0)
+    
+    # HTTP Client Pool Configuration
+    http_max_connections: int = Field(default=20)
+    http_max_keepalive_connections: int = Field(default=10)
+    http_keepalive_expiry: float = Field(default=30.0)
+    http_http2: bool = Field(default=True)
+    http_timeout: float = Field(default=30.0)
+    
+    # Search Cache Configuration
+    search_cache_enabled: bool = Field(default=True)
+    search_cache_ttl: float = Field(default=3600.0)
+    search_cache_max_entries: int = Field(default=1024)
+    search_cache_path: Optional[str] = Field(default=None)
+    search_fanout_concurrency: int = Field(default=4)
+    
+    # Conversation Memory Configuration
+    memory_token_budget: int = Field(default=4000)
+    memory_summary_tokens: int = Field(default=500)
     
     # Application Configuration
     app_env: str = Field(default="development")
@@ -0,0 +1,142 @@
+"""
+Local stub of the Brave web search endpoint for benchmarks and tests.
+
+Serves Brave-shaped JSON over HTTP/1.1 with keep-alive on 127.0.0.1, so
+search_web_tool can be pointed at it with search_url=server.url. Each new
+connection can be delayed to stand in for the TCP and TLS handshake of the
+real API, and the server counts connections and requests, which shows
+whether a client reuses its connections.
+"""
+
+import json
+import time
+import threading
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def stub_results(query: str, count: int, offset: int = 0) -> Dict[str, Any]:
+    """
+    Build a Brave web search response body.
+
+    Args:
+        query: Search query
+        count: Number of results
+        offset: Offset for pagination
+
+    Returns:
+        Dictionary shaped like the Brave API response
+    """
+    slug = "-".join(query.lower().split()) or "empty"
+    return {
+        "web": {
+            "results": [
+                {
+                    "title": f"{query} result {offset + i + 1}",
+                    "url": f"https://example.com/{slug}/{offset + i + 1}",
+                    "description": f"Stub result {offset + i + 1} for {query}",
+                }
+                for i in range(count)
+            ]
+        }
+    }
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.stub.connection_opened()
+
+    def do_GET(self) -> None:
+        stub = self.server.stub
+        stub.request_received()
+        if stub.latency:
+            time.sleep(stub.latency)
+
+        params = parse_qs(urlparse(self.path).query)
+        query = params.get("q", [""])[0]
+        count = int(params.get("count", ["10"])[0])
+        offset = int(params.get("offset", ["0"])[0])
+        body = json.dumps(stub_results(query, count, offset)).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class StubBraveServer:
+    """
+    Brave search stub running in a background thread.
+
+    Use as a context manager:
+
+        with StubBraveServer(connect_delay=0.03) as server:
+            await search_web_tool("key", "query", search_url=server.url)
+    """
+
+    def __init__(self, connect_delay: float = 0.0, latency: float = 0.0, port: int = 0):
+        """
+        Args:
+            connect_delay: Seconds added to every new connection, standing in
+                for the TCP and TLS handshake
+            latency: Seconds added to every request
+            port: Port to listen on (0 picks a free one)
+        """
+        self.connect_delay = connect_delay
+        self.latency = latency
+        self.connections = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _StubHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Search endpoint URL of the stub."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/res/v1/web/search"
+
+    def connection_opened(self) -> None:
+        with self._lock:
+            self.connections += 1
+        if self.connect_delay:
+            time.sleep(self.connect_delay)
+
+    def request_received(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def reset_counters(self) -> None:
+        """Zero the connection and request counters."""
+        with self._lock:
+            self.connections = 0
+            self.requests = 0
+
+    def start(self) -> "StubBraveServer":
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the listening socket."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StubBraveServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
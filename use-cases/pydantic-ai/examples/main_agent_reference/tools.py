@@ -5,15 +5,246 @@ These are standalone functions that can be imported and used by any agent.
 
 import os
 import base64
+import asyncio
 import logging
+import importlib.util
 import httpx
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable
 from datetime import datetime
 
 from agents.models import BraveSearchResult
+from agents.cache import SearchCache, normalize_query, search_key
+from agents.rate_limit import RETRY_STATUS_CODES, RetryPolicy, TokenBucket, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
+BRAVE_SEARCH_URL = "https://api.search.brave.com/res/v1/web/search"
+
+DEFAULT_FANOUT_CONCURRENCY = 4
+
+
+class HTTPClientPool:
+    """
+    Process-wide httpx.AsyncClient shared by every search call.
+
+    Reusing one client keeps connections alive between queries, so only the
+    first request to a host pays for the TCP and TLS handshake, and with
+    HTTP/2 concurrent queries are multiplexed over a single connection.
+    The client is created lazily on first use and must be closed with
+    aclose() (or by using the pool as an async context manager).
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        timeout: float = 30.0
+    ):
+        """
+        Args:
+            max_connections: Maximum concurrent connections
+            max_keepalive_connections: Idle connections kept open for reuse
+            keepalive_expiry: Seconds an idle connection is kept open
+            http2: Negotiate HTTP/2; falls back to HTTP/1.1 if the h2
+                package is not installed
+            timeout: Default request timeout in seconds
+        """
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the h2 package is not installed; using HTTP/1.1")
+            http2 = False
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.http2 = http2
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def client(self) -> httpx.AsyncClient:
+        """
+        Get the shared client, creating it on first use.
+
+        Connections belong to the event loop that opened them, so a new
+        client is created when called from a different loop.
+
+        Returns:
+            Shared AsyncClient
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            if self._client is not None and not self._client.is_closed:
+                logger.warning("HTTP client pool used from a new event loop; opening a new client")
+            self._client = httpx.AsyncClient(limits=self.limits, http2=self.http2, timeout=self.timeout)
+            self._loop = loop
+            logger.debug(f"Opened pooled HTTP client (http2={self.http2})")
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared client and its connections."""
+        client, self._client, self._loop = self._client, None, None
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+    async def __aenter__(self) -> "HTTPClientPool":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+
+_http_pool: Optional[HTTPClientPool] = None
+
+
+def get_http_pool(**options: Any) -> HTTPClientPool:
+    """
+    Get the process-wide HTTP client pool.
+
+    Args:
+        **options: HTTPClientPool settings, used only when the pool is
+            created by this call
+
+    Returns:
+        Shared HTTPClientPool
+    """
+    global _http_pool
+    if _http_pool is None:
+        _http_pool = HTTPClientPool(**options)
+    return _http_pool
+
+
+async def close_http_pool() -> None:
+    """Close the process-wide HTTP client pool, if it was created."""
+    if _http_pool is not None:
+        await _http_pool.aclose()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls into one.
+
+    The first caller for a key starts the call in its own task; callers
+    arriving while it runs wait for the same task instead of starting
+    another, and all receive its result or exception. A caller that is
+    cancelled stops waiting without disturbing the others; the call itself
+    is cancelled only once no caller waits for it anymore.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, Tuple[asyncio.Task, List[int]]] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn, or join the run already in flight for key.
+
+        Args:
+            key: Identity of the call
+            fn: Coroutine function making the call; only the first caller's
+                is used
+
+        Returns:
+            Result of the call, the same object for every caller
+        """
+        loop = asyncio.get_running_loop()
+        flight = self._flights.get(key)
+        if flight is None or flight[0].get_loop() is not loop:
+            task = loop.create_task(fn())
+            flight = (task, [0])
+            self._flights[key] = flight
+            task.add_done_callback(lambda _, key=key, flight=flight: self._forget(key, flight))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+        
+        task, waiters = flight
+        waiters[0] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            waiters[0] -= 1
+            if not waiters[0] and not task.done():
+                # The last caller was cancelled: nobody needs the result
+                self._forget(key, flight)
+                task.cancel()
+
+    def _forget(self, key: str, flight: Tuple[asyncio.Task, List[int]]) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get coalescing metrics.
+
+        Returns:
+            Dictionary with calls made, callers that joined one in flight,
+            and calls in flight
+        """
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._flights)}
+
+
+_search_flights = SingleFlight()
+
+
+def search_flight_stats() -> Dict[str, int]:
+    """Get the coalescing metrics of identical concurrent searches."""
+    return _search_flights.stats()
+
+
+async def _get_with_retry(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: Dict[str, str],
+    params: Dict[str, Any],
+    limiter: Optional[TokenBucket],
+    retry: Optional[RetryPolicy]
+) -> httpx.Response:
+    """
+    Send a GET through the rate limiter, retrying throttled and failed requests.
+
+    Returns:
+        The first response that is not retried
+
+    Raises:
+        httpx.RequestError: If the request still fails once retries are used up
+    """
+    attempt = 0
+    while True:
+        if limiter is not None:
+            await limiter.acquire()
+        try:
+            response = await client.get(url, headers=headers, params=params)
+        except httpx.TransportError as e:
+            delay = retry.delay(attempt) if retry is not None else None
+            if delay is None:
+                raise
+            logger.warning(f"Brave request failed ({e}); retrying in {delay:.2f}s")
+        else:
+            if response.status_code not in RETRY_STATUS_CODES or retry is None:
+                return response
+            retry_after = response.headers.get("Retry-After")
+            delay = retry.delay(attempt, retry_after)
+            if response.status_code == 429 and limiter is not None:
+                # Every other search would be throttled too, even when this
+                # one gives up because the server asks for a long wait
+                pause = delay if delay is not None else parse_retry_after(retry_after)
+                if pause:
+                    limiter.pause(pause)
+                if delay is not None:
+                    logger.warning(f"Brave returned 429; retrying in {delay:.2f}s")
+                    # The next acquire() waits out the pause and counts it as throttling
+                    attempt += 1
+                    continue
+            if delay is None:
+                return response
+            logger.warning(f"Brave returned {response.status_code}; retrying in {delay:.2f}s")
+        await asyncio.sleep(delay)
+        attempt += 1
+
 
 # Brave Search Tool Function
 async def search_web_tool(
@@ -22,7 +253,11 @@ async def search_web_tool(
     count: int = 10,
     offset: int = 0,
     country: Optional[str] = None,
-    lang: Optional[str] = None
+    lang: Optional[str] = None,
+    client: Optional[httpx.AsyncClient] = None,
+    search_url: str = BRAVE_SEARCH_URL,
+    limiter: Optional[TokenBucket] = None,
+    retry: Optional[RetryPolicy] = None
 ) -> List[Dict[str, Any]]:
     """
     Pure function to search the web using Brave Search API.
@@ -34,6 +269,13 @@ async def search_web_tool(
         offset: Offset for pagination
         country: Country code for localized results
         lang: Language code for results
+        client: HTTP client to send the request with (default: the
+            process-wide pooled client)
+        search_url: Brave web search endpoint
+        limiter: Token bucket to wait on before each request (None sends
+            right away)
+        retry: Retry policy for 429, 5xx and connection failures (None
+            fails on the first error)
         
     Returns:
         List of search results as dictionaries
@@ -69,52 +311,209 @@ async def search_web_tool(
     
     logger.info(f"Searching Brave for: {query}")
     
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                "https://api.search.brave.com/res/v1/web/search",
-                headers=headers,
-                params=params,
-                timeout=30.0
-            )
-            
-            # Handle rate limiting
-            if response.status_code == 429:
-                raise Exception("Rate limit exceeded. Check your Brave API quota.")
-            
-            # Handle authentication errors
-            if response.status_code == 401:
-                raise Exception("Invalid Brave API key")
-            
-            # Handle other errors
-            if response.status_code != 200:
-                raise Exception(f"Brave API returned {response.status_code}: {response.text}")
-            
-            data = response.json()
-            
-            # Extract web results
-            web_results = data.get("web", {}).get("results", [])
-            
-            # Convert to our format
-            results = []
-            for idx, result in enumerate(web_results):
-                # Calculate a simple relevance score based on position
-                score = 1.0 - (idx * 0.05)  # Decrease by 0.05 for each position
-                score = max(score, 0.1)  # Minimum score of 0.1
-                
-                results.append({
-                    "title": result.get("title", ""),
-                    "url": result.get("url", ""),
-                    "description": result.get("description", ""),
-                    "score": score
-                })
+    if client is None:
+        client = get_http_pool().client()
+    
+    try:
+        response = await _get_with_retry(client, search_url, headers, params, limiter, retry)
+        
+        # Handle rate limiting
+        if response.status_code == 429:
+            raise Exception("Rate limit exceeded. Check your Brave API quota.")
+        
+        # Handle authentication errors
+        if response.status_code == 401:
+            raise Exception("Invalid Brave API key")
+        
+        # Handle other errors
+        if response.status_code != 200:
+            raise Exception(f"Brave API returned {response.status_code}: {response.text}")
+        
+        data = response.json()
+        
+        # Extract web results
+        web_results = data.get("web", {}).get("results", [])
+        
+        # Convert to our format
+        results = []
+        for idx, result in enumerate(web_results):
+            # Calculate a simple relevance score based on position
+            score = 1.0 - (idx * 0.05)  # Decrease by 0.05 for each position
+            score = max(score, 0.1)  # Minimum score of 0.1
             
-            logger.info(f"Found {len(results)} results for query: {query}")
+            results.append({
+                "title": result.get("title", ""),
+                "url": result.get("url", ""),
+                "description": result.get("description", ""),
+                "score": score
+            })
+        
+        logger.info(f"Found {len(results)} results for query: {query}")
+        return results
+        
+    except httpx.RequestError as e:
+        logger.error(f"Request error during Brave search: {e}")
+        raise Exception(f"Request failed: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error during Brave search: {e}")
+        raise
+
+
+async def cached_search_web_tool(
+    cache: Optional[SearchCache],
+    api_key: str,
+    query: str,
+    count: int = 10,
+    offset: int = 0,
+    country: Optional[str] = None,
+    lang: Optional[str] = None,
+    **kwargs: Any
+) -> List[Dict[str, Any]]:
+    """
+    Search the web through a result cache, coalescing identical searches.
+
+    Concurrent callers whose searches have the same cache key share one
+    upstream request (made with the first caller's kwargs). Only
+    successful searches are cached; errors propagate as from
+    search_web_tool, to every coalesced caller.
+
+    Args:
+        cache: Result cache; None searches without caching
+        api_key: Brave Search API key
+        query: Search query
+        count: Number of results to return (1-20)
+        offset: Offset for pagination
+        country: Country code for localized results
+        lang: Language code for results
+        **kwargs: Passed on to search_web_tool (client, search_url,
+            limiter, retry)
+
+    Returns:
+        List of search results as dictionaries
+    """
+    key = search_key(query, min(max(count, 1), 20), offset, country, lang)
+    if cache is not None:
+        results = cache.get(key)
+        if results is not None:
+            logger.info(f"Search cache hit for query: {query}")
             return results
-            
-        except httpx.RequestError as e:
-            logger.error(f"Request error during Brave search: {e}")
-            raise Exception(f"Request failed: {str(e)}")
-        except Exception as e:
-            logger.error(f"Error during Brave search: {e}")
-            raise
+    
+    async def fetch() -> List[Dict[str, Any]]:
+        results = await search_web_tool(api_key, query, count, offset, country, lang, **kwargs)
+        if cache is not None:
+            cache.set(key, results)
+        return results
+    
+    results = await _search_flights.do(key, fetch)
+    # Coalesced callers get the same list; give each its own copy
+    return [dict(result) for result in results]
+
+
+def _url_key(url: str) -> str:
+    """URL identity for deduplication: no fragment, no trailing slash, case-insensitive scheme and host."""
+    url = url.split("#", 1)[0]
+    scheme, sep, rest = url.partition("://")
+    host, slash, path = rest.partition("/")
+    return f"{scheme.lower()}{sep}{host.lower()}{slash}{path}".rstrip("/")
+
+
+def merge_search_results(
+    batches: List[Tuple[str, List[Dict[str, Any]]]],
+    max_results: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Merge the results of several queries into one ranked list.
+
+    Results are deduplicated by URL. A result keeps the best position score
+    any query gave it; ties go to results more queries returned, then to
+    the earlier query.
+
+    Args:
+        batches: (query, results) pairs in query order
+        max_results: Keep only the top results (None keeps all)
+
+    Returns:
+        Merged results, each with the queries that returned it
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for query, results in batches:
+        for result in results:
+            key = _url_key(result.get("url", ""))
+            if not key:
+                continue
+            entry = merged.get(key)
+            if entry is None:
+                merged[key] = {**result, "queries": [query]}
+            else:
+                entry["score"] = max(entry["score"], result.get("score", 0.0))
+                if query not in entry["queries"]:
+                    entry["queries"].append(query)
+    
+    # dicts keep insertion order and sorted() is stable, so ties keep query order
+    ranked = sorted(merged.values(), key=lambda r: (-r["score"], -len(r["queries"])))
+    return ranked[:max_results] if max_results is not None else ranked
+
+
+async def multi_search_web_tool(
+    api_key: str,
+    queries: List[str],
+    count: int = 5,
+    max_results: Optional[int] = 20,
+    max_concurrency: int = DEFAULT_FANOUT_CONCURRENCY,
+    cache: Optional[SearchCache] = None,
+    **kwargs: Any
+) -> Dict[str, Any]:
+    """
+    Run several searches concurrently and merge their results.
+
+    Queries that normalize to the same text are searched once. A failing
+    query is reported in errors and does not fail the others.
+
+    Args:
+        api_key: Brave Search API key
+        queries: Search queries
+        count: Results per query (1-20)
+        max_results: Keep only the top merged results (None keeps all)
+        max_concurrency: Searches in flight at once
+        cache: Result cache; None searches without caching
+        **kwargs: Passed on to search_web_tool (offset, country, lang,
+            client, search_url, limiter, retry)
+
+    Returns:
+        Dictionary with the merged results, the queries searched and an
+        error message per failed query
+
+    Raises:
+        ValueError: If no query is given or max_concurrency is below 1
+    """
+    unique: Dict[str, str] = {}
+    for query in queries:
+        if query and query.strip():
+            unique.setdefault(normalize_query(query), query.strip())
+    if not unique:
+        raise ValueError("At least one query is required")
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def run(query: str) -> List[Dict[str, Any]]:
+        async with semaphore:
+            return await cached_search_web_tool(cache, api_key, query, count, **kwargs)
+    
+    searched = list(unique.values())
+    outcomes = await asyncio.gather(*(run(query) for query in searched), return_exceptions=True)
+    
+    batches = []
+    errors = {}
+    for query, outcome in zip(searched, outcomes):
+        if isinstance(outcome, BaseException):
+            if not isinstance(outcome, Exception):
+                raise outcome
+            errors[query] = str(outcome)
+        else:
+            batches.append((query, outcome))
+    
+    results = merge_search_results(batches, max_results)
+    logger.info(f"Fan-out search: {len(searched)} queries, {len(results)} merged results, {len(errors)} failed")
+    return {"results": results, "queries": searched, "errors": errors}
@@ -0,0 +1,18 @@
+"""
+Shared test setup.
+
+The main_agent_reference modules import each other as the `agents`
+package, the name the reference is meant to be copied under. Register the
+reference directory under that name so its modules can be tested in place.
+"""
+
+import sys
+import types
+from pathlib import Path
+
+REFERENCE_DIR = Path(__file__).resolve().parent.parent / "main_agent_reference"
+
+if "agents" not in sys.modules:
+    agents = types.ModuleType("agents")
+    agents.__path__ = [str(REFERENCE_DIR)]
+    sys.modules["agents"] = agents
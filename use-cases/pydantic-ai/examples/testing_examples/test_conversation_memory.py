@@ -0,0 +1,137 @@
+"""Tests for the token-budgeted conversation memory of the CLI."""
+
+import asyncio
+
+import pytest
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelRequest, ModelResponse, SystemPromptPart, TextPart, UserPromptPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from agents.memory import ConversationMemory, count_tokens
+
+
+def turn(question: str, answer: str, system: str = None):
+    """Messages of one run: the prompt, optionally with a system prompt, and the answer."""
+    parts = [SystemPromptPart(content=system)] if system else []
+    parts.append(UserPromptPart(content=question))
+    return [ModelRequest(parts=parts), ModelResponse(parts=[TextPart(content=answer)])]
+
+
+class RecordingSummarizer:
+    """Summarizer that records what it was asked to fold in."""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.batches = []
+
+    async def __call__(self, summary, messages, max_tokens):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("summarizer down")
+        self.batches.append(messages)
+        return f"{summary} +{len(messages)}".strip()
+
+
+class TestConversationMemory:
+    """Budget, eviction, summary and system prompt pinning."""
+
+    @pytest.mark.asyncio
+    async def test_turns_within_budget_are_kept(self):
+        """Below the budget every turn is passed back unchanged."""
+        memory = ConversationMemory(token_budget=1000, summary_tokens=100, summarizer=RecordingSummarizer())
+        memory.add_turn(turn("hello", "hi there"))
+        memory.add_turn(turn("and now?", "still here"))
+
+        history = await memory.history()
+        assert [m.parts[0].content for m in history] == ["hello", "hi there", "and now?", "still here"]
+        assert memory.stats()["summaries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_oldest_turns_are_evicted_whole_and_summarized(self):
+        """Over budget, whole turns leave oldest first and go to the summarizer."""
+        summarizer = RecordingSummarizer()
+        long_answer = "word " * 40
+        budget = 2 * count_tokens(f"User: q\nAssistant: {long_answer}") + 20
+        memory = ConversationMemory(token_budget=budget, summary_tokens=10, summarizer=summarizer)
+        for index in range(4):
+            memory.add_turn(turn(f"question {index}", long_answer))
+
+        history = await memory.history()
+        assert memory.summary
+        assert sum(len(batch) for batch in summarizer.batches) % 2 == 0
+        assert isinstance(history[0].parts[0], SystemPromptPart)
+        assert "Summary of the earlier conversation" in history[0].parts[0].content
+        assert history[-2].parts[0].content == "question 3"
+        assert memory.tokens <= budget
+        await memory.aclose()
+
+    @pytest.mark.asyncio
+    async def test_system_prompt_is_pinned_ahead_of_the_summary(self):
+        """The first run's system prompt stays at the front after its turn is evicted."""
+        memory = ConversationMemory(token_budget=60, summary_tokens=10, summarizer=RecordingSummarizer())
+        memory.add_turn(turn("first " * 20, "answer " * 20, system="You are a research assistant."))
+        memory.add_turn(turn("second", "short"))
+
+        history = await memory.history()
+        assert history[0].parts[0].content == "You are a research assistant."
+        assert all(
+            not isinstance(part, SystemPromptPart) or part.content.startswith("Summary")
+            for message in history[1:] for part in message.parts
+        )
+        await memory.aclose()
+
+    @pytest.mark.asyncio
+    async def test_failed_summary_keeps_turns_pending(self):
+        """A failing summarizer keeps the previous summary and the evicted turns."""
+        memory = ConversationMemory(token_budget=30, summary_tokens=5, summarizer=RecordingSummarizer(fail=True))
+        memory.add_turn(turn("first " * 20, "answer"))
+        memory.add_turn(turn("second", "short"))
+
+        await memory.history()
+        assert memory.summary == ""
+        assert memory.stats()["pending_turns"] >= 1
+        await memory.aclose()
+
+    @pytest.mark.asyncio
+    async def test_history_does_not_wait_for_a_slow_summary(self):
+        """history() uses the previous summary once summary_wait runs out."""
+        memory = ConversationMemory(
+            token_budget=30, summary_tokens=5, summary_wait=0.01, summarizer=RecordingSummarizer(delay=5)
+        )
+        memory.add_turn(turn("first " * 20, "answer"))
+        memory.add_turn(turn("second", "short"))
+
+        history = await asyncio.wait_for(memory.history(), 1)
+        assert history[0].parts[0].content == "second"
+        await memory.aclose()
+        assert memory.stats()["pending_turns"] >= 1
+
+    def test_summary_must_fit_in_the_budget(self):
+        """A summary as large as the budget would leave no room for turns."""
+        with pytest.raises(ValueError):
+            ConversationMemory(token_budget=100, summary_tokens=100)
+
+
+class TestMemoryWithAgent:
+    """Memory fed from real agent runs."""
+
+    @pytest.mark.asyncio
+    async def test_agent_sees_earlier_turns_and_its_system_prompt(self):
+        """The second run gets the first turn and the pinned system prompt as history."""
+        seen = []
+
+        def respond(messages, info: AgentInfo) -> ModelResponse:
+            seen.append(messages)
+            return ModelResponse(parts=[TextPart(content=f"answer {len(seen)}")])
+
+        agent = Agent(FunctionModel(respond), system_prompt="You are a research assistant.")
+        memory = ConversationMemory(token_budget=1000, summary_tokens=100, summarizer=RecordingSummarizer())
+
+        first = await agent.run("first question")
+        memory.add_turn(first.new_messages())
+        await agent.run("second question", message_history=await memory.history())
+
+        texts = [getattr(part, "content", None) for message in seen[-1] for part in message.parts]
+        assert texts[:3] == ["You are a research assistant.", "first question", "answer 1"]
+        assert "second question" in texts
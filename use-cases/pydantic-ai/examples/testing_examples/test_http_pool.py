@@ -0,0 +1,59 @@
+"""
+Tests for the pooled HTTP client of the research agent's search tool.
+
+Run against the local Brave stub, which counts the connections it accepts.
+"""
+
+import asyncio
+
+import pytest
+
+from agents.stub_brave import StubBraveServer
+from agents.tools import HTTPClientPool, search_web_tool
+
+
+class TestHTTPClientPool:
+    """Connection reuse across searches."""
+
+    @pytest.mark.asyncio
+    async def test_sequential_searches_reuse_one_connection(self):
+        """Searches after the first find the connection already open."""
+        with StubBraveServer() as server:
+            async with HTTPClientPool(http2=False) as pool:
+                for query in ["first", "second", "third"]:
+                    results = await search_web_tool("key", query, count=3, client=pool.client(), search_url=server.url)
+                    assert len(results) == 3
+
+        assert server.requests == 3
+        assert server.connections == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_searches_are_bounded_by_the_pool(self):
+        """Concurrent searches never open more connections than allowed."""
+        with StubBraveServer(latency=0.02) as server:
+            async with HTTPClientPool(max_connections=2, http2=False) as pool:
+                await asyncio.gather(*(
+                    search_web_tool("key", f"query {i}", count=1, client=pool.client(), search_url=server.url)
+                    for i in range(6)
+                ))
+
+        assert server.requests == 6
+        assert server.connections <= 2
+
+    @pytest.mark.asyncio
+    async def test_closed_pool_opens_a_new_client(self):
+        """aclose() closes the client; the next use opens a fresh one."""
+        pool = HTTPClientPool(http2=False)
+        first = pool.client()
+        await pool.aclose()
+
+        assert first.is_closed
+        second = pool.client()
+        assert second is not first and not second.is_closed
+        await pool.aclose()
+
+    def test_http2_falls_back_without_h2(self, monkeypatch):
+        """HTTP/2 is only negotiated when the h2 package is installed."""
+        monkeypatch.setattr("agents.tools.importlib.util.find_spec", lambda name: None)
+
+        assert HTTPClientPool(http2=True).http2 is False
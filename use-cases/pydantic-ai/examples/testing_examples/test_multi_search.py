@@ -0,0 +1,85 @@
+"""Tests for the fan-out search tool of the research agent."""
+
+import httpx
+import pytest
+
+from agents.stub_brave import StubBraveServer, stub_results
+from agents.tools import HTTPClientPool, _url_key, merge_search_results, multi_search_web_tool
+
+
+def result(url: str, score: float) -> dict:
+    return {"title": url, "url": url, "description": "", "score": score}
+
+
+class TestMergeSearchResults:
+    """Deduplication and ranking of merged results."""
+
+    def test_url_key_ignores_fragment_slash_and_host_case(self):
+        """Spellings of the same page share a key; paths stay case-sensitive."""
+        assert _url_key("HTTPS://Example.COM/Docs/#intro") == _url_key("https://example.com/Docs")
+        assert _url_key("https://example.com/Docs") != _url_key("https://example.com/docs")
+
+    def test_duplicates_keep_best_score_and_every_query(self):
+        """A page returned by two queries appears once, with its best score."""
+        merged = merge_search_results([
+            ("first", [result("https://a.com/", 0.9), result("https://b.com", 0.8)]),
+            ("second", [result("https://b.com/#top", 1.0), result("https://c.com", 0.9)]),
+        ])
+
+        assert [r["url"] for r in merged] == ["https://b.com", "https://a.com/", "https://c.com"]
+        assert merged[0]["score"] == 1.0
+        assert merged[0]["queries"] == ["first", "second"]
+
+    def test_ties_prefer_more_queries_then_query_order(self):
+        """Equal scores rank results found by more queries, then earlier queries."""
+        merged = merge_search_results([
+            ("first", [result("https://a.com", 0.5), result("https://b.com", 0.5)]),
+            ("second", [result("https://b.com", 0.5), result("https://c.com", 0.5)]),
+        ], max_results=2)
+
+        assert [r["url"] for r in merged] == ["https://b.com", "https://a.com"]
+
+    def test_results_without_url_are_dropped(self):
+        """Results without a URL cannot be deduplicated and are skipped."""
+        assert merge_search_results([("q", [{"title": "x", "score": 1.0}])]) == []
+
+
+class TestMultiSearch:
+    """Concurrent searches against the local Brave stub."""
+
+    @pytest.mark.asyncio
+    async def test_equivalent_queries_are_searched_once(self):
+        """Queries that normalize to the same text share one search."""
+        with StubBraveServer() as server:
+            async with HTTPClientPool(http2=False) as pool:
+                outcome = await multi_search_web_tool(
+                    "key", ["Pydantic AI", "pydantic  ai", "agents"], count=2,
+                    client=pool.client(), search_url=server.url
+                )
+
+        assert outcome["queries"] == ["Pydantic AI", "agents"]
+        assert outcome["errors"] == {}
+        assert len(outcome["results"]) == 4
+        assert server.requests == 2
+
+    @pytest.mark.asyncio
+    async def test_failing_query_is_reported_not_raised(self):
+        """One failing search does not fail the others."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            query = request.url.params["q"]
+            if query == "bad":
+                return httpx.Response(500, text="upstream error")
+            return httpx.Response(200, json=stub_results(query, 1))
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            outcome = await multi_search_web_tool("key", ["good", "bad"], count=1, client=client)
+
+        assert [r["url"] for r in outcome["results"]] == ["https://example.com/good/1"]
+        assert list(outcome["errors"]) == ["bad"]
+        assert "500" in outcome["errors"]["bad"]
+
+    @pytest.mark.asyncio
+    async def test_queries_are_required(self):
+        """Blank queries alone are rejected."""
+        with pytest.raises(ValueError):
+            await multi_search_web_tool("key", ["", "  "])
@@ -0,0 +1,135 @@
+"""Tests for client-side rate limiting and retries of Brave searches."""
+
+import time
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from agents.rate_limit import RetryPolicy, TokenBucket, parse_retry_after
+from agents.stub_brave import stub_results
+from agents.tools import search_web_tool
+
+
+class TestTokenBucket:
+    """Spacing and pausing of requests."""
+
+    @pytest.mark.asyncio
+    async def test_requests_are_spaced_to_the_rate(self):
+        """Beyond the burst, callers are served one per 1/rate seconds."""
+        bucket = TokenBucket(rate=20, burst=1)
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(4)))
+
+        assert time.monotonic() - start >= 0.14
+        assert bucket.acquired == 4
+        assert bucket.throttled == 3
+        assert bucket.stats()["max_queued_seconds"] >= 0.14
+
+    @pytest.mark.asyncio
+    async def test_pause_holds_every_caller(self):
+        """After pause(), even a full bucket waits and the wait is counted."""
+        bucket = TokenBucket(rate=1000, burst=5)
+        bucket.pause(0.1)
+        waited = await bucket.acquire()
+
+        assert waited >= 0.09
+        assert bucket.pauses == 1
+        assert bucket.throttled == 1
+        assert bucket.queued_seconds >= 0.09
+
+    def test_invalid_settings_are_rejected(self):
+        """Rate must be positive and the burst at least one."""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+        with pytest.raises(ValueError):
+            TokenBucket(rate=1, burst=0)
+
+
+class TestRetryPolicy:
+    """Retry-After parsing and retry decisions."""
+
+    def test_parse_retry_after(self):
+        """Seconds and HTTP dates are understood; anything else is None."""
+        when = datetime.now(timezone.utc) + timedelta(seconds=30)
+
+        assert parse_retry_after("2.5") == 2.5
+        assert parse_retry_after("-3") == 0.0
+        assert 25 < parse_retry_after(format_datetime(when, usegmt=True)) <= 30
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+    def test_retry_after_is_honoured_up_to_max_delay(self):
+        """The server's wait is used, unless it exceeds max_delay."""
+        policy = RetryPolicy(max_retries=3, max_delay=10)
+
+        assert policy.delay(0, "4") == 4
+        assert policy.delay(0, "60") is None
+        assert policy.stats() == {"retries": 1, "exhausted": 1}
+
+    def test_backoff_is_jittered_and_bounded(self):
+        """Without Retry-After the wait is at most base_delay * 2**attempt."""
+        policy = RetryPolicy(max_retries=5, base_delay=0.5, max_delay=3)
+
+        assert all(0 <= policy.delay(attempt) <= min(3, 0.5 * 2 ** attempt) for attempt in range(5))
+        assert policy.delay(5) is None
+
+
+def brave(responses):
+    """Client whose requests get the given status codes in turn."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status, headers = responses[min(len(calls), len(responses) - 1)]
+        calls.append(status)
+        if status == 200:
+            return httpx.Response(200, json=stub_results(request.url.params["q"], 2))
+        return httpx.Response(status, headers=headers)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), calls
+
+
+class TestSearchRetries:
+    """Retries of throttled and failed searches."""
+
+    @pytest.mark.asyncio
+    async def test_429_pauses_the_limiter_and_retries(self):
+        """A 429 pauses every search for Retry-After, then the search succeeds."""
+        client, calls = brave([(429, {"Retry-After": "0.1"}), (200, {})])
+        limiter = TokenBucket(rate=1000, burst=5)
+        retry = RetryPolicy(max_retries=2)
+        async with client:
+            results = await search_web_tool("key", "query", client=client, limiter=limiter, retry=retry)
+
+        assert len(results) == 2
+        assert calls == [429, 200]
+        assert limiter.pauses == 1
+        assert limiter.throttled == 1 and limiter.queued_seconds >= 0.09
+        assert retry.retries == 1
+
+    @pytest.mark.asyncio
+    async def test_5xx_is_retried_with_backoff(self):
+        """Server errors are retried until retries run out."""
+        client, calls = brave([(503, {})])
+        retry = RetryPolicy(max_retries=2, base_delay=0.01)
+        async with client:
+            with pytest.raises(Exception, match="503"):
+                await search_web_tool("key", "query", client=client, retry=retry)
+
+        assert calls == [503, 503, 503]
+        assert retry.stats() == {"retries": 2, "exhausted": 1}
+
+    @pytest.mark.asyncio
+    async def test_long_retry_after_gives_up_but_pauses(self):
+        """A wait beyond max_delay fails the search and still holds back the others."""
+        client, calls = brave([(429, {"Retry-After": "120"})])
+        limiter = TokenBucket(rate=1000, burst=5)
+        async with client:
+            with pytest.raises(Exception, match="Rate limit"):
+                await search_web_tool("key", "query", client=client, limiter=limiter, retry=RetryPolicy(max_delay=10))
+
+        assert calls == [429]
+        assert limiter.pauses == 1
+        assert limiter._paused_until - time.monotonic() > 100
@@ -0,0 +1,126 @@
+"""Tests for the search result cache of the research agent."""
+
+import pytest
+
+from agents import cache as cache_module
+from agents.cache import SearchCache, search_key
+from agents.stub_brave import StubBraveServer
+from agents.tools import HTTPClientPool, cached_search_web_tool
+
+RESULTS = [{"title": "A", "url": "https://example.com/a", "description": "", "score": 1.0}]
+
+
+class FakeClock:
+    """Stands in for time.monotonic and time.time."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    monkeypatch.setattr(cache_module.time, "time", clock)
+    return clock
+
+
+class TestSearchCache:
+    """TTL, LRU and SQLite behaviour."""
+
+    def test_keys_ignore_case_and_whitespace(self):
+        """Trivially different spellings of a query share an entry."""
+        assert search_key("Pydantic  AI", 10) == search_key(" pydantic ai ", 10)
+        assert search_key("pydantic ai", 10) != search_key("pydantic ai", 5)
+        assert search_key("pydantic ai", 10, lang="EN") == search_key("pydantic ai", 10, lang="en")
+
+    def test_entries_expire_after_ttl(self, clock):
+        """A result is served until its TTL runs out, then counts as expired."""
+        cache = SearchCache(ttl=10)
+        cache.set("k", RESULTS)
+
+        clock.now += 9
+        assert cache.get("k") == RESULTS
+        clock.now += 2
+        assert cache.get("k") is None
+        assert cache.stats()["expirations"] == 1
+        assert cache.stats()["entries"] == 0
+
+    def test_least_recently_used_is_evicted(self):
+        """Beyond max_entries the entry read longest ago goes first."""
+        cache = SearchCache(max_entries=2)
+        cache.set("a", RESULTS)
+        cache.set("b", RESULTS)
+        cache.get("a")
+        cache.set("c", RESULTS)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_results_are_copied(self):
+        """Changes by a caller do not leak into the cache."""
+        cache = SearchCache()
+        results = [dict(RESULTS[0])]
+        cache.set("k", results)
+        results[0]["title"] = "changed"
+        cache.get("k")[0]["title"] = "changed too"
+
+        assert cache.get("k")[0]["title"] == "A"
+
+    def test_sqlite_file_survives_restarts(self, tmp_path, clock):
+        """A new cache on the same file serves results until their TTL."""
+        path = str(tmp_path / "search.db")
+        first = SearchCache(ttl=10, sqlite_path=path)
+        first.set("k", RESULTS)
+        first.close()
+
+        second = SearchCache(ttl=10, sqlite_path=path)
+        clock.now += 5
+        assert second.get("k") == RESULTS
+        assert second.stats()["disk_hits"] == 1
+        # Copied into memory with the remaining lifetime, not a fresh TTL
+        clock.now += 6
+        assert second.get("k") is None
+
+        second.clear()
+        second.close()
+        assert SearchCache(sqlite_path=path).get("k") is None
+
+    def test_unusable_sqlite_path_falls_back_to_memory(self, tmp_path):
+        """A cache file that cannot be opened is logged, not raised."""
+        cache = SearchCache(sqlite_path=str(tmp_path / "missing" / "search.db"))
+        cache.set("k", RESULTS)
+        cache.clear()
+        cache.set("k", RESULTS)
+
+        assert cache.get("k") == RESULTS
+        cache.close()
+
+    def test_invalid_settings_are_rejected(self):
+        """TTL must be positive and at least one entry kept."""
+        with pytest.raises(ValueError):
+            SearchCache(ttl=0)
+        with pytest.raises(ValueError):
+            SearchCache(max_entries=0)
+
+
+class TestCachedSearch:
+    """The cache in front of the search tool."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_search_is_served_from_cache(self):
+        """Only the first of two equivalent searches reaches the API."""
+        cache = SearchCache()
+        with StubBraveServer() as server:
+            async with HTTPClientPool(http2=False) as pool:
+                options = {"client": pool.client(), "search_url": server.url}
+                first = await cached_search_web_tool(cache, "key", "Pydantic AI", 3, **options)
+                second = await cached_search_web_tool(cache, "key", "pydantic  ai", 3, **options)
+
+        assert first == second
+        assert server.requests == 1
+        assert cache.stats()["hits"] == 1
@@ -0,0 +1,104 @@
+"""Tests for coalescing of identical concurrent searches."""
+
+import asyncio
+
+import pytest
+
+from agents.stub_brave import StubBraveServer
+from agents.tools import HTTPClientPool, SingleFlight, cached_search_web_tool
+
+
+class TestSingleFlight:
+    """One call per key while it is in flight."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        """Callers arriving during a call get its result without a call of their own."""
+        flight = SingleFlight()
+        started = []
+
+        async def fetch():
+            started.append(1)
+            await asyncio.sleep(0.05)
+            return ["result"]
+
+        results = await asyncio.gather(*(flight.do("k", fetch) for _ in range(5)))
+
+        assert results == [["result"]] * 5
+        assert len(started) == 1
+        assert flight.stats() == {"calls": 1, "coalesced": 4, "in_flight": 0}
+
+    @pytest.mark.asyncio
+    async def test_exceptions_reach_every_caller(self):
+        """A failing call fails all its waiters, and the next call starts afresh."""
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        outcomes = await asyncio.gather(flight.do("k", fail), flight.do("k", fail), return_exceptions=True)
+
+        assert [str(outcome) for outcome in outcomes] == ["boom", "boom"]
+
+        async def succeed():
+            return "ok"
+
+        assert await flight.do("k", succeed) == "ok"
+        assert flight.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_the_call(self):
+        """The call keeps running for callers still waiting."""
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return "result"
+
+        first = asyncio.create_task(flight.do("k", fetch))
+        second = asyncio.create_task(flight.do("k", fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == "result"
+        assert first.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_last_cancelled_caller_cancels_the_call(self):
+        """Once nobody waits, the call is cancelled and forgotten."""
+        flight = SingleFlight()
+        cancelled = asyncio.Event()
+
+        async def fetch():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        caller = asyncio.create_task(flight.do("k", fetch))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+        assert flight.stats()["in_flight"] == 0
+
+
+class TestCoalescedSearch:
+    """Identical searches through the cache tool."""
+
+    @pytest.mark.asyncio
+    async def test_identical_searches_send_one_request(self):
+        """Concurrent equivalent searches reach the API once, each caller gets its own copy."""
+        with StubBraveServer(latency=0.05) as server:
+            async with HTTPClientPool(http2=False) as pool:
+                options = {"client": pool.client(), "search_url": server.url}
+                results = await asyncio.gather(*(
+                    cached_search_web_tool(None, "key", query, 3, **options)
+                    for query in ["Pydantic AI", "pydantic ai", "PYDANTIC  AI"]
+                ))
+
+        assert server.requests == 1
+        assert results[0] == results[1] == results[2]
+        assert results[0] is not results[1] and results[0][0] is not results[1][0]
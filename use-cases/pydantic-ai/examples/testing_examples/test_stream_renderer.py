@@ -0,0 +1,94 @@
+"""Tests for the CLI: frame-based rendering of streamed responses and the prompt."""
+
+import io
+import asyncio
+import sys
+import types
+import importlib
+
+import pytest
+from rich.console import Console
+from rich.text import Text
+
+
+@pytest.fixture
+def cli(monkeypatch):
+    """The CLI module, printing to a string buffer."""
+    # The agent and its dependencies are not needed to render text, and
+    # their email agent is not part of the reference
+    for name, attribute in [("agents.research_agent", "research_agent"), ("agents.dependencies", "ResearchAgentDependencies")]:
+        module = types.ModuleType(name)
+        setattr(module, attribute, None)
+        monkeypatch.setitem(sys.modules, name, module)
+    monkeypatch.delitem(sys.modules, "agents.cli", raising=False)
+    cli = importlib.import_module("agents.cli")
+    monkeypatch.setattr(cli, "console", Console(file=io.StringIO(), width=80, color_system=None))
+    return cli
+
+
+def output(cli) -> str:
+    return cli.console.file.getvalue()
+
+
+class TestStreamRenderer:
+    """Frames, complete lines and the final text."""
+
+    def test_complete_lines_are_printed_once_with_prefix(self, cli):
+        """Each line is printed once, the prefix only before the first."""
+        renderer = cli.StreamRenderer(Text("Assistant: "), refresh_per_second=1000)
+        for delta in ["Hel", "lo\nwor", "ld\nand", " more"]:
+            renderer.append(delta)
+
+        assert renderer.close() == "Hello\nworld\nand more"
+        printed = output(cli)
+        assert printed.count("Assistant: Hello") == 1
+        assert printed.count("world") == 1
+        assert printed.count("and more") == 1
+        assert printed.count("Assistant:") == 1
+
+    def test_frames_are_bounded_by_the_refresh_rate(self, cli, monkeypatch):
+        """Deltas arriving within a frame interval do not trigger a redraw."""
+        renderer = cli.StreamRenderer(Text("Assistant: "), refresh_per_second=0.001)
+        frames = []
+        draw = renderer._frame
+        monkeypatch.setattr(renderer, "_frame", lambda: frames.append(1) or draw())
+
+        for token in range(200):
+            renderer.append(f"token {token} ")
+
+        # At most the first delta draws a frame
+        assert len(frames) <= 1
+        drawn = len(frames)
+        assert renderer.close().startswith("token 0 token 1 ")
+        assert len(frames) == drawn + 1
+        assert "token 199" in output(cli)
+
+    def test_empty_stream_prints_nothing(self, cli):
+        """Without text there is no live display and no prefix."""
+        renderer = cli.StreamRenderer(Text("Assistant: "))
+        renderer.append("")
+
+        assert renderer.close() == ""
+        assert output(cli) == ""
+
+
+class TestAsk:
+    """Reading input off the event loop."""
+
+    @pytest.mark.asyncio
+    async def test_answer_is_returned(self, cli, monkeypatch):
+        """The prompt's answer resolves the awaited call."""
+        monkeypatch.setattr(cli.Prompt, "ask", lambda prompt: "hello")
+
+        assert await asyncio.wait_for(cli.ask("You"), 1) == "hello"
+
+    @pytest.mark.asyncio
+    async def test_eof_is_raised_every_time(self, cli, monkeypatch):
+        """Ctrl+D reaches the caller as EOFError instead of leaving it waiting."""
+        def eof(prompt):
+            raise EOFError
+
+        monkeypatch.setattr(cli.Prompt, "ask", eof)
+        for _ in range(30):
+            with pytest.raises(EOFError):
+                await asyncio.wait_for(cli.ask("You"), 1)
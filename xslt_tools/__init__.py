@@ -0,0 +1,25 @@
+"""
+Runtime tooling for the XSLT mappings in examples/.
+
+Compiles mappings once, caches them, and runs batches of IDocs through
+either lxml (libxslt) or saxonche (Saxon-HE).
+"""
+
+from .engines import ENGINES, get_backend
+from .cache import StylesheetCache, content_digest
+from .runner import BatchRunner, BatchReport, DocumentResult
+from .parallel import run_parallel
+from .streaming import iter_batch, stream_transform
+
+__all__ = [
+    "ENGINES",
+    "get_backend",
+    "StylesheetCache",
+    "content_digest",
+    "BatchRunner",
+    "BatchReport",
+    "DocumentResult",
+    "run_parallel",
+    "iter_batch",
+    "stream_transform",
+]
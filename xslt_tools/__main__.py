@@ -0,0 +1,41 @@
+"""
+Command line entry point: python -m xslt_tools <command> [args...]
+
+Each command is the main() of one module, loaded on demand.
+"""
+
+import sys
+import importlib
+
+COMMANDS = {
+    "run": ("xslt_tools.runner", "Run a batch of documents through a mapping"),
+    "stream": ("xslt_tools.streaming", "Transform each IDOC of a large batch file incrementally"),
+    "fixtures": ("xslt_tools.fixtures", "Generate source documents from an INITIAL.md requirement table"),
+    "analyze": ("xslt_tools.analyze", "Report XPath lookups whose cost grows with the input"),
+    "keys": ("xslt_tools.keys", "Rewrite qualifier lookups to xsl:key, verified on a corpus"),
+    "verify": ("xslt_tools.verify", "Compare lxml and Saxon output of a mapping, with timing"),
+    "sef": ("xslt_tools.sef", "Precompile stylesheets to SEF artifacts for Saxon workers"),
+    "serve": ("xslt_tools.daemon", "Serve preloaded mappings over localhost HTTP or a Unix socket"),
+    "incremental": ("xslt_tools.incremental", "Re-transform only fixtures affected by stylesheet edits"),
+    "profile": ("xslt_tools.profile", "Profile a mapping per template and for-each, with flamegraph export"),
+    "bench": ("xslt_tools.bench", "Benchmark the example mappings on synthetic inputs"),
+}
+
+
+def print_usage() -> None:
+    print("Usage: python -m xslt_tools <command> [args...]\n\nCommands:")
+    for name, (_, help_text) in COMMANDS.items():
+        print(f"  {name:<12} {help_text}")
+
+
+def main() -> int:
+    if len(sys.argv) < 2 or sys.argv[1] not in COMMANDS:
+        print_usage()
+        return 2
+
+    module = importlib.import_module(COMMANDS[sys.argv[1]][0])
+    return module.main(sys.argv[2:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,633 @@
+"""
+Static XPath cost analysis for XSLT mappings.
+
+Generated mappings tend to repeat long absolute paths and walk back up the
+tree (ancestor::, parent::, preceding::) from per-item templates. Each such
+lookup scans a node list that grows with the number of items, so running it
+once per item makes the whole transform quadratic.
+
+The analyzer walks every template, works out how often its body runs (once,
+or once per item) and estimates the cost of every XPath location path in it
+as a power of the input fan-out n. The shape of the input, i.e. which
+elements repeat and which parents hold them, comes from sample documents;
+without them, the analysis falls back to a worst-case reading that only trusts
+paths descending from the context node.
+
+Usage:
+    python -m xslt_tools analyze examples/Ex5_Mapping.xsl [--sample small.xml --sample large.xml] [--fanout 10000] [--json]
+"""
+
+import os
+import json
+import argparse
+import logging
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from lxml import etree
+
+from .synthetic import MAPPING_INPUTS, generate
+
+logger = logging.getLogger(__name__)
+
+XSL_NS = "http://www.w3.org/1999/XSL/Transform"
+
+# Same-name siblings from which an element counts as repeating with the input
+DEFAULT_MIN_FANOUT = 10
+
+_AXES_WITH_SCAN = ("preceding", "following")
+_SIBLING_AXES = ("preceding-sibling", "following-sibling")
+_UPWARD_AXES = ("parent", "ancestor", "ancestor-or-self")
+_NODE_TESTS = ("text", "node", "comment", "processing-instruction")
+
+
+class DocumentShape:
+    """Which elements repeat in an input document, and where they live."""
+
+    def __init__(self, *roots: etree._Element, min_fanout: int = DEFAULT_MIN_FANOUT):
+        """
+        Args:
+            *roots: Root elements of one or more samples of the same input
+                type. With two or more, of different sizes, an element
+                repeats if its sibling count grew between the smallest and
+                the largest sample; with one, if it has at least min_fanout
+                same-name siblings.
+            min_fanout: Threshold for a single sample
+        """
+        self.root_name = etree.QName(roots[0]).localname
+        self.children: Dict[str, Set[str]] = defaultdict(set)
+        self.parents: Dict[str, Set[str]] = defaultdict(set)
+        self.repeating: Set[str] = set()
+
+        fanouts = []
+        for root in sorted(roots, key=lambda r: sum(1 for _ in r.iter())):
+            fanout: Dict[str, int] = defaultdict(int)
+            for element in root.iter(etree.Element):
+                name = etree.QName(element).localname
+                counts: Dict[str, int] = defaultdict(int)
+                for child in element.iterchildren(etree.Element):
+                    child_name = etree.QName(child).localname
+                    counts[child_name] += 1
+                    self.children[name].add(child_name)
+                    self.parents[child_name].add(name)
+                for child_name, count in counts.items():
+                    fanout[child_name] = max(fanout[child_name], count)
+            fanouts.append(fanout)
+
+        if len(fanouts) > 1:
+            self.repeating = {n for n, count in fanouts[-1].items() if count > fanouts[0].get(n, 0)}
+        else:
+            self.repeating = {n for n, count in fanouts[0].items() if count >= min_fanout}
+
+        self._scales: Dict[str, bool] = {}
+
+    @classmethod
+    def from_files(cls, paths: List[str], min_fanout: int = DEFAULT_MIN_FANOUT) -> "DocumentShape":
+        """
+        Read the shape of sample input documents.
+
+        Args:
+            paths: Sample document paths
+            min_fanout: Same-name siblings from which an element counts as repeating
+
+        Returns:
+            DocumentShape for the samples
+        """
+        return cls(*(etree.parse(path).getroot() for path in paths), min_fanout=min_fanout)
+
+    def wide(self, name: str) -> bool:
+        """True if scanning the children of name costs O(n)."""
+        return bool(self.children.get(name, set()) & self.repeating)
+
+    def scales(self, name: str) -> bool:
+        """True if the number of name elements grows with the input."""
+        if name not in self._scales:
+            self._scales[name] = False  # guards against cycles
+            self._scales[name] = name in self.repeating or any(self.scales(p) for p in self.parents.get(name, ()))
+        return self._scales[name]
+
+
+@dataclass
+class Step:
+    """One step of a location path, with its offsets in the expression."""
+    axis: str
+    name: str
+    predicates: List[str] = field(default_factory=list)
+    qname: str = ""
+    start: int = 0
+    end: int = 0
+
+
+@dataclass
+class Finding:
+    """An XPath lookup whose cost grows with the input."""
+    template: str
+    lines: List[int]
+    kind: str
+    expression: str
+    per_evaluation: int
+    multiplicity: int
+
+    @property
+    def degree(self) -> int:
+        """Power of n the total cost grows with."""
+        return self.per_evaluation + self.multiplicity
+
+    @property
+    def severity(self) -> str:
+        """"high" for quadratic or worse, "low" for linear."""
+        return "high" if self.degree >= 2 else "low"
+
+    @property
+    def cost(self) -> str:
+        """Big-O notation of the total cost."""
+        return big_o(self.degree)
+
+    def estimate(self, fanout: int) -> int:
+        """
+        Estimate node visits at a given input fan-out.
+
+        Args:
+            fanout: Number of repeating items n
+
+        Returns:
+            Approximate node visits over the whole transform
+        """
+        return len(self.lines) * fanout ** self.degree
+
+
+@dataclass
+class TemplateReport:
+    """Findings of one template (or of the top-level declarations)."""
+    name: str
+    line: int
+    multiplicity: int
+    findings: List[Finding] = field(default_factory=list)
+
+
+def big_o(degree: int) -> str:
+    """Format a power of n as O(...)."""
+    return {0: "O(1)", 1: "O(n)"}.get(degree, f"O(n^{degree})")
+
+
+def _skip_literal(expression: str, index: int) -> int:
+    """Index just past the string literal starting at index."""
+    end = expression.find(expression[index], index + 1)
+    return len(expression) if end < 0 else end + 1
+
+
+def _balanced(expression: str, index: int, opening: str = "[", closing: str = "]") -> int:
+    """Index just past the bracket closing the one at index."""
+    depth = 0
+    while index < len(expression):
+        char = expression[index]
+        if char in ("'", '"'):
+            index = _skip_literal(expression, index)
+            continue
+        if char == opening:
+            depth += 1
+        elif char == closing:
+            depth -= 1
+            if depth == 0:
+                return index + 1
+        index += 1
+    return len(expression)
+
+
+_NAME_CHARS = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-.:*@")
+
+
+def location_paths(expression: str) -> List[Tuple[bool, List[Step], str]]:
+    """
+    Extract the location paths of an XPath 1.0 expression.
+
+    This is a tokenizer, not a full parser: it finds paths between operators
+    and function calls, which is all the cost model needs. Paths inside
+    predicates and paths starting at a variable are not returned.
+
+    Args:
+        expression: XPath expression
+
+    Returns:
+        (absolute, steps, path text) for every path, predicates kept as text
+    """
+    return [(absolute, steps, expression[start:end].strip()) for start, end, absolute, steps in path_spans(expression)]
+
+
+def path_spans(expression: str) -> List[Tuple[int, int, bool, List[Step]]]:
+    """
+    Like location_paths, with the offsets of every path instead of its text.
+
+    Args:
+        expression: XPath expression
+
+    Returns:
+        (start, end, absolute, steps) for every path
+    """
+    paths = []
+    index = 0
+    length = len(expression)
+    after_variable = False
+
+    while index < length:
+        char = expression[index]
+        if char in ("'", '"'):
+            index = _skip_literal(expression, index)
+            continue
+        if char == "$":
+            # A variable reference; paths relative to it are not tracked
+            index += 1
+            while index < length and expression[index] in _NAME_CHARS - {"*", "@"}:
+                index += 1
+            after_variable = expression.startswith("/", index)
+            continue
+        if char.isdigit():
+            while index < length and (expression[index].isdigit() or expression[index] == "."):
+                index += 1
+            continue
+        if char != "/" and char not in _NAME_CHARS:
+            index += 1
+            continue
+
+        start = index
+        relative_to_variable, after_variable = after_variable, False
+        absolute = char == "/"
+        steps: List[Step] = []
+        descendant = False
+        while index < length:
+            if expression.startswith("//", index):
+                descendant = True
+                index += 2
+            elif expression[index] == "/":
+                index += 1
+            elif steps:
+                break
+
+            token_start = index
+            while index < length and (expression[index] in _NAME_CHARS or expression.startswith("::", index)):
+                index += 2 if expression.startswith("::", index) else 1
+            token = expression[token_start:index]
+            if not token:
+                break
+
+            if token == "*" and not steps and not absolute:
+                # Multiplication, not a name test
+                break
+            axis, _, name = token.rpartition("::")
+            if index < length and expression[index] == "(":
+                if name not in _NODE_TESTS:
+                    # Function call: its arguments are scanned as expressions
+                    if not steps:
+                        index += 1
+                        absolute = False
+                        break
+                    index = token_start
+                    break
+                index = _balanced(expression, index, "(", ")")
+
+            if token == "..":
+                axis, name = "parent", "*"
+            elif token == ".":
+                axis, name = "self", "*"
+            elif name.startswith("@"):
+                axis, name = "attribute", name[1:]
+            axis = axis or "child"
+            if descendant:
+                axis = "descendant" if axis == "child" else axis
+                descendant = False
+
+            step = Step(axis, name.rpartition(":")[2], qname=name, start=token_start)
+            while index < length and expression[index] == "[":
+                end = _balanced(expression, index)
+                step.predicates.append(expression[index + 1:end - 1])
+                index = end
+            step.end = index
+            steps.append(step)
+
+            if not expression.startswith("/", index):
+                break
+
+        # Steps after $variable navigate from the variable, not the context
+        if steps and not relative_to_variable and not (len(steps) == 1 and steps[0].axis == "child" and steps[0].name in ("and", "or", "div", "mod")):
+            paths.append((start, index, absolute, steps))
+        elif index == start:
+            index += 1
+    return paths
+
+
+class _Evaluator:
+    """Cost of location paths for a given document shape (or none)."""
+
+    def __init__(self, shape: Optional[DocumentShape]):
+        self.shape = shape
+
+    def wide(self, name: Optional[str], trusted: bool) -> bool:
+        """Whether a child scan of name is O(n)."""
+        if self.shape is None:
+            # Worst case, except when walking down from the context node
+            return not trusted
+        return name is not None and self.shape.wide(name)
+
+    def repeats(self, name: str) -> bool:
+        if self.shape is None:
+            return False
+        return name in self.shape.repeating
+
+    def path_cost(self, absolute: bool, steps: List[Step], context: Optional[str]) -> Tuple[int, str]:
+        """
+        Estimate one evaluation of a location path.
+
+        Returns:
+            (power of n, kind of the dominant scan)
+        """
+        current = self.shape.root_name if (absolute and self.shape) else None
+        # Document node: its only child is the root element
+        current_is_document = absolute
+        trusted = not absolute
+        if not absolute:
+            current = context
+
+        degree, kind = 0, ""
+
+        def note(cost: int, what: str) -> None:
+            nonlocal degree, kind
+            if cost > degree:
+                degree, kind = cost, what
+
+        for step in steps:
+            if step.axis in ("child", "attribute", "self"):
+                if step.axis == "child" and not current_is_document:
+                    scan = 1 if self.wide(current, trusted) else 0
+                    note(scan, "predicate-search" if step.predicates else ("absolute-path" if absolute else "child-scan"))
+                if step.axis == "child":
+                    current = step.name if step.name != "*" else None
+            elif step.axis == "descendant" or step.axis == "descendant-or-self":
+                note(1, "descendant-scan")
+                current, trusted = step.name, False
+            elif step.axis in _AXES_WITH_SCAN:
+                note(1, "document-order-axis")
+                current, trusted = step.name, False
+            elif step.axis in _SIBLING_AXES:
+                parents = self.shape.parents.get(current or "", set()) if self.shape else set()
+                wide = any(self.shape.wide(p) for p in parents) if self.shape else True
+                note(1 if wide else 0, "sibling-axis")
+                current, trusted = step.name, False
+            elif step.axis in _UPWARD_AXES:
+                if step.name != "*":
+                    current = step.name
+                elif self.shape and current:
+                    parents = self.shape.parents.get(current, set())
+                    current = next(iter(parents)) if len(parents) == 1 else None
+                else:
+                    current = None
+                trusted = False
+            current_is_document = False
+
+            # Predicates run once per candidate node
+            for predicate in step.predicates:
+                inner = max((self.path_cost(a, s, current)[0] for a, s, _ in location_paths(predicate)), default=0)
+                if inner:
+                    note(inner + (1 if self.repeats(step.name) else 0), "predicate-search")
+
+        if kind in ("child-scan", "predicate-search") and any(s.axis in _UPWARD_AXES for s in steps):
+            kind = "upward-lookup"
+        return degree, kind
+
+
+def _match_context(pattern: str) -> Optional[str]:
+    """Local name of the element a match pattern selects."""
+    first = pattern.split("|")[0].strip()
+    if first == "/":
+        return None
+    last = first.rstrip("/").split("/")[-1]
+    last = last.split("[")[0].rpartition("::")[2].rpartition(":")[2]
+    return last or None
+
+
+def _describe(template: etree._Element) -> str:
+    parts = []
+    for attribute in ("match", "name", "mode"):
+        if template.get(attribute):
+            parts.append(f'{attribute}="{template.get(attribute)}"')
+    return f"xsl:template {' '.join(parts)}"
+
+
+class StylesheetAnalyzer:
+    """Find XPath lookups in a stylesheet whose total cost grows faster than the input."""
+
+    def __init__(self, shape: Optional[DocumentShape] = None):
+        self.shape = shape
+        self.evaluator = _Evaluator(shape)
+
+    def _scales(self, name: Optional[str]) -> bool:
+        if name is None:
+            return False
+        if self.shape is None:
+            return True
+        return self.shape.scales(name)
+
+    def analyze(self, stylesheet: str) -> List[TemplateReport]:
+        """
+        Analyze a stylesheet file.
+
+        Args:
+            stylesheet: Path to the XSLT file
+
+        Returns:
+            One TemplateReport per template, plus one for top-level
+            declarations when they have findings
+        """
+        root = etree.parse(stylesheet).getroot()
+
+        # Named templates run as often as their most frequent caller
+        named_multiplicity: Dict[str, int] = defaultdict(int)
+        templates = root.findall(f"{{{XSL_NS}}}template")
+        for template in templates:
+            multiplicity = self._template_multiplicity(template)
+            for call in template.iter(f"{{{XSL_NS}}}call-template"):
+                for_each_depth = any(a.tag == f"{{{XSL_NS}}}for-each" for a in call.iterancestors())
+                named_multiplicity[call.get("name")] = max(
+                    named_multiplicity[call.get("name")],
+                    1 if multiplicity or for_each_depth else 0
+                )
+
+        reports = []
+        top_level = TemplateReport("top-level declarations", root.sourceline or 1, 0)
+        for child in root.iterchildren(etree.Element):
+            if child.tag != f"{{{XSL_NS}}}template":
+                self._walk(child, top_level, None, 0)
+        if top_level.findings:
+            reports.append(top_level)
+
+        for template in templates:
+            multiplicity = self._template_multiplicity(template)
+            if template.get("name") and not template.get("match"):
+                multiplicity = named_multiplicity.get(template.get("name"), 0)
+            report = TemplateReport(_describe(template), template.sourceline, multiplicity)
+            self._walk(template, report, _match_context(template.get("match", "/")), multiplicity)
+            report.findings = self._merge(report.findings)
+            reports.append(report)
+        return reports
+
+    def _template_multiplicity(self, template: etree._Element) -> int:
+        match = template.get("match")
+        if not match:
+            return 0
+        return 1 if self._scales(_match_context(match)) else 0
+
+    def _walk(self, element: etree._Element, report: TemplateReport, context: Optional[str], multiplicity: int) -> None:
+        """Collect findings for an element and its descendants."""
+        for name in ("select", "test"):
+            if element.get(name) is not None:
+                self._check(element.get(name), element.sourceline, report, context, multiplicity)
+        if element.tag == f"{{{XSL_NS}}}number" and element.get("value") is None:
+            if element.get("level") == "any":
+                self._add(report, element.sourceline, "document-order-axis", "xsl:number level=any", 1, multiplicity)
+        if not isinstance(element.tag, str) or not element.tag.startswith(f"{{{XSL_NS}}}"):
+            # Attribute value templates on literal result elements
+            for value in element.attrib.values():
+                if "{" in value:
+                    for part in value.split("{")[1:]:
+                        self._check(part.split("}")[0], element.sourceline, report, context, multiplicity)
+
+        if element.tag == f"{{{XSL_NS}}}for-each":
+            paths = location_paths(element.get("select", ""))
+            if paths:
+                absolute, steps, _ = paths[-1]
+                inner = steps[-1].name if steps[-1].name != "*" else None
+                context = inner
+                if self._scales(inner):
+                    multiplicity = 1
+
+        for child in element.iterchildren(etree.Element):
+            self._walk(child, report, context, multiplicity)
+
+    def _check(self, expression: str, line: int, report: TemplateReport, context: Optional[str], multiplicity: int) -> None:
+        for absolute, steps, text in location_paths(expression):
+            degree, kind = self.evaluator.path_cost(absolute, steps, context)
+            if degree:
+                self._add(report, line, kind, text, degree, multiplicity)
+
+    @staticmethod
+    def _add(report: TemplateReport, line: int, kind: str, expression: str, degree: int, multiplicity: int) -> None:
+        report.findings.append(Finding(report.name, [line], kind, expression, degree, multiplicity))
+
+    @staticmethod
+    def _merge(findings: List[Finding]) -> List[Finding]:
+        """Fold repeats of the same expression into one finding with several lines."""
+        merged: Dict[Tuple[str, int], Finding] = {}
+        for finding in findings:
+            key = (finding.expression, finding.multiplicity)
+            if key in merged:
+                merged[key].lines.extend(finding.lines)
+            else:
+                merged[key] = finding
+        return sorted(merged.values(), key=lambda f: (-f.degree, f.lines[0]))
+
+
+def sample_shape(
+    stylesheet: str,
+    samples: Optional[List[str]] = None,
+    min_fanout: int = DEFAULT_MIN_FANOUT
+) -> Optional[DocumentShape]:
+    """
+    Get the input shape to analyze against.
+
+    Uses the sample documents if given, otherwise two synthetic inputs of
+    different sizes when the stylesheet is one of the example mappings.
+
+    Args:
+        stylesheet: Stylesheet path
+        samples: Sample input paths
+        min_fanout: Same-name siblings from which an element counts as
+            repeating, when there is a single sample
+
+    Returns:
+        DocumentShape, or None when nothing is known about the input
+    """
+    if samples:
+        return DocumentShape.from_files(samples, min_fanout)
+    kind = MAPPING_INPUTS.get(os.path.basename(stylesheet))
+    if kind:
+        logger.info(f"Using synthetic {kind} inputs as samples")
+        return DocumentShape(*(etree.fromstring(generate(kind, items=items)) for items in (20, 200)))
+    return None
+
+
+def reportable(finding: Finding, show_all: bool = False) -> bool:
+    """
+    Whether a finding is worth showing.
+
+    Args:
+        finding: Finding to check
+        show_all: Show every O(n) lookup, not only super-linear or repeated ones
+
+    Returns:
+        True for lookups that grow faster than the input or that are
+        evaluated in several places
+    """
+    return show_all or finding.degree >= 2 or len(finding.lines) > 1
+
+
+def print_reports(reports: List[TemplateReport], fanout: int, show_all: bool = False) -> None:
+    """Print findings per template."""
+    total = 0
+    for report in reports:
+        findings = [f for f in report.findings if reportable(f, show_all)]
+        if not findings:
+            continue
+        runs = "once per item" if report.multiplicity else "once"
+        print(f"\n{report.name} (line {report.line}, runs {runs})")
+        for finding in findings:
+            lines = ", ".join(map(str, finding.lines))
+            marker = "❌" if finding.severity == "high" else "⚠️ "
+            print(
+                f"  {marker} line {lines}: {finding.cost} {finding.kind}: {finding.expression}"
+                f"  (~{finding.estimate(fanout):,} node visits at n={fanout:,})"
+            )
+            total += 1
+    if not total:
+        print("✅ No repeated or super-linear lookups")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function for static cost analysis."""
+    parser = argparse.ArgumentParser(
+        prog="python -m xslt_tools analyze",
+        description="Report XPath lookups whose cost grows with the input fan-out, per template"
+    )
+    parser.add_argument("stylesheets", nargs="+", help="XSLT files to analyze")
+    parser.add_argument("--sample", action="append", default=[],
+                        help="Sample input document; give two of different sizes to tell repeating elements apart (repeatable)")
+    parser.add_argument("--min-fanout", type=int, default=DEFAULT_MIN_FANOUT,
+                        help=f"Same-name siblings from which an element repeats (default: {DEFAULT_MIN_FANOUT})")
+    parser.add_argument("--fanout", type=int, default=10000, help="n used for node visit estimates (default: 10000)")
+    parser.add_argument("--all", action="store_true", help="Also show single O(n) lookups")
+    parser.add_argument("--json", action="store_true", help="Print findings as JSON")
+    parser.add_argument("--strict", action="store_true", help="Exit with 1 if any quadratic lookup is found")
+    args = parser.parse_args(argv)
+
+    quadratic = 0
+    results = {}
+    for stylesheet in args.stylesheets:
+        shape = sample_shape(stylesheet, args.sample, args.min_fanout)
+        reports = StylesheetAnalyzer(shape).analyze(stylesheet)
+        quadratic += sum(1 for r in reports for f in r.findings if f.severity == "high")
+
+        if args.json:
+            results[stylesheet] = [
+                dict(asdict(r), findings=[
+                    dict(asdict(f), cost=f.cost, severity=f.severity, estimate=f.estimate(args.fanout))
+                    for f in r.findings if reportable(f, args.all)
+                ])
+                for r in reports
+            ]
+        else:
+            print(f"📄 {stylesheet}" + ("" if shape else " (no sample input: worst-case estimates)"))
+            print_reports(reports, args.fanout, args.all)
+            print()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    return 1 if args.strict and quadratic else 0
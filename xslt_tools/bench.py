@@ -0,0 +1,338 @@
+"""
+Transform benchmarks for the example mappings.
+
+Every case (mapping x engine x line items) runs in a fresh process so its
+peak RSS is not inflated by earlier cases. Each case generates a synthetic
+input, compiles the mapping once, and times repeated parse + transform runs.
+Results are written as JSON and can be compared against a stored baseline.
+
+Usage:
+    python -m xslt_tools bench [--mapping Ex2_Mapping.xsl] [--engine lxml] [--items 1 100] [--output bench_results.json]
+    python -m xslt_tools bench --compare bench_results.json tests/benchmarks/baseline.json [--tolerance 0.5]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+import platform
+import resource
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .cache import StylesheetCache
+from .engines import ENGINES
+from .runner import percentile
+from .sap import stub_external_functions
+from .synthetic import MAPPING_INPUTS, generate
+
+logger = logging.getLogger(__name__)
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "examples")
+
+DEFAULT_ITEMS = (1, 100, 10000)
+
+# Metrics where a higher value is a regression, with the smallest absolute
+# increase worth reporting so sub-millisecond noise is not flagged
+REGRESSION_METRICS = {"p95_ms": 1.0, "peak_rss_mb": 10.0}
+
+
+@dataclass
+class BenchResult:
+    """Measurements for one mapping/engine/size combination."""
+    mapping: str
+    engine: str
+    items: int
+    iterations: int
+    input_bytes: int
+    compile_ms: float
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+    docs_per_second: float
+    peak_rss_mb: float
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        """Identifier used to match results across runs."""
+        return f"{self.mapping}/{self.engine}/{self.items}"
+
+
+def default_iterations(items: int) -> int:
+    """
+    Pick a repeat count that keeps large cases short.
+
+    Args:
+        items: Line items per input document
+
+    Returns:
+        Number of timed transforms
+    """
+    return max(3, min(50, 2000 // max(items, 1)))
+
+
+def prepare_stylesheet(path: str, work_dir: str) -> str:
+    """
+    Get a stylesheet both engines can run.
+
+    Mappings calling SAP ABAP external functions get a copy with those calls
+    stubbed out; every other mapping is used as is.
+
+    Args:
+        path: Stylesheet path
+        work_dir: Directory for the stubbed copy
+
+    Returns:
+        Path of the stylesheet to benchmark
+    """
+    with open(path, "rb") as f:
+        content = f.read()
+    stubbed = stub_external_functions(content)
+    if stubbed is content:
+        return path
+
+    stub_path = os.path.join(work_dir, os.path.basename(path))
+    with open(stub_path, "wb") as f:
+        f.write(stubbed)
+    return stub_path
+
+
+def _run_case(mapping: str, engine: str, items: int, iterations: int, examples_dir: str) -> BenchResult:
+    """Benchmark one case. Runs inside a dedicated worker process."""
+    document = generate(MAPPING_INPUTS[mapping], items)
+    errors = []
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        stylesheet = prepare_stylesheet(os.path.join(examples_dir, mapping), work_dir)
+        start = time.perf_counter()
+        compiled = StylesheetCache(maxsize=1, engine=engine).get(stylesheet)
+        compile_seconds = time.perf_counter() - start
+
+        # Untimed runs so lazy initialisation does not skew the first samples
+        for _ in range(min(iterations, 5)):
+            compiled.transform(document)
+
+        timings = []
+        for _ in range(iterations):
+            doc_start = time.perf_counter()
+            try:
+                compiled.transform(document)
+            except Exception as e:
+                errors.append(str(e))
+            timings.append(time.perf_counter() - doc_start)
+
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss_mb = peak_rss / (1024 * 1024) if sys.platform == "darwin" else peak_rss / 1024
+
+    total = sum(timings)
+    return BenchResult(
+        mapping=mapping,
+        engine=engine,
+        items=items,
+        iterations=iterations,
+        input_bytes=len(document),
+        compile_ms=round(compile_seconds * 1000, 3),
+        p50_ms=round(percentile(timings, 50) * 1000, 3),
+        p95_ms=round(percentile(timings, 95) * 1000, 3),
+        max_ms=round(max(timings) * 1000, 3),
+        docs_per_second=round(len(timings) / total, 2) if total else 0.0,
+        peak_rss_mb=round(peak_rss_mb, 1),
+        errors=errors
+    )
+
+
+def run_case(
+    mapping: str,
+    engine: str,
+    items: int,
+    iterations: Optional[int] = None,
+    examples_dir: str = EXAMPLES_DIR
+) -> BenchResult:
+    """
+    Benchmark one mapping on one engine in a fresh process.
+
+    Args:
+        mapping: Stylesheet file name in examples_dir, one of MAPPING_INPUTS
+        engine: XSLT engine
+        items: Line items in the synthetic input
+        iterations: Timed transforms (defaults to default_iterations(items))
+        examples_dir: Directory holding the mappings
+
+    Returns:
+        BenchResult for the case
+
+    Raises:
+        ValueError: If the mapping or engine is unknown
+    """
+    if mapping not in MAPPING_INPUTS:
+        raise ValueError(f"No synthetic input for mapping '{mapping}'. Choose from: {', '.join(MAPPING_INPUTS)}")
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown XSLT engine '{engine}'. Choose from: {', '.join(ENGINES)}")
+    iterations = iterations or default_iterations(items)
+
+    # spawn: a clean interpreter per case, and safe for the Saxon runtime
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        result = executor.submit(_run_case, mapping, engine, items, iterations, examples_dir).result()
+
+    logger.info(f"{result.key}: p50 {result.p50_ms}ms, p95 {result.p95_ms}ms, {result.peak_rss_mb}MB peak")
+    return result
+
+
+def environment() -> Dict[str, str]:
+    """
+    Describe the machine and library versions a run was made with.
+
+    Returns:
+        Dictionary of version strings
+    """
+    from lxml import etree
+
+    info = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": str(os.cpu_count()),
+        "lxml": ".".join(map(str, etree.LXML_VERSION)),
+        "libxslt": ".".join(map(str, etree.LIBXSLT_VERSION)),
+    }
+    try:
+        from importlib.metadata import version
+
+        info["saxonche"] = version("saxonche")
+    except Exception:
+        info["saxonche"] = "not installed"
+    return info
+
+
+def write_results(results: List[BenchResult], path: str) -> None:
+    """
+    Write benchmark results as JSON.
+
+    Args:
+        results: Results to write
+        path: Output file
+    """
+    data = {
+        "environment": environment(),
+        "results": [asdict(result) for result in results],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Load a results file keyed by mapping/engine/items.
+
+    Args:
+        path: JSON file written by write_results
+
+    Returns:
+        Dictionary of result dictionaries
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {f"{r['mapping']}/{r['engine']}/{r['items']}": r for r in data["results"]}
+
+
+def compare_results(
+    current: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float = 0.5
+) -> List[str]:
+    """
+    Find cases that got slower or bigger than the baseline.
+
+    Cases missing from either side are ignored.
+
+    Args:
+        current: Results of this run, as returned by load_results
+        baseline: Stored baseline results
+        tolerance: Allowed relative increase, e.g. 0.5 for +50%
+
+    Returns:
+        One message per regression; empty if there are none
+    """
+    regressions = []
+    for key in sorted(current.keys() & baseline.keys()):
+        if current[key]["errors"]:
+            regressions.append(f"{key}: {len(current[key]['errors'])} failed transforms")
+        for metric, min_increase in REGRESSION_METRICS.items():
+            old, new = baseline[key][metric], current[key][metric]
+            if old and new > old * (1 + tolerance) and new - old > min_increase:
+                regressions.append(f"{key}: {metric} {old} -> {new} (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def compare(current_path: str, baseline_path: str, tolerance: float = 0.5) -> List[str]:
+    """
+    Compare two results files.
+
+    Args:
+        current_path: Results of this run
+        baseline_path: Stored baseline results
+        tolerance: Allowed relative increase, e.g. 0.5 for +50%
+
+    Returns:
+        One message per regression; empty if there are none
+    """
+    return compare_results(load_results(current_path), load_results(baseline_path), tolerance)
+
+
+def print_results(results: List[BenchResult]) -> None:
+    """Print a results table."""
+    print(f"{'case':<44} {'p50 ms':>10} {'p95 ms':>10} {'docs/s':>10} {'RSS MB':>8}")
+    for result in results:
+        print(
+            f"{result.key:<44} {result.p50_ms:>10.3f} {result.p95_ms:>10.3f} "
+            f"{result.docs_per_second:>10.2f} {result.peak_rss_mb:>8.1f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function for the benchmark command."""
+    parser = argparse.ArgumentParser(
+        prog="python -m xslt_tools bench",
+        description="Benchmark the example mappings on synthetic inputs"
+    )
+    parser.add_argument("--mapping", nargs="+", choices=list(MAPPING_INPUTS), default=list(MAPPING_INPUTS),
+                        help="Mappings to benchmark (default: all)")
+    parser.add_argument("--engine", nargs="+", choices=ENGINES, default=list(ENGINES),
+                        help="Engines to benchmark (default: all)")
+    parser.add_argument("--items", nargs="+", type=int, default=list(DEFAULT_ITEMS),
+                        help="Line item counts (default: 1 100 10000)")
+    parser.add_argument("--iterations", type=int, help="Timed transforms per case (default: scaled by size)")
+    parser.add_argument("--output", default="bench_results.json", help="Results file (default: bench_results.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("CURRENT", "BASELINE"),
+                        help="Compare two results files instead of running")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Allowed relative increase before a regression is reported (default: 0.5)")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        regressions = compare(args.compare[0], args.compare[1], args.tolerance)
+        for message in regressions:
+            print(f"❌ {message}")
+        if not regressions:
+            print("✅ No regressions against the baseline")
+        return 1 if regressions else 0
+
+    results = []
+    for mapping in args.mapping:
+        for engine in args.engine:
+            for items in args.items:
+                results.append(run_case(mapping, engine, items, args.iterations))
+
+    print_results(results)
+    write_results(results, args.output)
+    print(f"\n📁 Results written to {args.output}")
+    return 1 if any(result.errors for result in results) else 0
@@ -0,0 +1,151 @@
+"""
+Bounded LRU cache of compiled stylesheets.
+
+Entries are keyed by engine, stylesheet path and content hash, so an edited
+stylesheet is recompiled on next use while unchanged ones are compiled once.
+"""
+
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .engines import get_backend
+
+logger = logging.getLogger(__name__)
+
+
+def content_digest(content: bytes) -> str:
+    """
+    Hash stylesheet or document content.
+
+    Args:
+        content: Raw bytes
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    return hashlib.sha256(content).hexdigest()
+
+
+class StylesheetCache:
+    """
+    Thread-safe LRU cache of compiled stylesheets.
+
+    The file is only re-read and re-hashed when its stat fingerprint
+    (mtime, size, inode) changes, so a cache hit costs one os.stat call.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 16,
+        engine: str = "lxml",
+        sef_dir: Optional[str] = None,
+        indent: Optional[bool] = None
+    ):
+        """
+        Args:
+            maxsize: Maximum number of compiled stylesheets to keep
+            engine: Default engine used by get()
+            sef_dir: Directory of exported Saxon stylesheets; Saxon misses
+                load from it instead of compiling when an artifact exists
+            indent: Override xsl:output indent in every stylesheet compiled
+                through this cache; None keeps each stylesheet's own
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        get_backend(engine)
+        self.maxsize = maxsize
+        self.engine = engine
+        self.indent = indent
+        self.sef_store = None
+        if sef_dir:
+            from .sef import SefStore
+
+            self.sef_store = SefStore(sef_dir)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Tuple[str, str, str], Any]" = OrderedDict()
+        self._digests: Dict[str, Tuple[Tuple[int, int, int], str]] = {}
+        self._lock = threading.Lock()
+
+    def _digest(self, path: str) -> str:
+        """Return the content digest of path, re-hashing only if the file changed."""
+        stat = os.stat(path)
+        fingerprint = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        known = self._digests.get(path)
+        if known and known[0] == fingerprint:
+            return known[1]
+
+        with open(path, "rb") as f:
+            digest = content_digest(f.read())
+        self._digests[path] = (fingerprint, digest)
+        return digest
+
+    def get(self, stylesheet: str, engine: Optional[str] = None) -> Any:
+        """
+        Get a compiled stylesheet, compiling it on a miss.
+
+        Args:
+            stylesheet: Path to the stylesheet
+            engine: Engine to compile with (defaults to the cache engine)
+
+        Returns:
+            Compiled stylesheet (LxmlStylesheet or SaxonStylesheet)
+        """
+        engine = engine or self.engine
+        path = os.path.realpath(stylesheet)
+
+        with self._lock:
+            key = (engine, path, self._digest(path))
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+
+        # Hash what is actually compiled so the key never outlives an edit
+        with open(path, "rb") as f:
+            content = f.read()
+        digest = content_digest(content)
+        key = (engine, path, digest)
+        logger.info(f"Compiling {path} with {engine} ({digest[:12]})")
+        backend = self.sef_store if engine == "saxon" and self.sef_store else get_backend(engine)
+        compiled = backend.compile(path, content, digest, self.indent)
+
+        with self._lock:
+            self._entries[key] = compiled
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return compiled
+
+    def clear(self) -> None:
+        """Drop every compiled stylesheet and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._digests.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with size, maxsize, hits, misses and evictions
+        """
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,398 @@
+"""
+Long-running transform service.
+
+Starting Python, importing lxml/saxonche and compiling a mapping costs far
+more than transforming one IDoc. The daemon pays that once: it compiles every
+stylesheet in a directory at start-up and then serves transform requests over
+localhost HTTP and/or a Unix socket (HTTP on both).
+
+Concurrency is bounded by a fixed number of slots. Each slot owns its own
+stylesheet cache, so compiled stylesheets are never shared between threads
+running at the same time. A request waits up to --queue-timeout for a free
+slot and is answered 503 with Retry-After when none frees up.
+
+Endpoints:
+    POST /transform/<mapping>[?param=value...]   body: input XML, response: result
+    GET  /health                                 mappings loaded, engine, status
+    GET  /metrics                                request counters and latency
+
+Usage:
+    python -m xslt_tools serve [--dir examples] [--port 8765] [--socket /tmp/xslt.sock] [--slots 4]
+
+Example:
+    curl --data-binary @idoc.xml http://127.0.0.1:8765/transform/Ex4_Mapping.xsl
+    curl --unix-socket /tmp/xslt.sock http://localhost/health
+"""
+
+import os
+import json
+import glob
+import queue
+import signal
+import socket
+import time
+import argparse
+import logging
+import threading
+import socketserver
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from .cache import StylesheetCache
+from .engines import ENGINES
+from .runner import percentile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+
+# Latency samples kept for /metrics percentiles
+LATENCY_WINDOW = 1000
+
+# Largest request body accepted
+MAX_BODY_BYTES = 256 * 1024 * 1024
+
+
+class Overloaded(Exception):
+    """No transform slot became free within the queue timeout."""
+
+
+class UnknownMapping(KeyError):
+    """The requested stylesheet is not served by this daemon."""
+
+
+class TransformService:
+    """Preloaded stylesheets behind a fixed number of transform slots."""
+
+    def __init__(
+        self,
+        stylesheet_dir: str,
+        engine: str = "lxml",
+        slots: int = 4,
+        queue_timeout: float = 1.0,
+        sef_dir: Optional[str] = None,
+        indent: Optional[bool] = None
+    ):
+        """
+        Args:
+            stylesheet_dir: Directory of *.xsl files to serve
+            engine: XSLT engine
+            slots: Transforms run at the same time
+            queue_timeout: Seconds a request waits for a free slot
+            sef_dir: Directory of exported Saxon stylesheets (see xslt_tools.sef)
+            indent: Override xsl:output indent; None keeps each stylesheet's
+
+        Raises:
+            ValueError: If slots is not positive or no stylesheet compiles
+        """
+        if slots < 1:
+            raise ValueError("slots must be at least 1")
+        self.engine = engine
+        self.queue_timeout = queue_timeout
+        self.started = time.time()
+        self.stylesheets: Dict[str, str] = {}
+        self.failed: Dict[str, str] = {}
+
+        self._slots: "queue.Queue[StylesheetCache]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._latencies: deque = deque(maxlen=LATENCY_WINDOW)
+        self._counts: Counter = Counter()
+        self._per_mapping: Counter = Counter()
+        self._in_flight = 0
+
+        paths = sorted(glob.glob(os.path.join(stylesheet_dir, "*.xsl")))
+        for _ in range(slots):
+            cache = StylesheetCache(maxsize=max(len(paths), 1), engine=engine, sef_dir=sef_dir, indent=indent)
+            for path in paths:
+                name = os.path.basename(path)
+                if name in self.failed:
+                    continue
+                try:
+                    cache.get(path)
+                    self.stylesheets[name] = path
+                except Exception as e:
+                    logger.warning(f"Not serving {name}: {e}")
+                    self.failed[name] = str(e)
+                    self.stylesheets.pop(name, None)
+            self._slots.put(cache)
+
+        if not self.stylesheets:
+            raise ValueError(f"No stylesheet in {stylesheet_dir} compiled with {engine}")
+        logger.info(f"Serving {len(self.stylesheets)} stylesheets with {engine} on {slots} slots")
+        self.slots = slots
+
+    def transform(self, mapping: str, document: bytes, params: Optional[Dict[str, str]] = None) -> Tuple[bytes, float]:
+        """
+        Transform one document.
+
+        Args:
+            mapping: Stylesheet file name, e.g. "Ex4_Mapping.xsl"
+            document: Input XML
+            params: Stylesheet parameters
+
+        Returns:
+            (result bytes, transform seconds)
+
+        Raises:
+            UnknownMapping: If the mapping is not served
+            Overloaded: If no slot frees up within the queue timeout
+            Exception: Whatever the engine raises for a bad document
+        """
+        path = self.stylesheets.get(mapping)
+        if path is None:
+            raise UnknownMapping(mapping)
+        try:
+            cache = self._slots.get(timeout=self.queue_timeout)
+        except queue.Empty:
+            self._count("rejected")
+            raise Overloaded(f"All {self.slots} transform slots busy")
+
+        with self._lock:
+            self._in_flight += 1
+        start = time.perf_counter()
+        try:
+            # get() re-checks the file, so an edited stylesheet is recompiled
+            output = cache.get(path).transform(document, params)
+        except Exception:
+            self._count("errors")
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.put(cache)
+
+        with self._lock:
+            self._counts["transforms"] += 1
+            self._per_mapping[mapping] += 1
+            self._latencies.append(seconds)
+        return output, seconds
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def health(self) -> Dict[str, Any]:
+        """
+        Describe what the daemon serves.
+
+        Returns:
+            Dictionary with status, engine, served and failed mappings
+        """
+        return {
+            "status": "ok",
+            "engine": self.engine,
+            "mappings": sorted(self.stylesheets),
+            "failed": self.failed,
+            "slots": self.slots,
+            "uptime_seconds": round(time.time() - self.started, 1),
+        }
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get request counters and transform latency.
+
+        Returns:
+            Dictionary of counters and latency percentiles over the last
+            LATENCY_WINDOW transforms
+        """
+        with self._lock:
+            latencies = list(self._latencies)
+            return {
+                "transforms": self._counts["transforms"],
+                "errors": self._counts["errors"],
+                "rejected": self._counts["rejected"],
+                "in_flight": self._in_flight,
+                "free_slots": self._slots.qsize(),
+                "per_mapping": dict(self._per_mapping),
+                "latency_p50_ms": round(percentile(latencies, 50) * 1000, 3),
+                "latency_p95_ms": round(percentile(latencies, 95) * 1000, 3),
+                "latency_max_ms": round(percentile(latencies, 100) * 1000, 3),
+            }
+
+
+class TransformHandler(BaseHTTPRequestHandler):
+    """HTTP front end of a TransformService, set as the server's service attribute."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "xslt-tools"
+
+    @property
+    def service(self) -> TransformService:
+        return self.server.service
+
+    def address_string(self) -> str:
+        # Unix socket peers have no address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json", headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, data: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        self._send(status, json.dumps(data).encode("utf-8"), headers=headers)
+
+    def do_GET(self) -> None:
+        path = urlsplit(self.path).path
+        if path == "/health":
+            self._send_json(200, self.service.health())
+        elif path == "/metrics":
+            self._send_json(200, self.service.metrics())
+        else:
+            self._send_json(404, {"error": f"Unknown path {path}"})
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # The body cannot be skipped reliably, so drop the connection
+            self.close_connection = True
+            self._send_json(400, {"error": "Invalid Content-Length"})
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send_json(413, {"error": f"Body larger than {MAX_BODY_BYTES} bytes"})
+            return
+        # Read the body even for bad paths so keep-alive connections stay in sync
+        document = self.rfile.read(length)
+
+        if not url.path.startswith("/transform/"):
+            self._send_json(404, {"error": f"Unknown path {url.path}"})
+            return
+        if not document:
+            self._send_json(400, {"error": "Empty request body"})
+            return
+
+        mapping = unquote(url.path[len("/transform/"):])
+        try:
+            output, seconds = self.service.transform(mapping, document, dict(parse_qsl(url.query)))
+        except UnknownMapping:
+            self._send_json(404, {"error": f"Unknown mapping '{mapping}'", "mappings": sorted(self.service.stylesheets)})
+        except Overloaded as e:
+            retry = max(1, round(self.service.queue_timeout))
+            self._send_json(503, {"error": str(e)}, headers={"Retry-After": str(retry)})
+        except Exception as e:
+            self._send_json(422, {"error": str(e)})
+        else:
+            self._send(200, output, "application/xml", {"X-Transform-Ms": f"{seconds * 1000:.3f}"})
+
+
+class TransformHTTPServer(ThreadingHTTPServer):
+    """Localhost HTTP server for a TransformService."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: TransformService):
+        super().__init__(address, TransformHandler)
+        self.service = service
+
+
+class TransformUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP over a Unix socket for a TransformService."""
+
+    daemon_threads = True
+
+    def __init__(self, path: str, service: TransformService):
+        if os.path.exists(path):
+            # A stale socket from a previous run blocks bind()
+            os.remove(path)
+        super().__init__(path, TransformHandler)
+        self.service = service
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+def serve(
+    service: TransformService,
+    host: str = "127.0.0.1",
+    port: Optional[int] = DEFAULT_PORT,
+    socket_path: Optional[str] = None
+) -> List[socketserver.BaseServer]:
+    """
+    Start the HTTP and/or Unix socket front ends in background threads.
+
+    Args:
+        service: Service to expose
+        host: HTTP bind address
+        port: HTTP port; None for no HTTP listener, 0 for any free port
+        socket_path: Unix socket path; None for no socket listener
+
+    Returns:
+        Running servers; call shutdown() and server_close() on each to stop
+    """
+    servers: List[socketserver.BaseServer] = []
+    if port is not None:
+        servers.append(TransformHTTPServer((host, port), service))
+    if socket_path:
+        servers.append(TransformUnixServer(socket_path, service))
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    return servers
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function for the transform daemon."""
+    parser = argparse.ArgumentParser(
+        prog="python -m xslt_tools serve",
+        description="Serve preloaded stylesheets over localhost HTTP and/or a Unix socket"
+    )
+    parser.add_argument("--dir", default="examples", help="Directory of stylesheets to serve (default: examples)")
+    parser.add_argument("--engine", choices=ENGINES, default="lxml", help="XSLT engine (default: lxml)")
+    parser.add_argument("--host", default="127.0.0.1", help="HTTP bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"HTTP port (default: {DEFAULT_PORT})")
+    parser.add_argument("--no-http", action="store_true", help="Only listen on the Unix socket")
+    parser.add_argument("--socket", help="Also listen on this Unix socket path")
+    parser.add_argument("--slots", type=int, default=os.cpu_count() or 1,
+                        help="Transforms run at the same time (default: CPU count)")
+    parser.add_argument("--queue-timeout", type=float, default=1.0,
+                        help="Seconds a request waits for a free slot before a 503 (default: 1.0)")
+    parser.add_argument("--sef-dir", help="Load Saxon stylesheets from SEF artifacts in this directory")
+    parser.add_argument("--indent", choices=("yes", "no"),
+                        help="Override xsl:output indent of every mapping (default: as each mapping declares)")
+    args = parser.parse_args(argv)
+
+    if args.no_http and not args.socket:
+        parser.error("--no-http needs --socket")
+    if args.socket and not hasattr(socket, "AF_UNIX"):
+        parser.error("Unix sockets are not supported on this platform")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    indent = None if args.indent is None else args.indent == "yes"
+    service = TransformService(args.dir, args.engine, args.slots, args.queue_timeout, args.sef_dir, indent)
+    servers = serve(service, args.host, None if args.no_http else args.port, args.socket)
+
+    for name in service.failed:
+        print(f"⚠️  {name} not served: {service.failed[name]}")
+    if not args.no_http:
+        print(f"🚀 http://{args.host}:{servers[0].server_address[1]}/transform/<mapping>")
+    if args.socket:
+        print(f"🚀 unix:{args.socket}")
+    print(f"   {len(service.stylesheets)} mappings, {args.engine}, {args.slots} slots")
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    try:
+        stop.wait()
+    except KeyboardInterrupt:
+        pass
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+    print("👋 Stopped")
+    return 0
@@ -0,0 +1,154 @@
+"""
+Bounded cache of parsed input documents.
+
+When one inbound IDoc feeds several mappings, parsing it once and applying
+every stylesheet to the same tree saves a parse per extra mapping. Neither
+engine modifies its input tree during a transform, so a parsed document can
+be shared by any number of stylesheets.
+
+Entries are weighed by an estimate of their in-memory size (input size times
+a per-engine ratio) and evicted least recently used first once the byte
+budget is exceeded. The default ratios are rough estimates; pass
+tree_bytes_per_input_byte to fit them to the documents at hand.
+"""
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .cache import content_digest
+from .engines import Source, get_backend
+
+logger = logging.getLogger(__name__)
+
+# Estimated parsed tree size per input byte: libxml2 nodes are far larger
+# than the short SAP segment names they hold, Saxon's TinyTree is compact
+TREE_BYTES_PER_INPUT_BYTE = {"lxml": 12, "saxon": 4}
+
+DEFAULT_BUDGET_BYTES = 512 * 1024 * 1024
+
+
+class DocumentCache:
+    """
+    Thread-safe LRU cache of parsed documents with a memory budget.
+
+    Paths are keyed by their stat fingerprint (so an edited file is parsed
+    again) and raw bytes by their content hash.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_BUDGET_BYTES,
+        engine: str = "lxml",
+        tree_bytes_per_input_byte: Optional[float] = None
+    ):
+        """
+        Args:
+            max_bytes: Estimated memory the cached trees may use
+            engine: Engine whose parser builds the trees
+            tree_bytes_per_input_byte: Tree size per input byte used to
+                weigh entries (default: TREE_BYTES_PER_INPUT_BYTE[engine])
+
+        Raises:
+            ValueError: If max_bytes is negative or the ratio not positive
+        """
+        if max_bytes < 0:
+            raise ValueError("max_bytes must not be negative")
+        if tree_bytes_per_input_byte is None:
+            tree_bytes_per_input_byte = TREE_BYTES_PER_INPUT_BYTE.get(engine, 8)
+        if tree_bytes_per_input_byte <= 0:
+            raise ValueError("tree_bytes_per_input_byte must be positive")
+        self.backend = get_backend(engine)
+        self.engine = engine
+        self.max_bytes = max_bytes
+        self.tree_bytes_per_input_byte = tree_bytes_per_input_byte
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Tuple, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, source: Source) -> Tuple[Tuple, int]:
+        """Cache key and input size of a source."""
+        if isinstance(source, bytes):
+            return ("bytes", content_digest(source)), len(source)
+        path = os.path.realpath(os.fspath(source))
+        stat = os.stat(path)
+        return ("path", path, stat.st_mtime_ns, stat.st_size, stat.st_ino), stat.st_size
+
+    def estimate(self, input_bytes: int) -> int:
+        """
+        Estimated memory of the tree parsed from an input.
+
+        Args:
+            input_bytes: Size of the serialized input
+
+        Returns:
+            Bytes
+        """
+        return int(input_bytes * self.tree_bytes_per_input_byte)
+
+    def get(self, source: Source) -> Any:
+        """
+        Get the parsed document for a source, parsing it on a miss.
+
+        Documents too large for the budget on their own are parsed and
+        returned without being cached.
+
+        Args:
+            source: Input path or raw XML bytes
+
+        Returns:
+            Parsed document for the cache's engine
+        """
+        key, input_bytes = self._key(source)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        doc = self.backend.parse(source)
+        weight = self.estimate(input_bytes)
+        if weight > self.max_bytes:
+            return doc
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (doc, weight)
+                self.size_bytes += weight
+            while self.size_bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size_bytes -= evicted
+                self.evictions += 1
+        return doc
+
+    def clear(self) -> None:
+        """Drop every document and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with size, size_bytes, max_bytes, hits, misses and evictions
+        """
+        return {
+            "size": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
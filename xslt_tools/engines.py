@@ -0,0 +1,338 @@
+"""
+XSLT engine backends.
+
+Wraps lxml (libxslt, XSLT 1.0) and saxonche (Saxon-HE, XSLT 3.0) behind one
+small compile/parse/apply interface so a mapping can be run on either engine.
+"""
+
+import os
+import re
+import codecs
+import logging
+import threading
+from typing import Any, Dict, Optional, Union
+
+from lxml import etree
+
+from .output import set_indent
+
+logger = logging.getLogger(__name__)
+
+# An input document: a filesystem path or the raw XML bytes
+Source = Union[str, os.PathLike, bytes]
+
+ENGINES = ("lxml", "saxon")
+
+_XML_DECLARATION_ENCODING = re.compile(rb"""^\s*<\?xml[^>]*?\sencoding\s*=\s*["']([A-Za-z][A-Za-z0-9._-]*)["']""")
+
+
+def _xml_encoding(data: bytes) -> str:
+    """
+    Find the character encoding of an XML document.
+
+    Args:
+        data: Raw document bytes
+
+    Returns:
+        Codec name from the byte order mark or the XML declaration, UTF-8
+        when there is neither
+    """
+    if data.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if data.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    match = _XML_DECLARATION_ENCODING.match(data[:256])
+    return match.group(1).decode("ascii") if match else "utf-8"
+
+
+class LxmlStylesheet:
+    """A stylesheet compiled with lxml.etree.XSLT."""
+
+    engine = "lxml"
+
+    def __init__(self, path: str, digest: str, xslt: etree.XSLT):
+        self.path = path
+        self.digest = digest
+        self.xslt = xslt
+
+    def apply(self, doc: Any, params: Optional[Dict[str, str]] = None) -> bytes:
+        """
+        Apply the stylesheet to an already parsed document.
+
+        Args:
+            doc: Document returned by LxmlBackend.parse
+            params: Stylesheet parameters, passed as strings
+
+        Returns:
+            Serialized result, honouring xsl:output
+        """
+        if params:
+            return bytes(self.xslt(doc, **{name: etree.XSLT.strparam(value) for name, value in params.items()}))
+        return bytes(self.xslt(doc))
+
+    def apply_buffer(self, doc: Any, params: Optional[Dict[str, str]] = None) -> memoryview:
+        """
+        Apply the stylesheet and return the serialized result without copying it.
+
+        Args:
+            doc: Document returned by LxmlBackend.parse
+            params: Stylesheet parameters, passed as strings
+
+        Returns:
+            View of libxslt's output buffer, honouring xsl:output; it keeps
+            the result tree alive until released
+        """
+        if params:
+            return memoryview(self.xslt(doc, **{name: etree.XSLT.strparam(value) for name, value in params.items()}))
+        return memoryview(self.xslt(doc))
+
+    def transform(self, source: Source, params: Optional[Dict[str, str]] = None) -> bytes:
+        """
+        Parse and transform a single input document.
+
+        Args:
+            source: Path to the input document or its raw bytes
+            params: Stylesheet parameters, passed as strings
+
+        Returns:
+            Serialized result, honouring xsl:output
+        """
+        return self.apply(LxmlBackend.parse(source), params)
+
+
+class LxmlBackend:
+    """libxslt through lxml. Fast XSLT 1.0, no XSLT 2.0/3.0 features."""
+
+    name = "lxml"
+
+    def compile(self, path: str, content: bytes, digest: str, indent: Optional[bool] = None) -> LxmlStylesheet:
+        """
+        Compile stylesheet content read from path.
+
+        Args:
+            path: Stylesheet path, used as base URL for xsl:include/xsl:import
+            content: Stylesheet bytes
+            digest: Content hash of the stylesheet
+            indent: Override xsl:output indent; None keeps the stylesheet's
+
+        Returns:
+            Compiled stylesheet
+        """
+        if indent is not None:
+            content = set_indent(content, indent)
+        root = etree.fromstring(content, base_url=path)
+        return LxmlStylesheet(path, digest, etree.XSLT(root))
+
+    @staticmethod
+    def parse(source: Source) -> Any:
+        """
+        Parse an input document.
+
+        Args:
+            source: Path to the input document or its raw bytes
+
+        Returns:
+            lxml element tree
+        """
+        if isinstance(source, bytes):
+            return etree.ElementTree(etree.fromstring(source))
+        return etree.parse(os.fspath(source))
+
+    @staticmethod
+    def parse_element(element: etree._Element) -> Any:
+        """
+        Use an lxml element as a standalone input document.
+
+        Args:
+            element: Root element of the document
+
+        Returns:
+            lxml element tree wrapping the element, no copy made
+        """
+        return etree.ElementTree(element)
+
+
+_saxon_processor = None
+_saxon_lock = threading.Lock()
+
+
+def get_saxon_processor() -> Any:
+    """
+    Get the process-wide Saxon processor.
+
+    SaxonC keeps one JVM-like runtime per process, so the processor is created
+    lazily once and shared by every Saxon stylesheet.
+
+    Returns:
+        PySaxonProcessor instance
+    """
+    global _saxon_processor
+    with _saxon_lock:
+        if _saxon_processor is None:
+            from saxonche import PySaxonProcessor
+
+            _saxon_processor = PySaxonProcessor(license=False)
+            logger.info(f"Started {_saxon_processor.version}")
+    return _saxon_processor
+
+
+def saxon_started() -> bool:
+    """
+    Check whether this process has started the Saxon runtime.
+
+    Returns:
+        True once get_saxon_processor() has been called
+    """
+    return _saxon_processor is not None
+
+
+def set_saxon_indent(executable: Any, indent: Optional[bool]) -> None:
+    """
+    Override xsl:output indent on a compiled Saxon stylesheet.
+
+    Args:
+        executable: PyXsltExecutable
+        indent: Indent the result or not; None keeps the stylesheet's
+    """
+    if indent is not None:
+        executable.set_property("!indent", "yes" if indent else "no")
+
+
+class SaxonStylesheet:
+    """A stylesheet compiled to a Saxon PyXsltExecutable."""
+
+    engine = "saxon"
+
+    def __init__(self, path: str, digest: str, executable: Any):
+        self.path = path
+        self.digest = digest
+        self.executable = executable
+
+    def apply(self, doc: Any, params: Optional[Dict[str, str]] = None) -> bytes:
+        """
+        Apply the stylesheet to an already parsed document.
+
+        Args:
+            doc: Document returned by SaxonBackend.parse
+            params: Stylesheet parameters, passed as strings
+
+        Returns:
+            Serialized result, honouring xsl:output
+        """
+        # Parameters live on the shared executable; clear them on every call
+        # so values from an earlier transform never leak into this one
+        self.executable.clear_parameters()
+        if params:
+            processor = get_saxon_processor()
+            for name, value in params.items():
+                self.executable.set_parameter(name, processor.make_string_value(value))
+        return self.executable.transform_to_string(xdm_node=doc).encode("utf-8")
+
+    def apply_buffer(self, doc: Any, params: Optional[Dict[str, str]] = None) -> bytes:
+        """
+        Apply the stylesheet; same as apply.
+
+        The result crosses from Saxon as a string, so there is no engine
+        buffer to expose.
+
+        Args:
+            doc: Document returned by SaxonBackend.parse
+            params: Stylesheet parameters, passed as strings
+
+        Returns:
+            Serialized result
+        """
+        return self.apply(doc, params)
+
+    def transform(self, source: Source, params: Optional[Dict[str, str]] = None) -> bytes:
+        """
+        Parse and transform a single input document.
+
+        Args:
+            source: Path to the input document or its raw bytes
+            params: Stylesheet parameters, passed as strings
+
+        Returns:
+            Serialized result, honouring xsl:output
+        """
+        return self.apply(SaxonBackend.parse(source), params)
+
+
+class SaxonBackend:
+    """Saxon-HE through saxonche. XSLT 3.0, runs 1.0 stylesheets in compatibility mode."""
+
+    name = "saxon"
+
+    def compile(self, path: str, content: bytes, digest: str, indent: Optional[bool] = None) -> SaxonStylesheet:
+        """
+        Compile the stylesheet at path.
+
+        Args:
+            path: Stylesheet path
+            content: Stylesheet bytes (Saxon reads the file itself so relative
+                includes resolve against its location)
+            digest: Content hash of the stylesheet
+            indent: Override xsl:output indent; None keeps the stylesheet's
+
+        Returns:
+            Compiled stylesheet
+        """
+        xslt_processor = get_saxon_processor().new_xslt30_processor()
+        executable = xslt_processor.compile_stylesheet(stylesheet_file=path)
+        set_saxon_indent(executable, indent)
+        return SaxonStylesheet(path, digest, executable)
+
+    @staticmethod
+    def parse(source: Source) -> Any:
+        """
+        Parse an input document.
+
+        Args:
+            source: Path to the input document or its raw bytes
+
+        Returns:
+            PyXdmNode for the document
+        """
+        processor = get_saxon_processor()
+        if isinstance(source, bytes):
+            # Saxon parses text, so the bytes are decoded as the document declares
+            return processor.parse_xml(xml_text=source.decode(_xml_encoding(source)))
+        return processor.parse_xml(xml_file_name=os.fspath(source))
+
+    @classmethod
+    def parse_element(cls, element: etree._Element) -> Any:
+        """
+        Use an lxml element as a standalone input document.
+
+        Args:
+            element: Root element of the document
+
+        Returns:
+            PyXdmNode built from the serialized element
+        """
+        return cls.parse(etree.tostring(element, encoding="utf-8"))
+
+
+_BACKENDS: Dict[str, Any] = {
+    "lxml": LxmlBackend(),
+    "saxon": SaxonBackend(),
+}
+
+
+def get_backend(engine: str) -> Any:
+    """
+    Get the backend for an engine name.
+
+    Args:
+        engine: One of ENGINES
+
+    Returns:
+        Backend instance
+
+    Raises:
+        ValueError: If the engine is unknown
+    """
+    try:
+        return _BACKENDS[engine]
+    except KeyError:
+        raise ValueError(f"Unknown XSLT engine '{engine}'. Choose from: {', '.join(ENGINES)}")
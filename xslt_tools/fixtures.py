@@ -0,0 +1,478 @@
+"""
+Source document fixtures generated from an INITIAL.md requirement table.
+
+Reads the "Source XPath", "Source Cardinality" and "Special Rules" fields of
+every requirement and derives the shape of the source document from them:
+
+- every absolute source path, and every absolute path quoted in a rule,
+  becomes an element;
+- {n..*} cardinalities make the enclosing segment repeat (E1EDL37, E1EDL44);
+- field names a rule mentions relative to the requirement's context
+  ("the context element BTVOL") become children of that context segment;
+  when the source path already ends at a field, the rule is about that
+  field and names no new ones (so a typo such as VEMNG22 is ignored);
+- a segment a rule selects by a qualifier (E1ADRM1 "where the partner
+  qualifier is 'LF'", E1ADRM1[PARTNER_Q = 'LF']) repeats and gets the
+  qualifier field (PARTNER_Q, or QUALF when the prose names no kind) with
+  that value;
+- rules hint at the field values: rounding makes a field decimal, "remove
+  leading zeroes" pads it, conversion tables ('BG' -> 'BAG') and comparisons
+  (MAGRV = 'Z001') give it a value domain, "exists"/"is not empty" make it
+  optional.
+
+Documents are written as a stream of text chunks, so a batch of any size goes
+straight to disk.
+
+Usage:
+    python -m xslt_tools fixtures INITIAL.md batch.xml --documents 1000 --fanout E1EDL37=5 --fanout E1EDL44=1-20 --seed 7
+"""
+
+import re
+import random
+import argparse
+import logging
+from collections import OrderedDict
+from xml.sax.saxutils import escape, quoteattr
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Repeat count for a segment: fixed, or an inclusive (low, high) range
+Fanout = Union[int, Tuple[int, int]]
+
+REQUIREMENT_FIELDS = ("Source XPath", "Source Cardinality", "Target XPath", "Target Cardinality", "Special Rules")
+
+_REQUIREMENT_HEADING = re.compile(r"^##\s+Requirement\s+(\d+)\s*$")
+_FIELD_LINE = re.compile(rf"^({'|'.join(REQUIREMENT_FIELDS)}):\s*(.*)$")
+_CARDINALITY = re.compile(r"\{\s*(\d+)\s*\.\.\s*(\d+|\*)\s*\}")
+_ABSOLUTE_PATH = re.compile(r"(?<![\w)\]])/[A-Za-z_][\w-]*(?:/(?:text\(\)|@[\w-]+|[A-Za-z_][\w-]*))*")
+_QUOTED = re.compile(r"'[^']*'|\"[^\"]*\"")
+_FIELD_TOKEN = re.compile(r"\b[A-Z][A-Z0-9_]{2,}\b")
+_SEGMENT_NAME = re.compile(r"^(?:[EZ][12][A-Z0-9_]+|IDOC|EDI_DC40)$")
+_CONVERSION = re.compile(r"'([^']*)'\s*->")
+_COMPARISON = re.compile(r"\b([A-Z][A-Z0-9_]{2,})\b(?:\s+in the context)?\s*=\s*'([^']*)'")
+_QUALIFIER = re.compile(r"\b(?:(?!(?:the|a|an)\s)([a-z]+)\s+)?qualifier\s+(?:is\s+|=\s*)'([^']*)'", re.IGNORECASE)
+
+
+@dataclass
+class Requirement:
+    """One "## Requirement N" block of INITIAL.md."""
+    number: int
+    source_xpath: str = ""
+    source_cardinality: str = ""
+    target_xpath: str = ""
+    target_cardinality: str = ""
+    special_rules: str = ""
+
+
+@dataclass
+class SourceNode:
+    """An element of the source document."""
+    name: str
+    repeats: bool = False
+    optional: bool = False
+    may_be_empty: bool = False
+    kind: str = "text"
+    values: List[str] = field(default_factory=list)
+    children: "OrderedDict[str, SourceNode]" = field(default_factory=OrderedDict)
+
+    @property
+    def is_segment(self) -> bool:
+        """True for elements holding other elements rather than a value."""
+        return bool(self.children) or bool(_SEGMENT_NAME.match(self.name))
+
+    def child(self, name: str) -> "SourceNode":
+        """Get the named child, creating it if needed."""
+        if name not in self.children:
+            self.children[name] = SourceNode(name)
+        return self.children[name]
+
+    def find(self, name: str) -> Optional["SourceNode"]:
+        """Find the first element with this name, breadth first."""
+        queue = [self]
+        while queue:
+            node = queue.pop(0)
+            if node.name == name:
+                return node
+            queue.extend(node.children.values())
+        return None
+
+    def add_path(self, path: str) -> List["SourceNode"]:
+        """
+        Add an absolute path below this root.
+
+        Args:
+            path: Path such as /DELVRY07/IDOC/E1EDL20/VBELN/text()
+
+        Returns:
+            Nodes along the path, root first
+
+        Raises:
+            ValueError: If the path starts at a different root element
+        """
+        steps = split_path(path)
+        if steps[0] != self.name:
+            raise ValueError(f"Path {path} does not start at the root element {self.name}")
+        nodes = [self]
+        for step in steps[1:]:
+            nodes.append(nodes[-1].child(step))
+        return nodes
+
+
+def split_path(path: str) -> List[str]:
+    """
+    Split an absolute source path into element names.
+
+    Attribute and text() steps are dropped, since only elements are generated.
+
+    Args:
+        path: Path such as /DELVRY07/IDOC/EDI_DC40/DOCNUM/text()
+
+    Returns:
+        Element names, root first
+    """
+    return [step for step in path.strip().strip("/").split("/") if step and step != "text()" and not step.startswith("@")]
+
+
+def parse_cardinality(text: str) -> Tuple[int, Optional[int]]:
+    """
+    Parse a cardinality such as {1..1} or {0..*}.
+
+    Args:
+        text: Cardinality text; empty means {1..1}
+
+    Returns:
+        (minimum, maximum) occurrences, maximum None when unbounded
+    """
+    match = _CARDINALITY.search(text or "")
+    if not match:
+        return 1, 1
+    upper = match.group(2)
+    return int(match.group(1)), None if upper == "*" else int(upper)
+
+
+def parse_requirements(path: str) -> List[Requirement]:
+    """
+    Read the requirement blocks of an INITIAL.md file.
+
+    Args:
+        path: Path to INITIAL.md
+
+    Returns:
+        Requirements in file order
+    """
+    requirements = []
+    current: Optional[Requirement] = None
+    last_field = None
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            heading = _REQUIREMENT_HEADING.match(line)
+            if heading:
+                current = Requirement(int(heading.group(1)))
+                requirements.append(current)
+                last_field = None
+                continue
+            if line.startswith("## "):
+                current = None
+                continue
+            if current is None:
+                continue
+
+            match = _FIELD_LINE.match(line)
+            if match:
+                last_field = match.group(1).lower().replace(" ", "_")
+                setattr(current, last_field, match.group(2).strip())
+            elif last_field == "special_rules" and line.strip():
+                # Rules may run over several lines, e.g. conversion tables
+                current.special_rules += "\n" + line.strip()
+
+    logger.info(f"Read {len(requirements)} requirements from {path}")
+    return requirements
+
+
+def _apply_rule_hints(node: SourceNode, rules: str) -> None:
+    """Set the value kind and optionality of a field from the wording of a rule."""
+    lowered = rules.lower()
+    if "round" in lowered or "format-number" in lowered or "decimal" in lowered:
+        node.kind = "decimal"
+    if "leading zero" in lowered:
+        node.kind = "padded"
+    if re.search(r"\bexists?\b|boolean\(", lowered):
+        node.optional = True
+    if "not empty" in lowered or "something in" in lowered:
+        node.may_be_empty = True
+
+
+def build_schema(requirements: List[Requirement]) -> SourceNode:
+    """
+    Derive the source document structure from a requirement table.
+
+    Args:
+        requirements: Requirements from parse_requirements
+
+    Returns:
+        Root SourceNode
+
+    Raises:
+        ValueError: If no requirement names an absolute source path, or the
+            paths disagree on the root element
+    """
+    def rule_paths(requirement: Requirement) -> List[str]:
+        return _ABSOLUTE_PATH.findall(requirement.special_rules)
+
+    sources = [r.source_xpath for r in requirements if r.source_xpath.startswith("/")]
+    paths = sources + [p for r in requirements for p in rule_paths(r)]
+    if not paths:
+        raise ValueError("No requirement has an absolute Source XPath")
+    root = SourceNode(split_path(paths[0])[0])
+
+    # First pass: the elements, so segments can be told apart from fields
+    for path in paths:
+        root.add_path(path)
+
+    for requirement in requirements:
+        context: Optional[SourceNode] = None
+        subjects: List[SourceNode] = []
+        # A rule about a single field names no further fields of its segment
+        field_rule = False
+
+        if requirement.source_xpath.startswith("/"):
+            nodes = root.add_path(requirement.source_xpath)
+            target = nodes[-1]
+            if not target.is_segment:
+                subjects.append(target)
+                context = nodes[-2]
+                field_rule = True
+            else:
+                context = target
+
+            # {n..*}: the innermost segment on the path repeats
+            _, upper = parse_cardinality(requirement.source_cardinality)
+            if upper is None or upper > 1:
+                context.repeats = True
+
+        for path in rule_paths(requirement):
+            subjects.append(root.add_path(path)[-1])
+
+        # Field and segment names the rule mentions relative to the context
+        text = _ABSOLUTE_PATH.sub(" ", _QUOTED.sub(" ", requirement.special_rules))
+        parent = context
+        for token in _FIELD_TOKEN.findall(text):
+            existing = root.find(token)
+            if _SEGMENT_NAME.match(token):
+                if existing is None and parent is not None:
+                    existing = parent.child(token)
+                parent = existing or parent
+            elif parent is not None:
+                if token in parent.children:
+                    subjects.append(parent.children[token])
+                elif not (field_rule and parent is context):
+                    subjects.append(parent.child(token))
+
+        subjects = list(OrderedDict((id(node), node) for node in subjects).values())
+        for subject in subjects:
+            _apply_rule_hints(subject, requirement.special_rules)
+
+        # Value domains: conversion tables and comparisons against literals
+        conversions = _CONVERSION.findall(requirement.special_rules)
+        if conversions and len(subjects) == 1:
+            subjects[0].values.extend(v for v in conversions if v not in subjects[0].values)
+        comparisons = _COMPARISON.findall(requirement.special_rules)
+        comparisons += [
+            (f"{kind.upper()}_Q" if kind else "QUALF", value)
+            for kind, value in _QUALIFIER.findall(requirement.special_rules)
+        ]
+        for name, value in comparisons:
+            node = parent.children.get(name) if parent is not None else None
+            if node is None and context is not None:
+                node = context.children.get(name)
+            if node is None and parent is not None and parent is not context:
+                node = parent.child(name)
+            node = node or root.find(name)
+            if node is None:
+                continue
+            if value not in node.values:
+                node.values.append(value)
+            # A segment looked up by a qualifier occurs once per qualifier value
+            if parent is not None and parent is not context and node in parent.children.values():
+                parent.repeats = True
+
+    return root
+
+
+def _field_value(node: SourceNode, rng: random.Random) -> str:
+    """A plausible value for a field, following its hints and SAP naming."""
+    if node.may_be_empty and rng.random() < 0.3:
+        return ""
+    if node.values and rng.random() < 0.8:
+        return rng.choice(node.values)
+
+    name = node.name
+    if node.kind == "decimal":
+        return f"{rng.uniform(0.1, 1000):.3f}"
+    if node.kind == "padded":
+        return f"{rng.randrange(10 ** 9):016d}"
+    if name.endswith(("DAT", "DATUM")):
+        return f"20{rng.randrange(20, 30)}{rng.randrange(1, 13):02d}{rng.randrange(1, 29):02d}"
+    if name.endswith(("TIM", "UZEIT")):
+        return f"{rng.randrange(24):02d}{rng.randrange(60):02d}{rng.randrange(60):02d}"
+    if name.endswith(("NR", "NUM", "ID", "NO", "LN")):
+        return str(rng.randrange(10 ** 7, 10 ** 8))
+    if node.values:
+        return f"{node.values[0][:1] or 'X'}{rng.randrange(100):02d}"
+    return f"{name[:2]}{rng.randrange(10 ** 6):06d}"
+
+
+def _repeat_count(node: SourceNode, fanout: Dict[str, Fanout], default_fanout: Fanout, rng: random.Random) -> int:
+    count = fanout.get(node.name, default_fanout if node.repeats else 1)
+    if isinstance(count, tuple):
+        return rng.randint(*count)
+    return count
+
+
+def _iter_element(
+    node: SourceNode,
+    rng: random.Random,
+    fanout: Dict[str, Fanout],
+    default_fanout: Fanout
+) -> Iterator[str]:
+    """Yield every occurrence of node as XML text chunks."""
+    count = _repeat_count(node, fanout, default_fanout, rng)
+    for _ in range(count):
+        if node.optional and rng.random() < 0.3:
+            continue
+        if not node.is_segment:
+            yield f"<{node.name}>{escape(_field_value(node, rng))}</{node.name}>"
+            continue
+
+        yield f"<{node.name} SEGMENT={quoteattr('1')}>" if _SEGMENT_NAME.match(node.name) and node.name != "IDOC" else f"<{node.name}>"
+        # IDoc layout: a segment's fields come before its child segments
+        children = sorted(node.children.values(), key=lambda child: child.is_segment)
+        for child in children:
+            yield from _iter_element(child, rng, fanout, default_fanout)
+        yield f"</{node.name}>"
+
+
+def iter_source(
+    schema: SourceNode,
+    documents: int = 1,
+    fanout: Optional[Dict[str, Fanout]] = None,
+    default_fanout: Fanout = 1,
+    seed: int = 0
+) -> Iterator[str]:
+    """
+    Stream a source document as XML text chunks.
+
+    Args:
+        schema: Root node from build_schema
+        documents: Occurrences of the element directly under the root
+            (IDOC), i.e. the number of documents in the batch
+        fanout: Repeat count per element name, fixed or a (low, high) range
+        default_fanout: Repeat count for repeating segments not in fanout
+        seed: Random seed; the same seed gives the same output
+
+    Yields:
+        XML text chunks
+    """
+    rng = random.Random(seed)
+    fanout = dict(fanout or {})
+    for child in schema.children.values():
+        fanout.setdefault(child.name, documents)
+
+    yield "<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n"
+    yield from _iter_element(schema, rng, fanout, default_fanout)
+    yield "\n"
+
+
+def write_source(path: str, schema: SourceNode, **options) -> int:
+    """
+    Stream a source document to disk.
+
+    Args:
+        path: Output file
+        schema: Root node from build_schema
+        **options: Passed on to iter_source
+
+    Returns:
+        Number of characters written
+    """
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for chunk in iter_source(schema, **options):
+            written += f.write(chunk)
+    return written
+
+
+def parse_fanout(text: str) -> Tuple[str, Fanout]:
+    """
+    Parse a NAME=N or NAME=LOW-HIGH fan-out option.
+
+    Args:
+        text: Option value, e.g. E1EDL44=1-20
+
+    Returns:
+        (element name, repeat count)
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is malformed
+    """
+    match = re.fullmatch(r"([\w-]+)=(\d+)(?:-(\d+))?", text)
+    if not match:
+        raise argparse.ArgumentTypeError(f"Expected NAME=N or NAME=LOW-HIGH, got '{text}'")
+    name, low, high = match.groups()
+    return name, (int(low), int(high)) if high else int(low)
+
+
+def print_schema(node: SourceNode, depth: int = 0) -> None:
+    """Print the derived structure as an indented tree."""
+    flags = [flag for flag, on in (("repeats", node.repeats), ("optional", node.optional),
+                                   ("may be empty", node.may_be_empty)) if on]
+    details = ", ".join(flags + ([node.kind] if not node.is_segment else []) + ([f"values: {'/'.join(node.values)}"] if node.values else []))
+    print(f"{'  ' * depth}{node.name}" + (f" ({details})" if details else ""))
+    for child in node.children.values():
+        print_schema(child, depth + 1)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function for fixture generation."""
+    parser = argparse.ArgumentParser(
+        prog="python -m xslt_tools fixtures",
+        description="Generate source documents from the requirement table in INITIAL.md"
+    )
+    parser.add_argument("spec", help="INITIAL.md with '## Requirement N' blocks")
+    parser.add_argument("output", nargs="?", help="File to write the generated document to")
+    parser.add_argument("--documents", type=int, default=1, help="IDOCs in the batch (default: 1)")
+    parser.add_argument("--fanout", type=parse_fanout, action="append", default=[],
+                        help="Repeat count for a segment, NAME=N or NAME=LOW-HIGH (repeatable)")
+    parser.add_argument("--default-fanout", type=int, default=1,
+                        help="Repeat count for other repeating segments (default: 1)")
+    parser.add_argument("--field", action="append", default=[],
+                        help="Extra element the spec does not name, PATH or PATH=value1,value2 (repeatable)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--show-schema", action="store_true", help="Print the derived structure")
+    args = parser.parse_args(argv)
+
+    schema = build_schema(parse_requirements(args.spec))
+    for extra in args.field:
+        path, _, values = extra.partition("=")
+        node = schema.add_path(path)[-1]
+        node.values.extend(v for v in values.split(",") if v)
+
+    if args.show_schema or not args.output:
+        print_schema(schema)
+    if not args.output:
+        return 0
+
+    written = write_source(
+        args.output,
+        schema,
+        documents=args.documents,
+        fanout=dict(args.fanout),
+        default_fanout=args.default_fanout,
+        seed=args.seed
+    )
+    print(f"✅ Wrote {args.documents} document(s), {written:,} characters, to {args.output}")
+    return 0
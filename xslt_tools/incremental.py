@@ -0,0 +1,309 @@
+"""
+Incremental re-transform of a fixture corpus after stylesheet edits.
+
+Every fixture run records which templates produced its output (libxslt's
+template profile) and a hash of each template. After an edit only the
+fixtures whose output came from a changed template are transformed again;
+the others reuse the stored output.
+
+A template is identified by its match, name, mode and priority, which decide
+when it runs. Adding, removing or re-targeting a template can change which
+template fires anywhere, so it re-runs every fixture, as does any change
+outside the templates (variables, keys, xsl:output, included files) or to
+the stylesheet parameters. SAP ABAP external function calls are stubbed out,
+as in the benchmarks, so every example mapping runs on lxml.
+
+Usage:
+    python -m xslt_tools incremental <stylesheet> <input>... [--output-dir out] [--state-dir .xslt-incremental] [--full]
+
+Example:
+    python -m xslt_tools incremental examples/Ex5_Mapping.xsl fixtures/ --output-dir out/
+"""
+
+import os
+import json
+import time
+import argparse
+import hashlib
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from lxml import etree
+
+from .analyze import XSL_NS
+from .cache import content_digest
+from .runner import iter_inputs, output_name, parse_param
+from .sap import stub_external_functions
+
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 1
+
+# Template attributes that decide when a template runs
+_IDENTITY = ("match", "name", "mode", "priority")
+
+
+@dataclass
+class StylesheetFingerprint:
+    """Hashes of the parts of a stylesheet a fixture's output can depend on."""
+    templates: Dict[str, str]
+    globals: str
+    # Template key -> key of its entries in libxslt's profile (no priority there)
+    profile_keys: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_file(cls, path: str, params: Optional[Dict[str, str]] = None) -> "StylesheetFingerprint":
+        """
+        Fingerprint a stylesheet.
+
+        Args:
+            path: Stylesheet path
+            params: Stylesheet parameters, part of the global hash
+
+        Returns:
+            StylesheetFingerprint with one hash per template
+        """
+        root = etree.parse(path).getroot()
+        templates: Dict[str, str] = {}
+        profile_keys: Dict[str, str] = {}
+        other = hashlib.sha256(json.dumps(sorted((params or {}).items())).encode("utf-8"))
+
+        for child in root.iterchildren():
+            if child.tag == f"{{{XSL_NS}}}template":
+                key = template_id(child.get("match"), child.get("name"), child.get("mode"), child.get("priority"))
+                # Templates sharing an identity are told apart by position
+                key = key if key not in templates else f"{key}#{child.sourceline}"
+                templates[key] = content_digest(etree.tostring(child, method="c14n"))
+                profile_keys[key] = template_id(child.get("match"), child.get("name"), child.get("mode"))
+                continue
+            other.update(etree.tostring(child, method="c14n") if isinstance(child.tag, str) else b"")
+            if child.tag in (f"{{{XSL_NS}}}include", f"{{{XSL_NS}}}import"):
+                included = os.path.join(os.path.dirname(path), child.get("href", ""))
+                with open(included, "rb") as f:
+                    other.update(f.read())
+        other.update(etree.tostring(etree.Element("attributes", dict(root.attrib)), method="c14n"))
+        return cls(templates, other.hexdigest(), profile_keys)
+
+
+def template_id(match: Optional[str], name: Optional[str], mode: Optional[str], priority: Optional[str] = None) -> str:
+    """
+    Identity of a template, stable across edits of its body.
+
+    Args:
+        match: Match pattern
+        name: Template name
+        mode: Mode
+        priority: Explicit priority
+
+    Returns:
+        String key
+    """
+    values = (match or "", name or "", mode or "", priority or "")
+    return "|".join(f"{attribute}={value}" for attribute, value in zip(_IDENTITY, values) if value)
+
+
+@dataclass
+class FixtureState:
+    """What a fixture's stored output was produced from."""
+    input_digest: str
+    templates: List[str]
+    output: str
+
+
+@dataclass
+class IncrementalReport:
+    """Outcome of an incremental run."""
+    stylesheet: str
+    reran: List[str] = field(default_factory=list)
+    reused: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    changed_templates: List[str] = field(default_factory=list)
+    full_reason: Optional[str] = None
+    elapsed_seconds: float = 0.0
+
+
+class IncrementalRunner:
+    """Transforms a corpus, re-running only fixtures affected by stylesheet edits."""
+
+    def __init__(self, stylesheet: str, state_dir: str = ".xslt-incremental", params: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            stylesheet: Stylesheet path
+            state_dir: Directory for the dependency state and stored outputs
+            params: Stylesheet parameters
+        """
+        self.stylesheet = stylesheet
+        self.params = params or {}
+        stem = os.path.splitext(os.path.basename(stylesheet))[0]
+        location = hashlib.sha256(os.path.realpath(stylesheet).encode("utf-8")).hexdigest()[:8]
+        self.state_dir = os.path.join(state_dir, f"{stem}-{location}")
+        self.state_path = os.path.join(self.state_dir, "state.json")
+
+    def load_state(self) -> Tuple[Optional[StylesheetFingerprint], Dict[str, FixtureState]]:
+        """
+        Read the state of the previous run.
+
+        Returns:
+            (stylesheet fingerprint, fixture states by input path); no
+            fingerprint and no fixtures when there is no usable state
+        """
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None, {}
+        if data.get("version") != STATE_VERSION:
+            return None, {}
+        fingerprint = StylesheetFingerprint(**data["fingerprint"])
+        fixtures = {path: FixtureState(**state) for path, state in data["fixtures"].items()}
+        return fingerprint, fixtures
+
+    def save_state(self, fingerprint: StylesheetFingerprint, fixtures: Dict[str, FixtureState]) -> None:
+        """Write the dependency state atomically."""
+        os.makedirs(self.state_dir, exist_ok=True)
+        data = {
+            "version": STATE_VERSION,
+            "fingerprint": {"templates": fingerprint.templates, "globals": fingerprint.globals},
+            "fixtures": {path: state.__dict__ for path, state in fixtures.items()},
+        }
+        partial = f"{self.state_path}.tmp"
+        with open(partial, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+        os.replace(partial, self.state_path)
+
+    def _compile(self) -> etree.XSLT:
+        with open(self.stylesheet, "rb") as f:
+            content = stub_external_functions(f.read())
+        return etree.XSLT(etree.fromstring(content, base_url=self.stylesheet))
+
+    def _changes(
+        self,
+        previous: Optional[StylesheetFingerprint],
+        current: StylesheetFingerprint
+    ) -> Tuple[Optional[str], Set[str]]:
+        """Reason every fixture must re-run, if any, and the templates whose body changed."""
+        if previous is None:
+            return "no previous run", set()
+        if previous.globals != current.globals:
+            return "declarations outside templates or parameters changed", set()
+        if previous.templates.keys() != current.templates.keys():
+            return "templates were added, removed or re-targeted", set()
+        return None, {key for key, digest in current.templates.items() if previous.templates[key] != digest}
+
+    def run(self, inputs: List[str], output_dir: Optional[str] = None, full: bool = False) -> IncrementalReport:
+        """
+        Transform the inputs, reusing stored outputs where the edit cannot affect them.
+
+        Args:
+            inputs: Input document paths
+            output_dir: Directory to write every output to
+            full: Re-run every fixture regardless of the state
+
+        Returns:
+            IncrementalReport listing re-run and reused fixtures
+        """
+        start = time.perf_counter()
+        report = IncrementalReport(self.stylesheet)
+        current = StylesheetFingerprint.from_file(self.stylesheet, self.params)
+        previous, fixtures = self.load_state()
+        report.full_reason, changed = self._changes(previous, current)
+        if full:
+            report.full_reason = "--full"
+        report.changed_templates = sorted(changed)
+
+        by_profile: Dict[str, List[str]] = {}
+        for key, profile_key in current.profile_keys.items():
+            by_profile.setdefault(profile_key, []).append(key)
+
+        outputs_dir = os.path.join(self.state_dir, "outputs")
+        os.makedirs(outputs_dir, exist_ok=True)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        xslt = None
+        total_calls: Counter = Counter()
+        params = {name: etree.XSLT.strparam(value) for name, value in self.params.items()}
+        for index, path in enumerate(inputs):
+            with open(path, "rb") as f:
+                document = f.read()
+            input_digest = content_digest(document)
+            state = fixtures.get(path)
+
+            if (
+                report.full_reason is None
+                and state is not None
+                and state.input_digest == input_digest
+                and not changed.intersection(state.templates)
+                and os.path.exists(state.output)
+            ):
+                with open(state.output, "rb") as f:
+                    output = f.read()
+                report.reused.append(path)
+            else:
+                xslt = xslt or self._compile()
+                try:
+                    result = xslt(etree.ElementTree(etree.fromstring(document)), profile_run=True, **params)
+                except Exception as e:
+                    report.failed[path] = str(e)
+                    fixtures.pop(path, None)
+                    continue
+                output = bytes(result)
+                # Call counts add up over every run of the compiled stylesheet
+                calls: Counter = Counter()
+                for entry in result.xslt_profile.getroot():
+                    calls[template_id(entry.get("match"), entry.get("name"), entry.get("mode"))] += int(entry.get("calls", "0"))
+                used = set()
+                for profile_key in calls - total_calls:
+                    used.update(by_profile.get(profile_key, [profile_key]))
+                total_calls = calls
+
+                stored = os.path.join(outputs_dir, f"{content_digest(os.path.realpath(path).encode('utf-8'))[:16]}.xml")
+                with open(stored, "wb") as f:
+                    f.write(output)
+                fixtures[path] = FixtureState(input_digest, sorted(used), stored)
+                report.reran.append(path)
+
+            if output_dir:
+                with open(os.path.join(output_dir, output_name(path, index)), "wb") as f:
+                    f.write(output)
+
+        self.save_state(current, fixtures)
+        report.elapsed_seconds = time.perf_counter() - start
+        logger.info(f"{self.stylesheet}: re-ran {len(report.reran)}, reused {len(report.reused)}")
+        return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function for incremental re-transforms."""
+    parser = argparse.ArgumentParser(
+        prog="python -m xslt_tools incremental",
+        description="Re-transform only the fixtures whose output depends on edited templates"
+    )
+    parser.add_argument("stylesheet", help="Path to the XSLT mapping")
+    parser.add_argument("inputs", nargs="+", help="Input documents or directories of *.xml files")
+    parser.add_argument("--output-dir", help="Write every output to this directory")
+    parser.add_argument("--state-dir", default=".xslt-incremental",
+                        help="Dependency state and stored outputs (default: .xslt-incremental)")
+    parser.add_argument("--param", type=parse_param, action="append", default=[],
+                        help="Stylesheet parameter NAME=VALUE (repeatable)")
+    parser.add_argument("--full", action="store_true", help="Re-run every fixture and rebuild the state")
+    args = parser.parse_args(argv)
+
+    runner = IncrementalRunner(args.stylesheet, args.state_dir, dict(args.param))
+    report = runner.run(list(iter_inputs(args.inputs)), args.output_dir, args.full)
+
+    if report.full_reason:
+        print(f"🔁 Full run: {report.full_reason}")
+    elif report.changed_templates:
+        print("✏️  Changed templates:")
+        for key in report.changed_templates:
+            print(f"   {key}")
+    for path, error in report.failed.items():
+        print(f"❌ {path}: {error}")
+    print(
+        f"✅ Re-ran {len(report.reran)}, reused {len(report.reused)} of "
+        f"{len(report.reran) + len(report.reused) + len(report.failed)} fixtures in {report.elapsed_seconds:.3f}s"
+    )
+    return 1 if report.failed else 0
@@ -0,0 +1,360 @@
+"""
+Rewrite qualifier lookups to xsl:key.
+
+SAP mappings look up partner and qualifier segments with equality
+predicates, e.g. E1EDKA1[PARVW='RE']/NAME1 or
+ancestor::E1EDL20[1]/E1ADRM1[PARTNER_Q = 'LF']/PARTNER_ID. Every evaluation
+scans all children of the parent segment, which on large IDocs holds
+thousands of item segments.
+
+Each such lookup is replaced with a key() call on a key indexing the segment
+by its parent and field value:
+
+    <xsl:key name="E1EDKA1-by-PARVW" match="E1EDKA1" use="concat(generate-id(..), '|', PARVW)"/>
+    key('E1EDKA1-by-PARVW', concat(generate-id(), '|', 'RE'))/NAME1
+
+Only lookups whose parent is a single node are rewritten: the context node,
+.., parent::X, ancestor::X[1], or the root element. The rewritten stylesheet is
+then run against a corpus of inputs next to the original; a rewrite is kept
+only if the output stays byte-identical.
+
+Usage:
+    python -m xslt_tools keys examples/Ex4_Mapping.xsl -o Ex4_Mapping.keys.xsl [--corpus idocs/] [--param name=value]
+"""
+
+import os
+import re
+import argparse
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from lxml import etree
+
+from .analyze import XSL_NS, Step, path_spans
+from .runner import iter_inputs, parse_param
+from .sap import stub_external_functions
+from .synthetic import MAPPING_INPUTS, generate
+
+logger = logging.getLogger(__name__)
+
+_EQUALITY = re.compile(r"""^\s*(?:(@?[A-Za-z_][\w.-]*)\s*=\s*('[^']+'|"[^"]+")|('[^']+'|"[^"]+")\s*=\s*(@?[A-Za-z_][\w.-]*))\s*$""")
+
+# Synthetic corpus used when none is given: (line items, seed)
+DEFAULT_CORPUS_SIZES = ((1, 0), (3, 1), (25, 2), (25, 3))
+
+
+@dataclass
+class KeyLookup:
+    """One predicate lookup that can be served by a key."""
+    line: int
+    original: str
+    replacement: str
+    key_name: str
+    match: str
+    use: str
+
+
+@dataclass
+class KeyRewriteResult:
+    """Outcome of rewriting a stylesheet."""
+    content: bytes
+    applied: List[KeyLookup] = field(default_factory=list)
+    rejected: List[KeyLookup] = field(default_factory=list)
+    documents: int = 0
+
+
+def _equality(predicate: str) -> Optional[Tuple[str, str]]:
+    """Split a FIELD = 'literal' predicate into (field, literal)."""
+    match = _EQUALITY.match(predicate)
+    if not match:
+        return None
+    if match.group(1):
+        return match.group(1), match.group(2)
+    return match.group(4), match.group(3)
+
+
+def _single_parent(steps: List[Step]) -> bool:
+    """Whether steps, as the start of a relative path, always select at most one node."""
+    for step in steps:
+        if step.axis in ("parent", "self") and not step.predicates:
+            continue
+        if step.axis in ("ancestor", "ancestor-or-self") and step.predicates == ["1"]:
+            continue
+        return False
+    return True
+
+
+def _key_name(qname: str, key_field: str) -> str:
+    return f"{qname.replace(':', '-')}-by-{key_field.replace('@', 'at-')}"
+
+
+def _lookups(expression: str, line: int, prefixes: Set[str]) -> List[Tuple[int, int, KeyLookup]]:
+    """Find the eligible lookups of one XPath expression, with their offsets."""
+    found = []
+    for start, end, absolute, steps in path_spans(expression):
+        for index, step in enumerate(steps):
+            if step.axis != "child" or step.name == "*" or not step.predicates:
+                continue
+            prefix = step.qname.rpartition(":")[0]
+            if prefix and prefix not in prefixes:
+                break
+            keyed = _equality(step.predicates[0])
+            if keyed is None:
+                continue
+
+            before = steps[:index]
+            if absolute:
+                # Only the root element is known to be a single node
+                if len(before) != 1 or before[0].axis != "child" or before[0].predicates:
+                    break
+            elif not _single_parent(before):
+                break
+            parent = f"generate-id({expression[start:before[-1].end]})" if before else "generate-id()"
+
+            key_field, literal = keyed
+            name = _key_name(step.qname, key_field)
+            filters = "".join(f"[{p}]" for p in step.predicates[1:])
+            found.append((start, end, KeyLookup(
+                line=line,
+                original=expression[start:end],
+                replacement=f"key('{name}', concat({parent}, '|', {literal})){filters}{expression[step.end:end]}",
+                key_name=name,
+                match=step.qname,
+                use=f"concat(generate-id(..), '|', {key_field})"
+            )))
+            break
+    return found
+
+
+def find_lookups(content: bytes) -> List[KeyLookup]:
+    """
+    List the lookups a stylesheet has that can be served by a key.
+
+    Args:
+        content: Stylesheet bytes
+
+    Returns:
+        Lookups in document order
+    """
+    return rewrite(content)[1]
+
+
+def rewrite(content: bytes, skip: Optional[Set[int]] = None) -> Tuple[bytes, List[KeyLookup]]:
+    """
+    Rewrite the lookups of a stylesheet to key() calls.
+
+    Args:
+        content: Stylesheet bytes
+        skip: Positions (in find_lookups order) of lookups to leave alone
+
+    Returns:
+        (rewritten stylesheet bytes, lookups that were rewritten)
+    """
+    skip = skip or set()
+    root = etree.fromstring(content)
+    prefixes = {prefix for prefix in root.nsmap if prefix}
+    applied: List[KeyLookup] = []
+    counter = 0
+
+    for element in root.iter(etree.Element):
+        if not element.tag.startswith(f"{{{XSL_NS}}}") or element.tag == f"{{{XSL_NS}}}key":
+            continue
+        for attribute in ("select", "test"):
+            expression = element.get(attribute)
+            if expression is None:
+                continue
+
+            parts = []
+            position = 0
+            for start, end, lookup in _lookups(expression, element.sourceline, prefixes):
+                if counter not in skip:
+                    parts.extend((expression[position:start], lookup.replacement))
+                    position = end
+                    applied.append(lookup)
+                counter += 1
+            if parts:
+                element.set(attribute, "".join(parts) + expression[position:])
+
+    if not applied:
+        return content, applied
+
+    keys: Dict[str, KeyLookup] = {}
+    for lookup in applied:
+        keys.setdefault(lookup.key_name, lookup)
+
+    # Declarations go before the first template, indented like it
+    anchor = root.find(f"{{{XSL_NS}}}template")
+    indent = "\n\t"
+    previous = anchor.getprevious() if anchor is not None else None
+    if previous is not None and previous.tail and previous.tail.strip() == "":
+        indent = "\n" + previous.tail.rsplit("\n", 1)[-1]
+    for lookup in keys.values():
+        key = etree.Element(f"{{{XSL_NS}}}key", name=lookup.key_name, match=lookup.match, use=lookup.use)
+        key.tail = indent
+        if anchor is not None:
+            anchor.addprevious(key)
+        else:
+            root.append(key)
+
+    output = etree.tostring(
+        root.getroottree(), encoding="utf-8", xml_declaration=content.lstrip().startswith(b"<?xml")
+    ) + b"\n"
+    logger.info(f"Rewrote {len(applied)} lookups with {len(keys)} keys")
+    return output, applied
+
+
+def _compile(content: bytes, base_url: str) -> etree.XSLT:
+    """Compile stylesheet bytes with lxml, stubbing SAP external functions."""
+    return etree.XSLT(etree.fromstring(stub_external_functions(content), base_url=base_url))
+
+
+def verify(
+    original: bytes,
+    rewritten: bytes,
+    corpus: List[bytes],
+    params: Optional[Dict[str, str]] = None,
+    base_url: Optional[str] = None
+) -> List[int]:
+    """
+    Run both stylesheets on every corpus document and compare the bytes.
+
+    Args:
+        original: Original stylesheet bytes
+        rewritten: Rewritten stylesheet bytes
+        corpus: Input documents
+        params: Stylesheet parameters, as XPath string values
+        base_url: Base URL to resolve includes against
+
+    Returns:
+        Positions of the documents whose output differs
+
+    Raises:
+        ValueError: If the original stylesheet's output is not deterministic,
+            e.g. it prints the current time and no parameter overrides it
+    """
+    params = {name: etree.XSLT.strparam(value) for name, value in (params or {}).items()}
+    before = _compile(original, base_url)
+    after = _compile(rewritten, base_url)
+
+    differing = []
+    for position, document in enumerate(corpus):
+        doc = etree.ElementTree(etree.fromstring(document))
+        expected = bytes(before(doc, **params))
+        if position == 0 and bytes(before(doc, **params)) != expected:
+            raise ValueError("Output of the original stylesheet changes between runs; fix it with --param")
+        if bytes(after(doc, **params)) != expected:
+            differing.append(position)
+    return differing
+
+
+def default_corpus(stylesheet: str) -> List[bytes]:
+    """
+    Synthetic inputs for the example mappings.
+
+    Args:
+        stylesheet: Stylesheet path
+
+    Returns:
+        Input documents, empty if the mapping is not one of the examples
+    """
+    kind = MAPPING_INPUTS.get(os.path.basename(stylesheet))
+    if not kind:
+        return []
+    return [generate(kind, items, seed) for items, seed in DEFAULT_CORPUS_SIZES]
+
+
+def rewrite_verified(
+    stylesheet: str,
+    corpus: List[bytes],
+    params: Optional[Dict[str, str]] = None
+) -> KeyRewriteResult:
+    """
+    Rewrite lookups to keys, keeping only rewrites that leave the output unchanged.
+
+    If the full rewrite changes any output, every lookup is tried on its own
+    and the ones that change output are left as they were.
+
+    Args:
+        stylesheet: Stylesheet path
+        corpus: Input documents to compare outputs on
+        params: Stylesheet parameters
+
+    Returns:
+        KeyRewriteResult with the verified stylesheet
+
+    Raises:
+        ValueError: If the corpus is empty
+    """
+    if not corpus:
+        raise ValueError("A corpus of input documents is needed to verify the rewrite")
+    with open(stylesheet, "rb") as f:
+        original = f.read()
+
+    content, applied = rewrite(original)
+    result = KeyRewriteResult(content=content, applied=applied, documents=len(corpus))
+    if not applied or not verify(original, content, corpus, params, stylesheet):
+        return result
+
+    rejected = set()
+    for position in range(len(applied)):
+        only = set(range(len(applied))) - {position}
+        single, _ = rewrite(original, skip=only)
+        if verify(original, single, corpus, params, stylesheet):
+            rejected.add(position)
+
+    content, kept = rewrite(original, skip=rejected)
+    if verify(original, content, corpus, params, stylesheet):
+        # Individually safe rewrites still interfere; keep the original
+        logger.warning("Combined key rewrites change the output; leaving the stylesheet unchanged")
+        return KeyRewriteResult(content=original, rejected=applied, documents=len(corpus))
+
+    return KeyRewriteResult(
+        content=content,
+        applied=kept,
+        rejected=[applied[position] for position in sorted(rejected)],
+        documents=len(corpus)
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function for the key rewrite command."""
+    parser = argparse.ArgumentParser(
+        prog="python -m xslt_tools keys",
+        description="Rewrite equality-predicate lookups to xsl:key, verified on a corpus"
+    )
+    parser.add_argument("stylesheet", help="XSLT file to rewrite")
+    parser.add_argument("-o", "--output", help="Where to write the rewritten stylesheet (default: only report)")
+    parser.add_argument("--corpus", nargs="+", default=[],
+                        help="Input files or directories to verify on (default: synthetic inputs for the examples)")
+    parser.add_argument("--param", type=parse_param, action="append", default=[],
+                        help="Stylesheet parameter NAME=VALUE, e.g. to pin a timestamp (repeatable)")
+    args = parser.parse_args(argv)
+
+    corpus = []
+    for path in iter_inputs(args.corpus):
+        with open(path, "rb") as f:
+            corpus.append(f.read())
+    corpus = corpus or default_corpus(args.stylesheet)
+
+    if not corpus:
+        with open(args.stylesheet, "rb") as f:
+            lookups = find_lookups(f.read())
+        for lookup in lookups:
+            print(f"  line {lookup.line}: {lookup.original}\n    -> {lookup.replacement}")
+        print("❌ No corpus to verify on; pass --corpus")
+        return 1
+
+    result = rewrite_verified(args.stylesheet, corpus, dict(args.param))
+    for lookup in result.applied:
+        print(f"✅ line {lookup.line}: {lookup.original}\n    -> {lookup.replacement}")
+    for lookup in result.rejected:
+        print(f"❌ line {lookup.line}: {lookup.original} (changes the output, left as is)")
+    print(f"\n{len(result.applied)} lookups rewritten, {len(result.rejected)} rejected, "
+          f"verified on {result.documents} documents")
+
+    if args.output and result.applied:
+        with open(args.output, "wb") as f:
+            f.write(result.content)
+        print(f"📁 Rewritten stylesheet written to {args.output}")
+    return 0
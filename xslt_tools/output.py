@@ -0,0 +1,230 @@
+"""
+Output stage for transform results.
+
+Results are written from the engine's serialized buffer straight to file
+descriptors: lxml exposes libxslt's output buffer through the buffer
+protocol, so no Python bytes object is built for it (see apply_buffer on
+the compiled stylesheets).
+
+Small results are queued and written back to back once the queue holds
+buffer_bytes or batch_size results, which also groups the fsync calls:
+
+- never: leave write-back to the OS (fastest, results can be lost on a crash)
+- batch: fsync the files of a flush once all are written, then the
+  directory once
+- always: write through and fsync each file and the directory before
+  write() returns
+
+Indentation is a compile-time setting (the mappings declare
+xsl:output indent="yes"); see StylesheetCache(indent=...) and set_indent.
+"""
+
+import os
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Tuple
+
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+XSL_NS = "http://www.w3.org/1999/XSL/Transform"
+
+FSYNC_POLICIES = ("never", "batch", "always")
+
+DEFAULT_BUFFER_BYTES = 1024 * 1024
+DEFAULT_BATCH_SIZE = 256
+
+
+def set_indent(content: bytes, indent: bool) -> bytes:
+    """
+    Override xsl:output indent in a stylesheet.
+
+    Args:
+        content: Stylesheet bytes
+        indent: Indent the result or not
+
+    Returns:
+        Stylesheet bytes with indent set on every top-level xsl:output,
+        one being added when there is none
+    """
+    root = etree.fromstring(content)
+    outputs = root.findall(f"{{{XSL_NS}}}output")
+    if not outputs:
+        outputs = [etree.Element(f"{{{XSL_NS}}}output")]
+        outputs[0].tail = root.text
+        root.insert(0, outputs[0])
+    for output in outputs:
+        output.set("indent", "yes" if indent else "no")
+    return etree.tostring(root, xml_declaration=True, encoding="utf-8")
+
+
+def write_fd(fd: int, data: Any) -> int:
+    """
+    Write a whole buffer to a file descriptor.
+
+    Args:
+        fd: Open file descriptor
+        data: bytes, memoryview or any other buffer
+
+    Returns:
+        Bytes written
+    """
+    view = memoryview(data).cast("B")
+    written = 0
+    while written < len(view):
+        written += os.write(fd, view[written:])
+    return written
+
+
+def fsync_paths(paths: Iterable[str]) -> int:
+    """
+    Flush already written files and their directories to disk.
+
+    Args:
+        paths: Files to flush
+
+    Returns:
+        Number of fsync calls made
+    """
+    calls = 0
+    directories = set()
+    for path in paths:
+        _fsync(path)
+        calls += 1
+        directories.add(os.path.dirname(os.path.abspath(path)))
+    for directory in directories:
+        _fsync(directory)
+        calls += 1
+    return calls
+
+
+def _fsync(path: str) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class OutputWriter:
+    """
+    Thread-safe writer of transform results into a directory.
+
+    Use as a context manager, or call close(), so queued results are written.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        fsync: str = "never",
+        buffer_bytes: int = DEFAULT_BUFFER_BYTES,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+        """
+        Args:
+            output_dir: Directory to write to, created if missing
+            fsync: One of FSYNC_POLICIES
+            buffer_bytes: Queued bytes that trigger a flush; results at least
+                this large are written immediately (0 writes everything through)
+            batch_size: Queued results that trigger a flush
+
+        Raises:
+            ValueError: If the fsync policy is unknown or a size is negative
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{fsync}'. Choose from: {', '.join(FSYNC_POLICIES)}")
+        if buffer_bytes < 0 or batch_size < 1:
+            raise ValueError("buffer_bytes must not be negative and batch_size must be at least 1")
+        os.makedirs(output_dir, exist_ok=True)
+        self.output_dir = output_dir
+        self.fsync = fsync
+        self.buffer_bytes = 0 if fsync == "always" else buffer_bytes
+        self.batch_size = batch_size
+        self.files = 0
+        self.bytes_written = 0
+        self.flushes = 0
+        self.fsyncs = 0
+        self._pending: List[Tuple[str, Any]] = []
+        self._pending_bytes = 0
+        self._lock = threading.Lock()
+
+    def write(self, name: str, data: Any) -> str:
+        """
+        Write one result.
+
+        Args:
+            name: File name inside the output directory
+            data: Serialized result; any buffer, kept without copying until
+                it is written
+
+        Returns:
+            Path the result is (or will be, once flushed) written to
+        """
+        path = os.path.join(self.output_dir, name)
+        size = memoryview(data).nbytes
+        with self._lock:
+            if size >= self.buffer_bytes:
+                self._write_all([(path, data)])
+            else:
+                self._pending.append((path, data))
+                self._pending_bytes += size
+                if self._pending_bytes >= self.buffer_bytes or len(self._pending) >= self.batch_size:
+                    self._flush()
+        return path
+
+    def flush(self) -> None:
+        """Write every queued result."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        pending, self._pending, self._pending_bytes = self._pending, [], 0
+        if pending:
+            self._write_all(pending)
+
+    def _write_all(self, items: List[Tuple[str, Any]]) -> None:
+        """Write results back to back, then fsync them as the policy asks."""
+        for path, data in items:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                self.bytes_written += write_fd(fd, data)
+                if self.fsync == "always":
+                    os.fsync(fd)
+                    self.fsyncs += 1
+            finally:
+                os.close(fd)
+        self.files += len(items)
+        self.flushes += 1
+        if self.fsync == "batch":
+            # After every write of the batch, so write-back can be merged
+            self.fsyncs += fsync_paths(path for path, _ in items)
+        elif self.fsync == "always":
+            # A new directory entry is only durable once the directory is
+            _fsync(self.output_dir)
+            self.fsyncs += 1
+
+    def close(self) -> None:
+        """Write every queued result."""
+        self.flush()
+
+    def __enter__(self) -> "OutputWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get writer statistics.
+
+        Returns:
+            Dictionary with files, bytes, flushes, fsyncs and pending results
+        """
+        return {
+            "files": self.files,
+            "bytes": self.bytes_written,
+            "flushes": self.flushes,
+            "fsyncs": self.fsyncs,
+            "pending": len(self._pending),
+        }
@@ -0,0 +1,149 @@
+"""
+Process-pool parallel transforms.
+
+Spreads a batch of input documents across worker processes. Every worker
+compiles its own copy of the stylesheet once, in the pool initializer, and
+then transforms chunks of documents with it.
+"""
+
+import os
+import time
+import logging
+import multiprocessing
+from typing import Any, Iterable, Optional, Tuple
+
+from .cache import StylesheetCache
+from .engines import Source, saxon_started
+from .output import OutputWriter, fsync_paths
+from .runner import BatchReport, DocumentResult, transform_one
+
+logger = logging.getLogger(__name__)
+
+# Per-worker state, set by _init_worker in each pool process
+_worker_compiled: Any = None
+_worker_writer: Optional[OutputWriter] = None
+_worker_keep_output: bool = True
+
+
+def _init_worker(
+    stylesheet: str,
+    engine: str,
+    output_dir: Optional[str],
+    keep_output: bool,
+    sef_dir: Optional[str] = None,
+    indent: Optional[bool] = None,
+    fsync: str = "never"
+) -> None:
+    """Compile the stylesheet once for this worker process."""
+    global _worker_compiled, _worker_writer, _worker_keep_output
+    _worker_compiled = StylesheetCache(maxsize=1, engine=engine, sef_dir=sef_dir, indent=indent).get(stylesheet)
+    # Workers get no shutdown hook to flush a queue, so they write through;
+    # batched fsyncs are done by the parent once every result is in
+    _worker_writer = None
+    if output_dir:
+        _worker_writer = OutputWriter(output_dir, "always" if fsync == "always" else "never", buffer_bytes=0)
+    _worker_keep_output = keep_output
+
+
+def _transform_task(task: Tuple[int, Source]) -> Tuple[int, DocumentResult]:
+    """Transform one document with the worker's compiled stylesheet."""
+    index, source = task
+    return index, transform_one(_worker_compiled, source, index, _worker_writer, _worker_keep_output)
+
+
+def default_workers() -> int:
+    """
+    Number of workers to use when none is given.
+
+    Returns:
+        CPUs available to this process
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def run_parallel(
+    stylesheet: str,
+    inputs: Iterable[Source],
+    engine: str = "lxml",
+    workers: Optional[int] = None,
+    chunksize: int = 16,
+    ordered: bool = True,
+    output_dir: Optional[str] = None,
+    keep_output: bool = True,
+    start_method: Optional[str] = None,
+    sef_dir: Optional[str] = None,
+    indent: Optional[bool] = None,
+    fsync: str = "never"
+) -> BatchReport:
+    """
+    Transform a batch of documents on a pool of worker processes.
+
+    Args:
+        stylesheet: Path to the stylesheet
+        inputs: Input paths or raw XML bytes; paths are cheaper to ship to workers
+        engine: XSLT engine each worker compiles with
+        workers: Number of worker processes (defaults to available CPUs)
+        chunksize: Documents handed to a worker per dispatch
+        ordered: Return results in input order; otherwise in completion order
+        output_dir: Directory the workers write results to
+        keep_output: Send result bytes back to the parent when no output
+            directory is given
+        start_method: multiprocessing start method; defaults to "spawn"
+            whenever the Saxon runtime is involved, since it does not survive
+            fork, and to the platform default otherwise
+        sef_dir: Directory of exported Saxon stylesheets workers load
+            instead of compiling (see xslt_tools.sef)
+        indent: Override xsl:output indent; None keeps the stylesheet's
+        fsync: fsync policy for written results (see xslt_tools.output)
+
+    Returns:
+        BatchReport with one DocumentResult per input
+
+    Raises:
+        ValueError: If workers or chunksize is not positive
+    """
+    workers = workers or default_workers()
+    if workers < 1 or chunksize < 1:
+        raise ValueError("workers and chunksize must be at least 1")
+
+    # Compile in the parent first: a stylesheet error raised in a pool
+    # initializer would make the pool respawn failing workers forever.
+    start = time.perf_counter()
+    StylesheetCache(maxsize=1, engine=engine, sef_dir=sef_dir, indent=indent).get(stylesheet)
+    report = BatchReport(
+        stylesheet=stylesheet,
+        engine=engine,
+        compile_seconds=time.perf_counter() - start
+    )
+
+    if output_dir:
+        # Validates the fsync policy before any worker starts
+        OutputWriter(output_dir, fsync)
+
+    if start_method is None and (engine == "saxon" or saxon_started()):
+        start_method = "spawn"
+    context = multiprocessing.get_context(start_method)
+
+    batch_start = time.perf_counter()
+    with context.Pool(
+        processes=workers,
+        initializer=_init_worker,
+        initargs=(stylesheet, engine, output_dir, keep_output, sef_dir, indent, fsync)
+    ) as pool:
+        tasks = enumerate(inputs)
+        if ordered:
+            completed = pool.imap(_transform_task, tasks, chunksize)
+        else:
+            completed = pool.imap_unordered(_transform_task, tasks, chunksize)
+        report.results = [result for _, result in completed]
+    if fsync == "batch":
+        fsync_paths(result.output_path for result in report.results if result.output_path)
+    report.elapsed_seconds = time.perf_counter() - batch_start
+
+    logger.info(
+        f"Transformed {report.succeeded}/{len(report.results)} documents with "
+        f"{stylesheet} on {workers} workers in {report.elapsed_seconds:.3f}s"
+    )
+    return report
@@ -0,0 +1,502 @@
+"""
+Batch transform runner.
+
+Compiles a mapping once through the stylesheet cache and drives a batch of
+input documents through it, recording per-document latency and throughput.
+
+Usage:
+    python -m xslt_tools run <stylesheet> <input>... [--engine saxon] [--output-dir out] [--workers N] [--indent no] [--fsync batch]
+
+Example:
+    python -m xslt_tools run examples/Ex4_Mapping.xsl idocs/ --output-dir edifact/
+"""
+
+import os
+import json
+import math
+import time
+import argparse
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .cache import StylesheetCache
+from .documents import DEFAULT_BUDGET_BYTES, DocumentCache
+from .engines import ENGINES, Source, get_backend
+from .output import DEFAULT_BUFFER_BYTES, FSYNC_POLICIES, OutputWriter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DocumentResult:
+    """Outcome of transforming one input document."""
+    source: str
+    seconds: float
+    output: Optional[bytes] = None
+    output_path: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BatchReport:
+    """Timing and outcome of a batch run."""
+    stylesheet: str
+    engine: str
+    compile_seconds: float
+    elapsed_seconds: float = 0.0
+    results: List[DocumentResult] = field(default_factory=list)
+    parse_seconds: float = 0.0
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for result in self.results if result.ok)
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.succeeded
+
+    @property
+    def docs_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return len(self.results) / self.elapsed_seconds
+
+    def latency_percentile(self, pct: float) -> float:
+        """
+        Per-document latency at a percentile.
+
+        Args:
+            pct: Percentile between 0 and 100
+
+        Returns:
+            Latency in seconds
+        """
+        return percentile([result.seconds for result in self.results], pct)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the run without the per-document outputs.
+
+        Returns:
+            JSON-serializable dictionary
+        """
+        return {
+            "stylesheet": self.stylesheet,
+            "engine": self.engine,
+            "documents": len(self.results),
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "compile_seconds": self.compile_seconds,
+            "parse_seconds": self.parse_seconds,
+            "elapsed_seconds": self.elapsed_seconds,
+            "docs_per_second": self.docs_per_second,
+            "latency_p50_ms": self.latency_percentile(50) * 1000,
+            "latency_p95_ms": self.latency_percentile(95) * 1000,
+            "latency_max_ms": self.latency_percentile(100) * 1000,
+        }
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        values: Sample values
+        pct: Percentile between 0 and 100
+
+    Returns:
+        The percentile value, or 0.0 for an empty sample
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def iter_inputs(paths: Iterable[str], pattern: str = "*.xml") -> Iterator[str]:
+    """
+    Expand input arguments into document paths.
+
+    Args:
+        paths: Files or directories
+        pattern: Glob used inside directories
+
+    Yields:
+        Paths of input documents, directories expanded in sorted order
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for file in sorted(Path(path).glob(pattern)):
+                yield str(file)
+        else:
+            yield path
+
+
+def parse_param(text: str) -> Tuple[str, str]:
+    """
+    Parse a NAME=VALUE stylesheet parameter argument.
+
+    Args:
+        text: Command line value
+
+    Returns:
+        (name, value)
+
+    Raises:
+        argparse.ArgumentTypeError: If there is no '='
+    """
+    name, separator, value = text.partition("=")
+    if not separator:
+        raise argparse.ArgumentTypeError(f"Expected NAME=VALUE, got '{text}'")
+    return name, value
+
+
+def output_name(source: Source, index: int) -> str:
+    """
+    File name used for the result of an input document.
+
+    Args:
+        source: Input path or bytes
+        index: Position of the input in the batch
+
+    Returns:
+        File name for the output directory
+    """
+    if isinstance(source, bytes):
+        return f"doc_{index:06d}.xml"
+    return os.path.basename(os.fspath(source))
+
+
+class BatchRunner:
+    """Runs batches of documents through cached, precompiled stylesheets."""
+
+    def __init__(
+        self,
+        engine: str = "lxml",
+        cache: Optional[StylesheetCache] = None,
+        keep_output: bool = True,
+        documents: Optional[DocumentCache] = None,
+        fsync: str = "never",
+        write_buffer_bytes: int = DEFAULT_BUFFER_BYTES
+    ):
+        """
+        Args:
+            engine: Engine used to compile and run stylesheets
+            cache: Stylesheet cache to share; a private one is created if omitted
+            keep_output: Keep result bytes on each DocumentResult when no
+                output directory is given
+            documents: Parsed document cache; inputs are parsed on every
+                transform when omitted
+            fsync: fsync policy for written results (see xslt_tools.output)
+            write_buffer_bytes: Small results queued before a batched write
+        """
+        self.engine = engine
+        self.cache = cache or StylesheetCache(engine=engine)
+        self.keep_output = keep_output
+        self.documents = documents
+        self.fsync = fsync
+        self.write_buffer_bytes = write_buffer_bytes
+
+    def writer(self, output_dir: Optional[str]) -> Optional[OutputWriter]:
+        """Output writer for a directory, with this runner's write settings."""
+        if not output_dir:
+            return None
+        return OutputWriter(output_dir, self.fsync, self.write_buffer_bytes)
+
+    def run(
+        self,
+        stylesheet: str,
+        inputs: Iterable[Source],
+        output_dir: Optional[str] = None
+    ) -> BatchReport:
+        """
+        Transform a batch of documents.
+
+        Args:
+            stylesheet: Path to the stylesheet
+            inputs: Input paths or raw XML bytes
+            output_dir: Directory to write results to; results are kept in
+                memory instead when omitted
+
+        Returns:
+            BatchReport with one DocumentResult per input
+        """
+        start = time.perf_counter()
+        compiled = self.cache.get(stylesheet, self.engine)
+        report = BatchReport(
+            stylesheet=stylesheet,
+            engine=self.engine,
+            compile_seconds=time.perf_counter() - start
+        )
+
+        writer = self.writer(output_dir)
+        batch_start = time.perf_counter()
+        for index, source in enumerate(inputs):
+            report.results.append(
+                transform_one(compiled, source, index, writer, self.keep_output, self.documents)
+            )
+        if writer:
+            writer.close()
+        report.elapsed_seconds = time.perf_counter() - batch_start
+
+        logger.info(
+            f"Transformed {report.succeeded}/{len(report.results)} documents with "
+            f"{stylesheet} in {report.elapsed_seconds:.3f}s"
+        )
+        return report
+
+    def run_mappings(
+        self,
+        stylesheets: List[str],
+        inputs: Iterable[Source],
+        output_dir: Optional[str] = None
+    ) -> List[BatchReport]:
+        """
+        Apply several stylesheets to each document, parsing it once.
+
+        Each input is parsed once, through the document cache when the
+        runner has one, and the parsed tree is handed to every stylesheet
+        in turn.
+
+        Args:
+            stylesheets: Paths of the stylesheets
+            inputs: Input paths or raw XML bytes
+            output_dir: Directory to write results to, one subdirectory per
+                stylesheet named after it
+
+        Returns:
+            One BatchReport per stylesheet, in order; each document's parse
+            time is in parse_seconds, not in the per-document latency
+        """
+        reports, compiled, targets = [], [], []
+        for stylesheet in stylesheets:
+            start = time.perf_counter()
+            compiled.append(self.cache.get(stylesheet, self.engine))
+            reports.append(BatchReport(stylesheet, self.engine, time.perf_counter() - start))
+            target = None
+            if output_dir:
+                target = os.path.join(output_dir, os.path.splitext(os.path.basename(stylesheet))[0])
+            targets.append(self.writer(target))
+
+        parse = self.documents.get if self.documents is not None else get_backend(self.engine).parse
+        batch_start = time.perf_counter()
+        count = 0
+        for index, source in enumerate(inputs):
+            count += 1
+            name = source_name(source, index)
+            start = time.perf_counter()
+            try:
+                doc = parse(source)
+            except Exception as e:
+                logger.error(f"Parse failed for {name}: {e}")
+                for report in reports:
+                    report.results.append(DocumentResult(source=name, seconds=0.0, error=str(e)))
+                continue
+            parse_seconds = time.perf_counter() - start
+
+            for stylesheet, report, target in zip(compiled, reports, targets):
+                report.parse_seconds += parse_seconds / len(reports)
+                report.results.append(apply_one(stylesheet, doc, source, index, target, self.keep_output))
+
+        for target in targets:
+            if target:
+                target.close()
+        elapsed = time.perf_counter() - batch_start
+        for report in reports:
+            report.elapsed_seconds = elapsed
+        logger.info(f"Transformed {count} documents with {len(stylesheets)} stylesheets in {elapsed:.3f}s")
+        return reports
+
+
+def source_name(source: Source, index: int) -> str:
+    """Name of an input in reports."""
+    return f"<bytes #{index}>" if isinstance(source, bytes) else os.fspath(source)
+
+
+def transform_one(
+    compiled: Any,
+    source: Source,
+    index: int,
+    writer: Optional[OutputWriter] = None,
+    keep_output: bool = True,
+    documents: Optional[DocumentCache] = None
+) -> DocumentResult:
+    """
+    Transform a single document and time it.
+
+    Args:
+        compiled: Compiled stylesheet
+        source: Input path or raw XML bytes
+        index: Position of the input in the batch
+        writer: Writer for the output directory
+        keep_output: Keep the result bytes when not writing to a directory
+        documents: Parsed document cache to take the input from
+
+    Returns:
+        DocumentResult; failures are recorded rather than raised
+    """
+    name = source_name(source, index)
+    start = time.perf_counter()
+    try:
+        if documents is not None:
+            doc = documents.get(source)
+        else:
+            doc = get_backend(compiled.engine).parse(source)
+        output = compiled.apply_buffer(doc) if writer else compiled.apply(doc)
+    except Exception as e:
+        logger.error(f"Transform failed for {name}: {e}")
+        return DocumentResult(source=name, seconds=time.perf_counter() - start, error=str(e))
+    return _finish(DocumentResult(source=name, seconds=time.perf_counter() - start), output, source, index, writer, keep_output)
+
+
+def apply_one(
+    compiled: Any,
+    doc: Any,
+    source: Source,
+    index: int,
+    writer: Optional[OutputWriter] = None,
+    keep_output: bool = True
+) -> DocumentResult:
+    """
+    Apply a stylesheet to an already parsed document and time it.
+
+    Args:
+        compiled: Compiled stylesheet
+        doc: Document parsed by the stylesheet's engine
+        source: Input path or raw XML bytes the document was parsed from
+        index: Position of the input in the batch
+        writer: Writer for the output directory
+        keep_output: Keep the result bytes when not writing to a directory
+
+    Returns:
+        DocumentResult; failures are recorded rather than raised
+    """
+    name = source_name(source, index)
+    start = time.perf_counter()
+    try:
+        output = compiled.apply_buffer(doc) if writer else compiled.apply(doc)
+    except Exception as e:
+        logger.error(f"Transform failed for {name} with {compiled.path}: {e}")
+        return DocumentResult(source=name, seconds=time.perf_counter() - start, error=str(e))
+    return _finish(DocumentResult(source=name, seconds=time.perf_counter() - start), output, source, index, writer, keep_output)
+
+
+def _finish(
+    result: DocumentResult,
+    output: Any,
+    source: Source,
+    index: int,
+    writer: Optional[OutputWriter],
+    keep_output: bool
+) -> DocumentResult:
+    """Write or keep the output of a successful transform."""
+    if writer:
+        result.output_path = writer.write(output_name(source, index), output)
+    elif keep_output:
+        result.output = output
+    return result
+
+
+def print_report(report: BatchReport) -> None:
+    """
+    Print a human readable summary of a batch run.
+
+    Args:
+        report: Batch report to print
+    """
+    summary = report.summary()
+    print(f"✅ Transformed {report.succeeded}/{len(report.results)} documents "
+          f"with {report.engine} in {report.elapsed_seconds:.3f}s "
+          f"({summary['docs_per_second']:.1f} docs/sec)")
+    print(f"   Compile: {report.compile_seconds * 1000:.1f} ms")
+    if report.parse_seconds:
+        print(f"   Parse: {report.parse_seconds * 1000:.1f} ms (share of parses shared between mappings)")
+    print(f"   Latency: p50 {summary['latency_p50_ms']:.2f} ms, "
+          f"p95 {summary['latency_p95_ms']:.2f} ms, "
+          f"max {summary['latency_max_ms']:.2f} ms")
+    for result in report.results:
+        if not result.ok:
+            print(f"  ✗ {result.source} - Error: {result.error}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function for the batch runner."""
+    parser = argparse.ArgumentParser(
+        prog="python -m xslt_tools run",
+        description="Run a batch of XML documents through a compiled XSLT mapping"
+    )
+    parser.add_argument("stylesheet", help="Path to the XSLT mapping")
+    parser.add_argument("inputs", nargs="+", help="Input documents or directories of *.xml files")
+    parser.add_argument("--engine", choices=ENGINES, default="lxml", help="XSLT engine (default: lxml)")
+    parser.add_argument("--output-dir", help="Write results to this directory")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes; 0 uses every CPU (default: 1)")
+    parser.add_argument("--chunksize", type=int, default=16, help="Documents per worker dispatch (default: 16)")
+    parser.add_argument("--unordered", action="store_true", help="Report results in completion order")
+    parser.add_argument("--also", action="append", default=[], metavar="STYLESHEET",
+                        help="Another mapping applied to each parsed input, output in a subdirectory per mapping (repeatable)")
+    parser.add_argument("--doc-cache-mb", type=int, default=DEFAULT_BUDGET_BYTES // (1024 * 1024),
+                        help="Memory budget of the parsed document cache used with --also (default: %(default)s)")
+    parser.add_argument("--doc-tree-ratio", type=float,
+                        help="Estimated parsed tree bytes per input byte, used to weigh cached documents "
+                             "(default: 12 for lxml, 4 for saxon)")
+    parser.add_argument("--sef-dir", help="Load Saxon stylesheets from SEF artifacts in this directory (see the sef command)")
+    parser.add_argument("--indent", choices=("yes", "no"),
+                        help="Override xsl:output indent of the mappings (default: as each mapping declares)")
+    parser.add_argument("--fsync", choices=FSYNC_POLICIES, default="never",
+                        help="When written results are flushed to disk (default: never)")
+    parser.add_argument("--write-buffer-kb", type=int, default=DEFAULT_BUFFER_BYTES // 1024,
+                        help="Small results queued before a batched write (default: %(default)s)")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    indent = None if args.indent is None else args.indent == "yes"
+    write_options = {"fsync": args.fsync, "write_buffer_bytes": args.write_buffer_kb * 1024}
+
+    if args.also:
+        if args.workers != 1:
+            parser.error("--also runs in a single process; drop --workers")
+        documents = DocumentCache(args.doc_cache_mb * 1024 * 1024, args.engine, args.doc_tree_ratio)
+        cache = StylesheetCache(engine=args.engine, sef_dir=args.sef_dir, indent=indent)
+        runner = BatchRunner(engine=args.engine, cache=cache, keep_output=False, documents=documents, **write_options)
+        reports = runner.run_mappings([args.stylesheet] + args.also, iter_inputs(args.inputs), args.output_dir)
+        if args.json:
+            print(json.dumps([report.summary() for report in reports], indent=2))
+        else:
+            for report in reports:
+                print(f"📄 {report.stylesheet}")
+                print_report(report)
+        return 1 if any(report.failed for report in reports) else 0
+
+    if args.workers == 1:
+        cache = StylesheetCache(engine=args.engine, sef_dir=args.sef_dir, indent=indent)
+        runner = BatchRunner(engine=args.engine, cache=cache, keep_output=False, **write_options)
+        report = runner.run(args.stylesheet, iter_inputs(args.inputs), args.output_dir)
+    else:
+        from .parallel import run_parallel
+
+        report = run_parallel(
+            args.stylesheet,
+            iter_inputs(args.inputs),
+            engine=args.engine,
+            workers=args.workers or None,
+            chunksize=args.chunksize,
+            ordered=not args.unordered,
+            output_dir=args.output_dir,
+            keep_output=False,
+            sef_dir=args.sef_dir,
+            indent=indent,
+            fsync=args.fsync
+        )
+
+    if args.json:
+        print(json.dumps(report.summary(), indent=2))
+    else:
+        print_report(report)
+    return 1 if report.failed else 0
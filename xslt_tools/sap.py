@@ -0,0 +1,116 @@
+"""
+Stand-ins for SAP ABAP external functions.
+
+Mappings written for the SAP XSLT engine (Ex5_Mapping.xsl) declare ABAP class
+methods with sap:external-function and call them from XPath, e.g.
+sdn:check_exists(...). Neither libxslt nor Saxon can run those calls, so for
+benchmarks and offline testing each call is replaced by a fixed string literal.
+Never use a stubbed stylesheet for production output.
+"""
+
+import re
+import logging
+from typing import Dict, Set, Tuple
+
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+SAP_XSL_NS = "http://www.sap.com/sapxsl"
+
+_CALL_START = re.compile(r"([A-Za-z_][\w.-]*):([A-Za-z_][\w.-]*)\s*\(")
+
+
+def external_functions(root: etree._Element) -> Set[Tuple[str, str]]:
+    """
+    Find the ABAP functions a stylesheet declares.
+
+    Args:
+        root: Stylesheet root element
+
+    Returns:
+        Set of (namespace URI, local name) pairs
+    """
+    functions = set()
+    for declaration in root.iter(f"{{{SAP_XSL_NS}}}external-function"):
+        prefix, _, local = declaration.get("name", "").rpartition(":")
+        namespace = declaration.nsmap.get(prefix or None)
+        if namespace:
+            functions.add((namespace, local))
+    return functions
+
+
+def _call_end(expression: str, open_paren: int) -> int:
+    """Index just past the parenthesis closing the one at open_paren, skipping string literals."""
+    depth = 0
+    quote = None
+    for index in range(open_paren, len(expression)):
+        char = expression[index]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return index + 1
+    raise ValueError(f"Unbalanced parentheses in expression: {expression}")
+
+
+def _replace_calls(
+    expression: str,
+    nsmap: Dict[str, str],
+    functions: Set[Tuple[str, str]],
+    literal: str
+) -> Tuple[str, int]:
+    """Replace every call to one of functions in an XPath expression with literal."""
+    replaced = 0
+    position = 0
+    parts = []
+    while True:
+        match = _CALL_START.search(expression, position)
+        if not match:
+            break
+        if (nsmap.get(match.group(1)), match.group(2)) not in functions:
+            parts.append(expression[position:match.end()])
+            position = match.end()
+            continue
+        end = _call_end(expression, match.end() - 1)
+        parts.append(expression[position:match.start()])
+        parts.append(literal)
+        position = end
+        replaced += 1
+    parts.append(expression[position:])
+    return "".join(parts), replaced
+
+
+def stub_external_functions(content: bytes, value: str = "") -> bytes:
+    """
+    Replace calls to declared ABAP external functions with a string literal.
+
+    Args:
+        content: Stylesheet bytes
+        value: String every call evaluates to
+
+    Returns:
+        Stylesheet bytes with the calls replaced; unchanged if it declares none
+    """
+    root = etree.fromstring(content)
+    functions = external_functions(root)
+    if not functions:
+        return content
+
+    literal = f'"{value}"' if "'" in value else f"'{value}'"
+    replaced = 0
+    for element in root.iter(etree.Element):
+        for name, expression in element.attrib.items():
+            new_expression, count = _replace_calls(expression, element.nsmap, functions, literal)
+            if count:
+                element.set(name, new_expression)
+                replaced += count
+
+    logger.info(f"Stubbed {replaced} call(s) to SAP external functions with {literal}")
+    return etree.tostring(root.getroottree(), encoding="utf-8", xml_declaration=True)
@@ -0,0 +1,228 @@
+"""
+On-disk cache of exported Saxon stylesheets (SEF files).
+
+Compiling a stylesheet is most of a Saxon worker's start-up cost. A SEF
+export holds the compiled stylesheet, so a worker that finds one only has to
+load it. Artifacts are keyed by stylesheet content hash and Saxon version
+(without the edition): an edited stylesheet or an upgraded saxonche gets a new artifact, and older
+artifacts of the same stylesheet are deleted when it is written.
+
+Exporting requires Saxon-EE (or PE); loading a SEF works on every edition.
+With saxonche (HE) the store does not attempt an export; it loads artifacts
+exported elsewhere, e.g. by an EE build step of the same Saxon version, and
+otherwise falls back to a normal compile.
+
+Usage:
+    python -m xslt_tools sef examples/*.xsl --sef-dir .sef-cache
+"""
+
+import os
+import re
+import glob
+import time
+import argparse
+import hashlib
+import logging
+from typing import List, Optional
+
+from .cache import content_digest
+from .engines import SaxonStylesheet, get_saxon_processor, set_saxon_indent
+
+logger = logging.getLogger(__name__)
+
+
+# Editions that can export SEF files; every edition can load them
+EXPORT_EDITIONS = ("PE", "EE")
+
+
+def saxon_version() -> str:
+    """
+    Saxon product and version without the edition, usable in a file name.
+
+    The edition is left out so an artifact exported by Saxon-EE is found by
+    Saxon-HE workers of the same version.
+
+    Returns:
+        e.g. "SaxonC-13.0"
+    """
+    version = get_saxon_processor().version.replace("from Saxonica", "").strip()
+    version = re.sub(r"-(HE|PE|EE)\b", "", version)
+    return re.sub(r"[^\w.-]+", "-", version)
+
+
+class SefStore:
+    """Directory of SEF artifacts keyed by stylesheet hash and Saxon version."""
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: Where artifacts are kept; created on first export
+        """
+        self.directory = directory
+        self.loads = 0
+        self.compiles = 0
+
+    def _prefix(self, path: str) -> str:
+        """File name prefix shared by every artifact of one stylesheet path."""
+        stem = os.path.splitext(os.path.basename(path))[0]
+        location = hashlib.sha256(os.path.realpath(path).encode("utf-8")).hexdigest()[:8]
+        return f"{stem}-{location}-"
+
+    @property
+    def exportable(self) -> bool:
+        """Whether the running Saxon edition can export SEF files."""
+        return get_saxon_processor().edition in EXPORT_EDITIONS
+
+    def artifact_path(self, path: str, digest: str) -> str:
+        """
+        Artifact location for a stylesheet.
+
+        Args:
+            path: Stylesheet path
+            digest: Content hash of the stylesheet
+
+        Returns:
+            Path of the SEF file, whether or not it exists
+        """
+        return os.path.join(self.directory, f"{self._prefix(path)}{digest[:16]}-{saxon_version()}.sef")
+
+    def load(self, path: str, digest: str) -> Optional[SaxonStylesheet]:
+        """
+        Load the artifact for a stylesheet.
+
+        Args:
+            path: Stylesheet path
+            digest: Content hash of the stylesheet
+
+        Returns:
+            Compiled stylesheet, or None if there is no usable artifact.
+            Artifacts Saxon refuses to load are deleted.
+        """
+        artifact = self.artifact_path(path, digest)
+        if not os.path.exists(artifact):
+            return None
+        try:
+            executable = get_saxon_processor().new_xslt30_processor().compile_stylesheet(stylesheet_file=artifact)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable SEF artifact {artifact}: {e}")
+            os.remove(artifact)
+            return None
+        self.loads += 1
+        return SaxonStylesheet(path, digest, executable)
+
+    def export(self, path: str, digest: str) -> Optional[str]:
+        """
+        Compile a stylesheet and export it to the store.
+
+        Args:
+            path: Stylesheet path
+            digest: Content hash of the stylesheet
+
+        Returns:
+            Path of the written artifact, or None if this Saxon edition
+            cannot export
+        """
+        if not self.exportable:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        artifact = self.artifact_path(path, digest)
+        partial = f"{artifact}.{os.getpid()}.tmp"
+        try:
+            get_saxon_processor().new_xslt30_processor().compile_stylesheet(
+                stylesheet_file=path, save=True, output_file=partial
+            )
+        except Exception:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+
+        # Rename so concurrent workers never load a half-written artifact
+        os.replace(partial, artifact)
+        self.prune(path, keep=artifact)
+        return artifact
+
+    def prune(self, path: str, keep: Optional[str] = None) -> List[str]:
+        """
+        Delete stale artifacts of a stylesheet.
+
+        Args:
+            path: Stylesheet path
+            keep: Artifact to leave in place
+
+        Returns:
+            Paths deleted
+        """
+        removed = []
+        for artifact in glob.glob(os.path.join(glob.escape(self.directory), f"{glob.escape(self._prefix(path))}*.sef")):
+            if artifact != keep:
+                os.remove(artifact)
+                removed.append(artifact)
+        return removed
+
+    def compile(self, path: str, content: bytes, digest: str, indent: Optional[bool] = None) -> SaxonStylesheet:
+        """
+        Get a compiled stylesheet, from its artifact when there is one.
+
+        Signature matches SaxonBackend.compile so the store can stand in for it.
+
+        Args:
+            path: Stylesheet path
+            content: Stylesheet bytes
+            digest: Content hash of the stylesheet
+            indent: Override xsl:output indent; None keeps the stylesheet's
+
+        Returns:
+            Compiled stylesheet
+        """
+        compiled = self.load(path, digest)
+        if compiled is not None:
+            logger.info(f"Loaded {path} from {self.artifact_path(path, digest)}")
+            set_saxon_indent(compiled.executable, indent)
+            return compiled
+
+        self.export(path, digest)
+        compiled = self.load(path, digest)
+        if compiled is None:
+            executable = get_saxon_processor().new_xslt30_processor().compile_stylesheet(stylesheet_file=path)
+            compiled = SaxonStylesheet(path, digest, executable)
+        set_saxon_indent(compiled.executable, indent)
+        self.compiles += 1
+        return compiled
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function for SEF precompilation."""
+    parser = argparse.ArgumentParser(
+        prog="python -m xslt_tools sef",
+        description="Precompile stylesheets to SEF artifacts for fast Saxon worker start-up"
+    )
+    parser.add_argument("stylesheets", nargs="+", help="XSLT files to precompile")
+    parser.add_argument("--sef-dir", default=".sef-cache", help="Artifact directory (default: .sef-cache)")
+    args = parser.parse_args(argv)
+
+    store = SefStore(args.sef_dir)
+    exported = 0
+    for stylesheet in args.stylesheets:
+        with open(stylesheet, "rb") as f:
+            digest = content_digest(f.read())
+
+        start = time.perf_counter()
+        get_saxon_processor().new_xslt30_processor().compile_stylesheet(stylesheet_file=stylesheet)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        artifact = store.export(stylesheet, digest)
+        if artifact is None and os.path.exists(store.artifact_path(stylesheet, digest)):
+            # Exported elsewhere, e.g. by a Saxon-EE build step
+            artifact = store.artifact_path(stylesheet, digest)
+        if artifact is None:
+            print(f"⚠️  {stylesheet}: compile {compile_ms:.1f}ms, no artifact (export needs Saxon-PE or EE)")
+            continue
+
+        start = time.perf_counter()
+        store.load(stylesheet, digest)
+        load_ms = (time.perf_counter() - start) * 1000
+        exported += 1
+        print(f"✅ {stylesheet}: compile {compile_ms:.1f}ms, load {load_ms:.1f}ms -> {artifact}")
+
+    print(f"\n{exported}/{len(args.stylesheets)} stylesheets have artifacts in {args.sef_dir}")
+    return 0 if exported == len(args.stylesheets) else 1
@@ -0,0 +1,194 @@
+"""
+Streaming transforms for large IDoc batch files.
+
+SAP exports concatenate thousands of <IDOC> elements under one root
+(DELVRY07, ZTELINVOIC02, ...). Instead of loading the whole tree, the batch is
+read with lxml iterparse; each IDOC is transformed as soon as it has been
+parsed, its result written out, and the subtree freed, so memory stays flat
+regardless of the file size.
+
+Each IDOC is presented to the mapping as a standalone document under a copy
+of the original root element, so absolute paths such as
+/DELVRY07/IDOC/E1EDL20/VBELN keep working.
+
+Usage:
+    python -m xslt_tools stream <stylesheet> <batch.xml> --output-dir out [--tag IDOC] [--engine saxon] [--fsync batch]
+"""
+
+import io
+import os
+import time
+import argparse
+import logging
+from typing import Any, Callable, Iterator, List, Optional
+
+from lxml import etree
+
+from .cache import StylesheetCache
+from .engines import ENGINES, Source, get_backend
+from .output import DEFAULT_BUFFER_BYTES, FSYNC_POLICIES, OutputWriter
+from .runner import BatchReport, DocumentResult, print_report
+
+logger = logging.getLogger(__name__)
+
+# Receives (index, serialized result) for every transformed IDOC. The result
+# is a buffer (bytes or a memoryview over the engine's output), valid for as
+# long as the sink holds it
+Sink = Callable[[int, Any], None]
+
+
+def iter_batch(source: Source, tag: str = "IDOC") -> Iterator[etree._Element]:
+    """
+    Split a batch file into standalone documents, one per top-level tag.
+
+    Each yielded element is a fresh copy of the batch root holding a single
+    IDOC, which has been detached from the parse tree so it is freed as soon
+    as the caller lets go of it.
+
+    Args:
+        source: Path to the batch file, or its bytes
+        tag: Local name of the repeating child of the root
+
+    Yields:
+        Root element of a single-IDOC document
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    else:
+        source = os.fspath(source)
+
+    for _, element in etree.iterparse(source, events=("end",), tag=f"{{*}}{tag}"):
+        parent = element.getparent()
+        # Only top-level IDOCs; nested elements of the same name stay in place
+        if parent is None or parent.getparent() is not None:
+            continue
+
+        # Drop anything that preceded this IDOC under the root
+        while element.getprevious() is not None:
+            del parent[0]
+
+        # Moving the finished element out of the parse tree is safe: the
+        # parser only ever appends to the root from here on. Once the caller
+        # drops the wrapper, the whole subtree is freed.
+        wrapper = etree.Element(parent.tag, attrib=dict(parent.attrib), nsmap=parent.nsmap)
+        wrapper.append(element)
+        yield wrapper
+
+
+def directory_sink(output_dir: str, prefix: str = "idoc") -> Sink:
+    """
+    Sink that writes every result to its own file as it arrives.
+
+    Args:
+        output_dir: Directory to write to, created if missing
+        prefix: File name prefix
+
+    Returns:
+        Sink writing <prefix>_<index>.xml files
+    """
+    return writer_sink(OutputWriter(output_dir, buffer_bytes=0), prefix)
+
+
+def writer_sink(writer: OutputWriter, prefix: str = "idoc") -> Sink:
+    """
+    Sink that hands every result to an output writer.
+
+    Results may be queued by the writer; close it after the transform.
+
+    Args:
+        writer: Output writer for the target directory
+        prefix: File name prefix
+
+    Returns:
+        Sink writing <prefix>_<index>.xml files
+    """
+    def write(index: int, output: Any) -> None:
+        writer.write(f"{prefix}_{index:06d}.xml", output)
+
+    return write
+
+
+def stream_transform(
+    stylesheet: str,
+    source: Source,
+    sink: Sink,
+    engine: str = "lxml",
+    tag: str = "IDOC",
+    cache: Optional[StylesheetCache] = None
+) -> BatchReport:
+    """
+    Transform every IDOC of a batch file independently, as it is read.
+
+    Args:
+        stylesheet: Path to the stylesheet
+        source: Path to the batch file, or its bytes
+        sink: Called with (index, serialized result) for each IDOC
+        engine: XSLT engine
+        tag: Local name of the repeating child of the root
+        cache: Stylesheet cache to compile through
+
+    Returns:
+        BatchReport with one DocumentResult per IDOC; outputs go to the sink
+        and are not kept
+    """
+    cache = cache or StylesheetCache(engine=engine)
+    backend = get_backend(engine)
+
+    start = time.perf_counter()
+    compiled = cache.get(stylesheet, engine)
+    report = BatchReport(stylesheet=stylesheet, engine=engine, compile_seconds=time.perf_counter() - start)
+
+    name = "<bytes>" if isinstance(source, bytes) else os.fspath(source)
+    batch_start = time.perf_counter()
+    for index, document in enumerate(iter_batch(source, tag)):
+        doc_start = time.perf_counter()
+        try:
+            output = compiled.apply_buffer(backend.parse_element(document))
+            sink(index, output)
+            error = None
+        except Exception as e:
+            logger.error(f"Transform failed for {name}#{index}: {e}")
+            error = str(e)
+        report.results.append(DocumentResult(
+            source=f"{name}#{index}",
+            seconds=time.perf_counter() - doc_start,
+            error=error
+        ))
+    report.elapsed_seconds = time.perf_counter() - batch_start
+
+    logger.info(f"Streamed {len(report.results)} {tag} elements from {name} in {report.elapsed_seconds:.3f}s")
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function for streaming transforms."""
+    parser = argparse.ArgumentParser(
+        prog="python -m xslt_tools stream",
+        description="Transform each IDOC of a large batch file without loading the whole file"
+    )
+    parser.add_argument("stylesheet", help="Path to the XSLT mapping")
+    parser.add_argument("batch", help="Batch file with many IDOC elements under one root")
+    parser.add_argument("--output-dir", required=True, help="Directory for one result file per IDOC")
+    parser.add_argument("--tag", default="IDOC", help="Repeating element under the root (default: IDOC)")
+    parser.add_argument("--engine", choices=ENGINES, default="lxml", help="XSLT engine (default: lxml)")
+    parser.add_argument("--indent", choices=("yes", "no"),
+                        help="Override xsl:output indent of the mapping (default: as the mapping declares)")
+    parser.add_argument("--fsync", choices=FSYNC_POLICIES, default="never",
+                        help="When written results are flushed to disk (default: never)")
+    parser.add_argument("--write-buffer-kb", type=int, default=DEFAULT_BUFFER_BYTES // 1024,
+                        help="Small results queued before a batched write (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    prefix = os.path.splitext(os.path.basename(args.batch))[0]
+    cache = StylesheetCache(engine=args.engine, indent=None if args.indent is None else args.indent == "yes")
+    with OutputWriter(args.output_dir, args.fsync, args.write_buffer_kb * 1024) as writer:
+        report = stream_transform(
+            args.stylesheet,
+            args.batch,
+            writer_sink(writer, prefix),
+            engine=args.engine,
+            tag=args.tag,
+            cache=cache
+        )
+    print_report(report)
+    return 1 if report.failed else 0
@@ -0,0 +1,202 @@
+"""
+Synthetic input documents for the example mappings.
+
+One generator per source document type, scaled by a number of line items and
+seeded for reproducibility. Documents are produced as a stream of text chunks
+so large inputs can be written to disk without being held in memory.
+"""
+
+import random
+from typing import Callable, Dict, Iterator
+
+# Source document type read by each mapping in examples/
+MAPPING_INPUTS = {
+    "Ex1_Mapping.xsl": "ConfirmBOD",
+    "Ex2_Mapping.xsl": "DELVRY07",
+    "Ex3_Mapping.xsl": "DispatchContentReceive",
+    "Ex4_Mapping.xsl": "ZTELINVOIC02",
+    "Ex5_Mapping.xsl": "ORDERS",
+}
+
+UNITS = ["BG", "NAR", "KGM", "LTR", "MTR", "MTK", "PR", "PK", "ST"]
+
+
+def _docnum(rng: random.Random) -> str:
+    return f"{rng.randrange(10 ** 9):016d}"
+
+
+def confirm_bod(items: int, rng: random.Random) -> Iterator[str]:
+    """ConfirmBOD status message (Ex1). Has no line items."""
+    yield "<ConfirmBOD><DataArea><BOD>"
+    yield f"<OriginalReferenceId><Id>{_docnum(rng)}</Id></OriginalReferenceId>"
+    yield f"<SuccessCode>{rng.choice('YN')}</SuccessCode>"
+    yield f"<Description>Document processed with code {rng.randrange(1000)}</Description>"
+    yield "</BOD></DataArea></ConfirmBOD>"
+
+
+def delvry07(items: int, rng: random.Random) -> Iterator[str]:
+    """DELVRY07 delivery IDoc (Ex2) with items E1EDL24 and items E1EDL44 in pallets of ten."""
+    yield "<DELVRY07><IDOC BEGIN=\"1\"><EDI_DC40 SEGMENT=\"1\">"
+    yield f"<DOCNUM>{_docnum(rng)}</DOCNUM><CREDAT>2024{rng.randrange(1, 13):02d}{rng.randrange(1, 29):02d}</CREDAT>"
+    yield f"<CRETIM>{rng.randrange(24):02d}{rng.randrange(60):02d}{rng.randrange(60):02d}</CRETIM></EDI_DC40>"
+    yield "<E1EDL20 SEGMENT=\"1\">"
+    yield f"<VBELN>{rng.randrange(80000000, 90000000)}</VBELN>"
+    yield f"<BTGEW>{rng.uniform(10, 5000):.3f}</BTGEW><VOLUM>{rng.uniform(1, 50):.3f}</VOLUM>"
+    yield f"<ANZPK>{max(items // 10, 1)}</ANZPK><BOLNR>BOL{rng.randrange(10 ** 6):06d}</BOLNR>"
+    for qualifier in ("AG", "WE", "LF"):
+        yield (f"<E1ADRM1 SEGMENT=\"1\"><PARTNER_Q>{qualifier}</PARTNER_Q>"
+               f"<PARTNER_ID>{rng.randrange(10 ** 7):07d}</PARTNER_ID><NAME1>Partner {qualifier}</NAME1></E1ADRM1>")
+    for position in range(1, items + 1):
+        yield (f"<E1EDL24 SEGMENT=\"1\"><POSNR>{position * 10:06d}</POSNR><MATNR>M{rng.randrange(10 ** 6):06d}</MATNR>"
+               f"<WERKS>W{rng.randrange(1, 5)}</WERKS><LFIMG>{rng.uniform(1, 100):.3f}</LFIMG>"
+               f"<ARKTX>Material {position}</ARKTX><VRKME>{rng.choice(UNITS)}</VRKME>"
+               f"<E1EDL43 SEGMENT=\"1\"><QUALF>H</QUALF><DATUM>20240315</DATUM></E1EDL43></E1EDL24>")
+    for pallet_start in range(0, items, 10):
+        exidv2 = f"<EXIDV2>SSCC{rng.randrange(10 ** 8):08d}</EXIDV2>" if rng.random() < 0.5 else ""
+        yield (f"<E1EDL37 SEGMENT=\"1\"><EXIDV>{rng.randrange(10 ** 8):08d}</EXIDV>{exidv2}"
+               f"<MAGRV>{rng.choice(['Z001', 'Z002'])}</MAGRV>"
+               f"<BTVOL>{rng.uniform(0.1, 3):.3f}</BTVOL><BRGEW>{rng.uniform(5, 900):.3f}</BRGEW>")
+        for _ in range(pallet_start, min(pallet_start + 10, items)):
+            charg = f"B{rng.randrange(10 ** 5):05d}" if rng.random() < 0.7 else ""
+            yield (f"<E1EDL44 SEGMENT=\"1\"><MATNR>M{rng.randrange(10 ** 6):06d}</MATNR>"
+                   f"<WERKS>W{rng.randrange(1, 5)}</WERKS><VEMNG>{rng.uniform(1, 100):.3f}</VEMNG>"
+                   f"<VEMEH>{rng.choice(UNITS)}</VEMEH><CHARG>{charg}</CHARG></E1EDL44>")
+        yield "</E1EDL37>"
+    yield "</E1EDL20></IDOC></DELVRY07>"
+
+
+def dispatch_content_receive(items: int, rng: random.Random) -> Iterator[str]:
+    """DispatchContentReceive goods receipt (Ex3). Has no line items."""
+    yield "<DispatchContentReceive><DataArea><DispatchContent>"
+    yield f"<PartId><Id>M{rng.randrange(10 ** 6):06d}</Id><Division>W1</Division></PartId>"
+    yield (f"<ReceivedReference><LotId><Id>B{rng.randrange(10 ** 5):05d}</Id>"
+           f"<SupplierId>{rng.randrange(10 ** 7):07d}</SupplierId></LotId>"
+           f"<ReceivedQuantity>{rng.randrange(1, 500)}</ReceivedQuantity></ReceivedReference>")
+    yield (f"<PurchaseOrderLineId><PurchaseOrderHeadId>{rng.choice(['4300', '4500'])}{rng.randrange(10 ** 6):06d}"
+           f"</PurchaseOrderHeadId><Id>10</Id></PurchaseOrderLineId>")
+    yield "</DispatchContent></DataArea></DispatchContentReceive>"
+
+
+def ztelinvoic02(items: int, rng: random.Random) -> Iterator[str]:
+    """ZTELINVOIC02 invoice IDoc (Ex4) with items E1EDP01 line items."""
+    yield "<ZTELINVOIC02><IDOC BEGIN=\"1\">"
+    yield f"<EDI_DC40 SEGMENT=\"1\"><DOCNUM>{_docnum(rng)}</DOCNUM></EDI_DC40>"
+    yield f"<E1EDK01 SEGMENT=\"1\"><BSART>{rng.choice(['ZF2', 'ZCR'])}</BSART><BELNR>{rng.randrange(10 ** 9)}</BELNR><CURCY>EUR</CURCY></E1EDK01>"
+    yield "<E1EDK14 SEGMENT=\"1\"><QUALF>008</QUALF><ORGID>L110</ORGID></E1EDK14>"
+    yield "<E1EDK03 SEGMENT=\"1\"><IDDAT>028</IDDAT><DATUM>20240430</DATUM></E1EDK03>"
+    yield "<E1EDK03 SEGMENT=\"1\"><IDDAT>012</IDDAT><DATUM>20240401</DATUM></E1EDK03>"
+    yield "<E1EDKT1 SEGMENT=\"1\"><TDID>Z001</TDID><E1EDKT2 SEGMENT=\"1\"><TDLINE>Invoice text</TDLINE></E1EDKT2></E1EDKT1>"
+    for qualifier in ("001", "022"):
+        yield f"<E1EDK02 SEGMENT=\"1\"><QUALF>{qualifier}</QUALF><BELNR>{rng.randrange(10 ** 9)}</BELNR></E1EDK02>"
+    for role in ("RE", "AG", "WE"):
+        yield (f"<E1EDKA1 SEGMENT=\"1\"><PARVW>{role}</PARVW><PARTN>{rng.randrange(10 ** 7):07d}</PARTN>"
+               f"<NAME1>Party {role}</NAME1><STRAS>Street {rng.randrange(1, 99)}</STRAS><ORT01>Tallinn</ORT01>"
+               f"<PSTLZ>{rng.randrange(10000, 99999)}</PSTLZ><LAND1>EE</LAND1></E1EDKA1>")
+    for position in range(1, items + 1):
+        amount = rng.uniform(1, 1000)
+        deposit = ""
+        if rng.random() < 0.1:
+            deposit = ("<E1EDP05 SEGMENT=\"1\"><KSCHL>ZDEP</KSCHL><KOBAS>1</KOBAS><MEAUN>PCE</MEAUN>"
+                       "<BETRG>0.10</BETRG><KRATE>0.10</KRATE></E1EDP05>"
+                       "<E1EDP04 SEGMENT=\"1\"><MWSKZ>V0</MWSKZ><MSATZ>0</MSATZ><MWSBT>0</MWSBT></E1EDP04>")
+        yield (f"<E1EDP01 SEGMENT=\"1\"><POSEX>{position * 10:06d}</POSEX><MENGE>{rng.randrange(1, 50)}</MENGE><MENEE>PCE</MENEE>"
+               f"<E1EDP19 SEGMENT=\"1\"><QUALF>003</QUALF><IDTNR>{rng.randrange(10 ** 12, 10 ** 13)}</IDTNR></E1EDP19>"
+               f"<E1EDP19 SEGMENT=\"1\"><QUALF>002</QUALF><IDTNR>M{rng.randrange(10 ** 6):06d}</IDTNR><KTEXT>Item {position}</KTEXT></E1EDP19>"
+               f"<E1EDP26 SEGMENT=\"1\"><QUALF>012</QUALF><BETRG>{amount:.2f}</BETRG></E1EDP26>"
+               f"<E1EDP05 SEGMENT=\"1\"><ALCKZ>+</ALCKZ><KRATE>{amount * 0.9:.2f}</KRATE></E1EDP05>"
+               f"<E1EDP05 SEGMENT=\"1\"><ALCKZ>+</ALCKZ><KRATE>{amount:.2f}</KRATE></E1EDP05>"
+               f"<E1EDP04 SEGMENT=\"1\"><MWSKZ>V1</MWSKZ><MSATZ>20</MSATZ><MWSBT>{amount * 0.2:.2f}</MWSBT></E1EDP04>"
+               f"{deposit}"
+               f"<E1EDPA1 SEGMENT=\"1\"><PARVW>WE</PARVW><PARTN>{rng.randrange(10 ** 7):07d}</PARTN></E1EDPA1></E1EDP01>")
+    yield "<E1EDS01 SEGMENT=\"1\"><SUMID>010</SUMID><SUMME>1000.00</SUMME></E1EDS01>"
+    yield "<E1EDS01 SEGMENT=\"1\"><SUMID>005</SUMID><SUMME>200.00</SUMME></E1EDS01>"
+    yield "<E1EDK04 SEGMENT=\"1\"><MWSKZ>V1</MWSKZ><MWSBT>200.00</MWSBT></E1EDK04>"
+    yield "<Z1EDS04 SEGMENT=\"1\"><MWSKZ>V1</MWSKZ><MSATZ>20</MSATZ><BETRG>1000.00</BETRG></Z1EDS04>"
+    yield "</IDOC></ZTELINVOIC02>"
+
+
+def edifact_orders(items: int, rng: random.Random) -> Iterator[str]:
+    """EDIFACT ORDERS message in XML form (Ex5) with items GROUP_25 line items."""
+    yield "<EDIFACT><ORDERS>"
+    yield f"<UNH><UNH01-MessageReferenceNumber>{rng.randrange(10 ** 6)}</UNH01-MessageReferenceNumber></UNH>"
+    yield (f"<BGM><BGM01-DocumentMessageName><BGM0101-DocumentMessageNameCoded>{rng.choice(['220', '228'])}"
+           f"</BGM0101-DocumentMessageNameCoded></BGM01-DocumentMessageName>"
+           f"<BGM02-DocumentMessageNumber>{rng.randrange(10 ** 8)}</BGM02-DocumentMessageNumber></BGM>")
+    for qualifier in ("137", "2"):
+        yield (f"<DTM><DTM01-DateTimePeriod><DTM0101-DateTimePeriodQualifier>{qualifier}</DTM0101-DateTimePeriodQualifier>"
+               f"<DTM0102-DateTimePeriod>20240401</DTM0102-DateTimePeriod></DTM01-DateTimePeriod></DTM>")
+    yield "<FTX><FTX01-TextSubjectQualifier>AAI</FTX01-TextSubjectQualifier><FTX04-TextLiteral><FTX0401-FreeText>Deliver before noon</FTX0401-FreeText></FTX04-TextLiteral></FTX>"
+    for qualifier, party in (("SE", "10232094"), ("BY", f"{rng.randrange(10 ** 12)}"), ("DP", f"{rng.randrange(10 ** 12)}")):
+        yield (f"<GROUP_2><NAD><NAD01-PartyQualifier>{qualifier}</NAD01-PartyQualifier><NAD02-PartyIdentificationDetails>"
+               f"<NAD0201-PartyIdIdentification>{party}</NAD0201-PartyIdIdentification></NAD02-PartyIdentificationDetails></NAD></GROUP_2>")
+    yield "<GROUP_7><CUX><CUX01-CurrencyDetails><CUX0102-CurrencyCoded>EUR</CUX0102-CurrencyCoded></CUX01-CurrencyDetails></CUX></GROUP_7>"
+    for position in range(1, items + 1):
+        yield (f"<GROUP_25><LIN><LIN03-ItemNumberIdentification><LIN0301-ItemNumber>{rng.randrange(10 ** 12, 10 ** 13)}</LIN0301-ItemNumber>"
+               f"<LIN0302-ItemNumberTypeCoded>EN</LIN0302-ItemNumberTypeCoded></LIN03-ItemNumberIdentification></LIN>"
+               f"<PIA><PIA02-ItemNumberIdentification><PIA0201-ItemNumber>M{rng.randrange(10 ** 6):06d}</PIA0201-ItemNumber>"
+               f"<PIA0202-ItemNumberTypeCoded>{rng.choice(['VP', 'SA', 'IN'])}</PIA0202-ItemNumberTypeCoded></PIA02-ItemNumberIdentification></PIA>"
+               f"<QTY><QTY01-QuantityDetails><QTY0101-QuantityQualifier>21</QTY0101-QuantityQualifier>"
+               f"<QTY0102-Quantity>{rng.randrange(1, 100)}</QTY0102-Quantity><QTY0103-MeasureUnitQualifier>PCE</QTY0103-MeasureUnitQualifier>"
+               f"</QTY01-QuantityDetails></QTY>"
+               f"<GROUP_28><PRI><PRI01-PriceInformation><PRI0101-PriceQualifier>AAA</PRI0101-PriceQualifier>"
+               f"<PRI0102-Price>{rng.uniform(1, 100):.2f}</PRI0102-Price></PRI01-PriceInformation></PRI></GROUP_28></GROUP_25>")
+    yield "</ORDERS></EDIFACT>"
+
+
+GENERATORS: Dict[str, Callable[[int, random.Random], Iterator[str]]] = {
+    "ConfirmBOD": confirm_bod,
+    "DELVRY07": delvry07,
+    "DispatchContentReceive": dispatch_content_receive,
+    "ZTELINVOIC02": ztelinvoic02,
+    "ORDERS": edifact_orders,
+}
+
+
+def iter_document(kind: str, items: int = 1, seed: int = 0) -> Iterator[str]:
+    """
+    Stream a synthetic document as text chunks.
+
+    Args:
+        kind: Document type, one of GENERATORS
+        items: Number of line items
+        seed: Random seed; the same seed gives the same document
+
+    Yields:
+        XML text chunks
+
+    Raises:
+        ValueError: If the document type is unknown
+    """
+    if kind not in GENERATORS:
+        raise ValueError(f"Unknown document type '{kind}'. Choose from: {', '.join(GENERATORS)}")
+    return GENERATORS[kind](items, random.Random(seed))
+
+
+def generate(kind: str, items: int = 1, seed: int = 0) -> bytes:
+    """
+    Build a synthetic document in memory.
+
+    Args:
+        kind: Document type, one of GENERATORS
+        items: Number of line items
+        seed: Random seed
+
+    Returns:
+        UTF-8 encoded XML
+    """
+    return "".join(iter_document(kind, items, seed)).encode("utf-8")
+
+
+def write_document(path: str, kind: str, items: int = 1, seed: int = 0) -> None:
+    """
+    Stream a synthetic document to disk.
+
+    Args:
+        path: Output file
+        kind: Document type, one of GENERATORS
+        items: Number of line items
+        seed: Random seed
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        for chunk in iter_document(kind, items, seed):
+            f.write(chunk)
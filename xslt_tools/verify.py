@@ -0,0 +1,284 @@
+"""
+Differential output check between the lxml and Saxon engines.
+
+Runs a stylesheet through both engines over a corpus of inputs and compares
+the results after canonicalization (exclusive C14N), so serialization
+details that do not change the document - XML declaration, indentation,
+attribute order, namespace declaration placement - are not reported. Each
+document gets its own verdict and a diff of the canonical outputs, and each
+engine's parse + transform time is recorded so switching a mapping to the
+faster engine is a measured decision.
+
+Usage:
+    python -m xslt_tools verify <stylesheet> [input...] [--param name=value] [--keep-whitespace] [--json]
+
+Example:
+    python -m xslt_tools verify examples/Ex2_Mapping.xsl
+"""
+
+import os
+import json
+import time
+import difflib
+import argparse
+import logging
+import tempfile
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from lxml import etree
+
+from .bench import prepare_stylesheet
+from .cache import StylesheetCache
+from .engines import ENGINES
+from .keys import default_corpus
+from .runner import iter_inputs, parse_param, percentile
+
+logger = logging.getLogger(__name__)
+
+# Lines of canonical diff kept per document
+DEFAULT_DIFF_LINES = 20
+
+
+@dataclass
+class DocumentCheck:
+    """Verdict for one input document."""
+    source: str
+    equal: bool
+    errors: Dict[str, str] = field(default_factory=dict)
+    diff: List[str] = field(default_factory=list)
+
+
+@dataclass
+class EngineTiming:
+    """Parse + transform times of one engine over the corpus."""
+    engine: str
+    compile_ms: float
+    documents: int
+    total_ms: float
+    p50_ms: float
+    p95_ms: float
+
+
+@dataclass
+class VerifyReport:
+    """Outcome of a differential run."""
+    stylesheet: str
+    documents: List[DocumentCheck] = field(default_factory=list)
+    timings: Dict[str, EngineTiming] = field(default_factory=dict)
+
+    @property
+    def mismatches(self) -> List[DocumentCheck]:
+        """Documents whose outputs differ or that failed on an engine."""
+        return [check for check in self.documents if not check.equal]
+
+    @property
+    def faster_engine(self) -> Optional[str]:
+        """
+        Engine with the lower total time.
+
+        Only given when every document produced the same output on both
+        engines, since a faster engine with different output is no choice.
+        """
+        if self.mismatches or len(self.timings) < 2:
+            return None
+        return min(self.timings.values(), key=lambda timing: timing.total_ms).engine
+
+
+def canonicalize(output: bytes, strip_whitespace: bool = True) -> bytes:
+    """
+    Canonical form of a transform result.
+
+    Args:
+        output: Serialized result
+        strip_whitespace: Drop whitespace-only text nodes and re-indent, so
+            the engines' different indentation does not count as a difference
+
+    Returns:
+        Exclusive C14N bytes for XML results; the text itself (trimmed when
+        strip_whitespace) for results that are not XML, e.g. method="text"
+    """
+    try:
+        root = etree.fromstring(output)
+    except etree.XMLSyntaxError:
+        return output.strip() if strip_whitespace else output
+
+    if strip_whitespace:
+        for element in root.iter():
+            if element.text is not None and not element.text.strip():
+                element.text = None
+            if element.tail is not None and not element.tail.strip():
+                element.tail = None
+        # One node per line gives readable diffs; both sides are indented alike
+        etree.indent(root)
+    return etree.tostring(root, method="c14n", exclusive=True)
+
+
+def diff_outputs(expected: bytes, actual: bytes, labels: Tuple[str, str], limit: int = DEFAULT_DIFF_LINES) -> List[str]:
+    """
+    Unified diff of two canonical outputs.
+
+    Args:
+        expected: Canonical output of the first engine
+        actual: Canonical output of the second engine
+        labels: Names of the two sides
+        limit: Maximum lines to return
+
+    Returns:
+        Diff lines, without trailing newlines
+    """
+    lines = difflib.unified_diff(
+        expected.decode("utf-8", "replace").splitlines(),
+        actual.decode("utf-8", "replace").splitlines(),
+        fromfile=labels[0],
+        tofile=labels[1],
+        lineterm=""
+    )
+    return [line for _, line in zip(range(limit), lines)]
+
+
+def verify_engines(
+    stylesheet: str,
+    corpus: List[Tuple[str, bytes]],
+    params: Optional[Dict[str, str]] = None,
+    strip_whitespace: bool = True,
+    diff_lines: int = DEFAULT_DIFF_LINES
+) -> VerifyReport:
+    """
+    Run a stylesheet on both engines and compare the canonical outputs.
+
+    Mappings calling SAP ABAP external functions are run with those calls
+    stubbed out on both engines.
+
+    Args:
+        stylesheet: Stylesheet path
+        corpus: (name, document bytes) pairs
+        params: Stylesheet parameters, passed as strings to both engines
+        strip_whitespace: Ignore whitespace-only text nodes
+        diff_lines: Diff lines kept per differing document
+
+    Returns:
+        VerifyReport with one DocumentCheck per document and per-engine timing
+    """
+    report = VerifyReport(stylesheet)
+    timings: Dict[str, List[float]] = {engine: [] for engine in ENGINES}
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        runnable = prepare_stylesheet(stylesheet, work_dir)
+        compiled = {}
+        for engine in ENGINES:
+            start = time.perf_counter()
+            compiled[engine] = StylesheetCache(maxsize=1, engine=engine).get(runnable)
+            compile_ms = (time.perf_counter() - start) * 1000
+            report.timings[engine] = EngineTiming(engine, round(compile_ms, 3), 0, 0.0, 0.0, 0.0)
+
+        # One untimed run each so lazy initialisation is not billed to the first document
+        if corpus:
+            for engine in ENGINES:
+                try:
+                    compiled[engine].transform(corpus[0][1], params)
+                except Exception:
+                    pass
+
+        for name, document in corpus:
+            outputs, check = {}, DocumentCheck(name, False)
+            for engine in ENGINES:
+                start = time.perf_counter()
+                try:
+                    outputs[engine] = compiled[engine].transform(document, params)
+                except Exception as e:
+                    check.errors[engine] = str(e)
+                    continue
+                timings[engine].append(time.perf_counter() - start)
+
+            if not check.errors:
+                first, second = (canonicalize(outputs[engine], strip_whitespace) for engine in ENGINES)
+                check.equal = first == second
+                if not check.equal:
+                    check.diff = diff_outputs(first, second, ENGINES, diff_lines)
+            report.documents.append(check)
+
+    for engine, samples in timings.items():
+        timing = report.timings[engine]
+        timing.documents = len(samples)
+        timing.total_ms = round(sum(samples) * 1000, 3)
+        timing.p50_ms = round(percentile(samples, 50) * 1000, 3)
+        timing.p95_ms = round(percentile(samples, 95) * 1000, 3)
+
+    logger.info(f"{stylesheet}: {len(report.mismatches)} of {len(report.documents)} documents differ")
+    return report
+
+
+def load_corpus(paths: List[str], stylesheet: str) -> List[Tuple[str, bytes]]:
+    """
+    Read the input documents, or synthesize some for the example mappings.
+
+    Args:
+        paths: Input files or directories
+        stylesheet: Stylesheet path
+
+    Returns:
+        (name, document bytes) pairs
+    """
+    corpus = []
+    for path in iter_inputs(paths):
+        with open(path, "rb") as f:
+            corpus.append((path, f.read()))
+    if not corpus:
+        corpus = [(f"synthetic-{i}", document) for i, document in enumerate(default_corpus(stylesheet))]
+    return corpus
+
+
+def print_report(report: VerifyReport) -> None:
+    """Print per-document verdicts and the engine timings."""
+    print(f"📄 {report.stylesheet}")
+    for check in report.documents:
+        if check.errors:
+            errors = "; ".join(f"{engine}: {error}" for engine, error in check.errors.items())
+            print(f"  ❌ {check.source}: failed ({errors})")
+        elif not check.equal:
+            print(f"  ❌ {check.source}: outputs differ")
+            for line in check.diff:
+                print(f"      {line}")
+
+    print(f"\n{'engine':<8} {'compile ms':>11} {'docs':>6} {'total ms':>11} {'p50 ms':>9} {'p95 ms':>9}")
+    for timing in report.timings.values():
+        print(
+            f"{timing.engine:<8} {timing.compile_ms:>11.1f} {timing.documents:>6} "
+            f"{timing.total_ms:>11.1f} {timing.p50_ms:>9.3f} {timing.p95_ms:>9.3f}"
+        )
+
+    matched = len(report.documents) - len(report.mismatches)
+    print(f"\n{matched}/{len(report.documents)} documents identical after C14N")
+    if report.faster_engine:
+        print(f"✅ Outputs match; {report.faster_engine} is faster on this corpus")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function for the differential engine check."""
+    parser = argparse.ArgumentParser(
+        prog="python -m xslt_tools verify",
+        description="Compare lxml and Saxon output of a stylesheet over a corpus, with per-engine timing"
+    )
+    parser.add_argument("stylesheet", help="XSLT file to check")
+    parser.add_argument("inputs", nargs="*", help="Input files or directories (default: synthetic inputs for the examples)")
+    parser.add_argument("--param", type=parse_param, action="append", default=[],
+                        help="Stylesheet parameter NAME=VALUE, e.g. to pin a timestamp (repeatable)")
+    parser.add_argument("--keep-whitespace", action="store_true",
+                        help="Also compare whitespace-only text nodes")
+    parser.add_argument("--diff-lines", type=int, default=DEFAULT_DIFF_LINES,
+                        help=f"Diff lines shown per differing document (default: {DEFAULT_DIFF_LINES})")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.inputs, args.stylesheet)
+    if not corpus:
+        print(f"❌ No inputs given and no synthetic inputs for {os.path.basename(args.stylesheet)}")
+        return 2
+
+    report = verify_engines(args.stylesheet, corpus, dict(args.param), not args.keep_whitespace, args.diff_lines)
+    if args.json:
+        print(json.dumps(dict(asdict(report), faster_engine=report.faster_engine), indent=2))
+    else:
+        print_report(report)
+    return 1 if report.mismatches else 0